@@ -6,6 +6,7 @@ import os
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
+from app.config import get_settings
 from app.database import Base
 from app.models import *  # noqa: F401,F403
 
@@ -13,6 +14,9 @@ config = context.config
 if config.config_file_name is not None:
     fileConfig(config.config_file_name)
 
+# 앱과 같은 DB (DATABASE_URL / .env), alembic.ini의 sqlalchemy.url은 로컬 기본값
+config.set_main_option("sqlalchemy.url", get_settings().get_sync_db_url().replace("%", "%%"))
+
 target_metadata = Base.metadata
 
 
@@ -0,0 +1,118 @@
+"""partition stats and score tables by snapshot_quarter
+
+create_all로 만들어진 일반 테이블을 snapshot_quarter LIST 파티션 테이블로 바꾼다.
+기존 분기마다 전용 파티션을 만들고, 나머지는 DEFAULT 파티션에 둔다. 파티션 키가 기본 키에
+포함되어야 하므로 기본 키는 (id, snapshot_quarter), snapshot_quarter는 NOT NULL이 된다.
+이미 파티션 테이블인 경우(새 DB에서 create_all로 생성)는 건너뛴다.
+
+Revision ID: 3f2a9c1d7b04
+Revises:
+Create Date: 2026-10-17 10:12:41.318205
+"""
+import re
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+import geoalchemy2
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f2a9c1d7b04'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# snapshot_quarter가 비어 있던 행의 분기 (score_calculator.SNAPSHOT_QUARTER)
+DEFAULT_QUARTER = "2024-Q3"
+QUARTER_PATTERN = r"^\d{4}-Q[1-4]$"
+
+# 테이블 → (인덱스 이름, 컬럼, unique) — 모델 정의와 같은 이름
+TABLE_INDEXES = {
+    "grid_store_stats": [
+        ("ix_grid_store_stats_grid_id", ["grid_id"], False),
+        ("ix_grid_store_stats_industry_code", ["industry_code"], False),
+    ],
+    "grid_sales_stats": [
+        ("ix_grid_sales_stats_grid_id", ["grid_id"], False),
+        ("ix_grid_sales_stats_industry_code", ["industry_code"], False),
+    ],
+    "grid_rent_stats": [
+        ("ix_grid_rent_stats_grid_id", ["grid_id"], False),
+    ],
+    "grid_score": [
+        ("ix_grid_score_grid_id", ["grid_id"], False),
+        ("ix_grid_score_industry_code", ["industry_code"], False),
+        ("ix_grid_score_snapshot_quarter", ["snapshot_quarter"], False),
+        ("ux_grid_score_pair", ["grid_id", "industry_code", "snapshot_quarter"], True),
+    ],
+}
+
+
+def _relkind(bind, table: str) -> str | None:
+    return bind.execute(sa.text(
+        "SELECT relkind FROM pg_class WHERE oid = to_regclass(:table)"
+    ), {"table": f"public.{table}"}).scalar()
+
+
+def _serial_sequence(bind, table: str) -> str | None:
+    return bind.execute(sa.text(
+        "SELECT pg_get_serial_sequence(:table, 'id')"
+    ), {"table": f"public.{table}"}).scalar()
+
+
+def _rebuild(bind, table: str, partitioned: bool) -> None:
+    """table을 새 구조(파티션/일반)로 다시 만들어 데이터를 옮기고 같은 이름으로 바꾼다.
+
+    id 시퀀스는 그대로 재사용한다 (기존 테이블 삭제 시 함께 삭제되지 않도록 소유 해제 후 재지정).
+    grid_master 외래키는 다시 만들지 않는다 (스냅샷 테이블은 grid_master와 독립, app.etl.snapshot).
+    """
+    new = f"{table}_rebuild"
+    seq = _serial_sequence(bind, table)
+    if seq:
+        op.execute(f"ALTER SEQUENCE {seq} OWNED BY NONE")
+
+    for name, columns, unique in TABLE_INDEXES[table]:
+        if unique:
+            # 유니크 인덱스 이전에 쌓인 중복 행은 가장 먼저 적재된 행만 남긴다
+            same = " AND ".join(f"a.{c} IS NOT DISTINCT FROM b.{c}" for c in columns)
+            op.execute(f"DELETE FROM {table} a USING {table} b WHERE a.id > b.id AND {same}")
+
+    if partitioned:
+        op.execute(f"UPDATE {table} SET snapshot_quarter = '{DEFAULT_QUARTER}' WHERE snapshot_quarter IS NULL")
+        op.execute(f"CREATE TABLE {new} (LIKE {table} INCLUDING DEFAULTS) PARTITION BY LIST (snapshot_quarter)")
+        op.execute(f"ALTER TABLE {new} ALTER COLUMN snapshot_quarter SET NOT NULL")
+        op.execute(f"CREATE TABLE {table}_default PARTITION OF {new} DEFAULT")
+        quarters = bind.execute(sa.text(f"SELECT DISTINCT snapshot_quarter FROM {table}")).scalars()
+        for quarter in sorted(q for q in quarters if re.match(QUARTER_PATTERN, q)):
+            op.execute(
+                f"CREATE TABLE {table}_{quarter[:4]}q{quarter[-1]} "
+                f"PARTITION OF {new} FOR VALUES IN ('{quarter}')"
+            )
+    else:
+        op.execute(f"CREATE TABLE {new} (LIKE {table} INCLUDING DEFAULTS)")
+        op.execute(f"ALTER TABLE {new} ALTER COLUMN snapshot_quarter DROP NOT NULL")
+
+    op.execute(f"INSERT INTO {new} SELECT * FROM {table}")
+    op.execute(f"DROP TABLE {table}")
+    op.execute(f"ALTER TABLE {new} RENAME TO {table}")
+    if seq:
+        op.execute(f"ALTER SEQUENCE {seq} OWNED BY {table}.id")
+
+    pkey = ["id", "snapshot_quarter"] if partitioned else ["id"]
+    op.create_primary_key(f"{table}_pkey", table, pkey)
+    for name, columns, unique in TABLE_INDEXES[table]:
+        op.create_index(name, table, columns, unique=unique)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    for table in TABLE_INDEXES:
+        if _relkind(bind, table) == "r":
+            _rebuild(bind, table, partitioned=True)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    for table in TABLE_INDEXES:
+        if _relkind(bind, table) == "p":
+            _rebuild(bind, table, partitioned=False)
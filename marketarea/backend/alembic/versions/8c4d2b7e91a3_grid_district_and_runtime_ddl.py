@@ -0,0 +1,88 @@
+"""grid_master district/lattice columns, grid_district, score upsert schema
+
+ETL 코드가 실행 중에 보정하던 스키마를 마이그레이션으로 옮긴다.
+- grid_master.row_idx / col_idx + ix_grid_master_row_col (격자 행/열, grid_generator)
+- grid_master.gu_code + ix_grid_master_gu_code, grid_district 테이블 (district_mapping)
+- score_run.snapshot_quarter, grid_score의 ix_grid_score_snapshot_quarter / ux_grid_score_pair
+  (upsert 키를 처음 만들 때 중복 쌍은 가장 먼저 적재된 행만 남긴다)
+
+start.sh가 create_all 다음에 실행하므로 이미 있는 컬럼/인덱스/테이블은 건너뛴다.
+downgrade는 이 리비전에서 처음 생긴 grid_district와 gu_code만 제거한다
+(격자 행/열, 점수 분기 스키마는 이전 리비전의 코드도 사용).
+
+Revision ID: 8c4d2b7e91a3
+Revises: 3f2a9c1d7b04
+Create Date: 2026-10-17 23:41:07.512834
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c4d2b7e91a3'
+down_revision: Union[str, None] = '3f2a9c1d7b04'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+UPSERT_KEY = ["grid_id", "industry_code", "snapshot_quarter"]
+
+
+def _columns(bind, table: str) -> set[str]:
+    return {c["name"] for c in sa.inspect(bind).get_columns(table)}
+
+
+def _has_index(bind, name: str) -> bool:
+    return bind.execute(sa.text("SELECT to_regclass(:name)"), {"name": f"public.{name}"}).scalar() is not None
+
+
+def _add_column(bind, table: str, column: sa.Column) -> None:
+    if column.name not in _columns(bind, table):
+        op.add_column(table, column)
+
+
+def _create_index(bind, name: str, table: str, columns: list[str], unique: bool = False) -> None:
+    if not _has_index(bind, name):
+        op.create_index(name, table, columns, unique=unique)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    if inspector.has_table("grid_master"):
+        _add_column(bind, "grid_master", sa.Column("row_idx", sa.Integer()))
+        _add_column(bind, "grid_master", sa.Column("col_idx", sa.Integer()))
+        _add_column(bind, "grid_master", sa.Column("gu_code", sa.String(5)))
+        _create_index(bind, "ix_grid_master_row_col", "grid_master", ["row_idx", "col_idx"])
+        _create_index(bind, "ix_grid_master_gu_code", "grid_master", ["gu_code"])
+
+    if not inspector.has_table("grid_district"):
+        op.create_table(
+            "grid_district",
+            sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+            sa.Column("district_type", sa.String(4), nullable=False),
+            sa.Column("district_code", sa.String(10), nullable=False),
+            sa.Column("grid_id", sa.Integer(), nullable=False),
+        )
+    _create_index(bind, "ux_grid_district_code_grid", "grid_district",
+                  ["district_type", "district_code", "grid_id"], unique=True)
+
+    if inspector.has_table("score_run"):
+        _add_column(bind, "score_run", sa.Column("snapshot_quarter", sa.String(7)))
+
+    if inspector.has_table("grid_score"):
+        _create_index(bind, "ix_grid_score_snapshot_quarter", "grid_score", ["snapshot_quarter"])
+        if not _has_index(bind, "ux_grid_score_pair"):
+            same = " AND ".join(f"a.{c} IS NOT DISTINCT FROM b.{c}" for c in UPSERT_KEY)
+            op.execute(f"DELETE FROM grid_score a USING grid_score b WHERE a.id > b.id AND {same}")
+            op.create_index("ux_grid_score_pair", "grid_score", UPSERT_KEY, unique=True)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    op.drop_table("grid_district")
+    if _has_index(bind, "ix_grid_master_gu_code"):
+        op.drop_index("ix_grid_master_gu_code", table_name="grid_master")
+    if "gu_code" in _columns(bind, "grid_master"):
+        op.drop_column("grid_master", "gu_code")
@@ -2,18 +2,35 @@
 import subprocess
 import sys
 import logging
-from fastapi import APIRouter, BackgroundTasks, Depends
+from fastapi import APIRouter, BackgroundTasks, Depends, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.config import get_settings
+from app.database import async_session, get_db
 from app.schemas.analysis import (
     AnalysisRequest,
     AnalysisResult,
+    BatchAnalysisRequest,
+    BatchAnalysisResponse,
+    IndustryComparisonRequest,
+    IndustryComparisonResponse,
     IndustryItem,
+    IndustryRanking,
     GridHealthResponse,
+    ScoreTrendPoint,
+    ScoreTrendResponse,
 )
-from app.services.grid_aggregator import aggregate_grids
+from app.services.batch_aggregator import BATCH_CHUNK_SIZE, aggregate_sites
+from app.services.dataset_version import current_dataset_version, invalidate_dataset_version
+from app.services.grid_aggregator import aggregate_grids, aggregate_industries, get_lattice
+from app.services.grid_engine import grid_engine
+from app.services.quarters import CURRENT_SCORE_QUARTER_SQL, QUARTER_PATTERN
+from app.services.radius_stats import lookup_radius_result
+from app.services.recommender import recommend_index
+from app.services.result_cache import analysis_cache
+from app.services.summed_area import summed_area_index
 
 etl_logger = logging.getLogger("etl.api")
 
@@ -51,17 +68,159 @@ async def run_analysis(
     req: AnalysisRequest,
     db: AsyncSession = Depends(get_db),
 ):
-    """주어진 좌표/반경/업종에 대한 상권 분석을 수행한다."""
-    result = await aggregate_grids(
-        session=db,
-        lat=req.lat,
-        lng=req.lng,
-        radius=req.radius,
-        industry_code=req.industry_code,
+    """주어진 좌표/반경/업종에 대한 상권 분석을 수행한다.
+
+    결과 캐시가 켜져 있거나 표준 반경(PRECOMPUTED_RADII) 요청이면 좌표를 격자 중심으로
+    스냅한다. 캐시는 (격자, 반경, 업종, 데이터 버전, 분기) 단위로 결과를 재사용하고,
+    표준 반경은 사전 집계 테이블 한 행 조회로 응답한다.
+    quarter를 지정하면 (최신 분기만 적재하는) 인메모리 엔진/사전 집계 대신 SQL로 집계한다.
+    """
+    version = await current_dataset_version(db)
+    lat, lng = req.lat, req.lng
+    cache_key = None
+    grid_id = None
+
+    precomputed = req.quarter is None and req.radius in get_settings().get_precomputed_radii()
+    if analysis_cache.enabled or precomputed:
+        lattice = await get_lattice(db)
+        cell = lattice.cell_of(lat, lng) if lattice else None
+        if cell is not None:
+            lat, lng = lattice.cell_center(*cell)
+            if precomputed:
+                grid_id = lattice.grid_id(*cell)
+            if analysis_cache.enabled:
+                cache_key = (cell, req.radius, req.industry_code, version, req.quarter)
+                cached = analysis_cache.get(cache_key)
+                if cached is not None:
+                    return AnalysisResult(**cached)
+
+    result = await _aggregate(
+        db, lat, lng, req.radius, req.industry_code, version, grid_id, req.quarter,
     )
+    if cache_key is not None:
+        analysis_cache.put(cache_key, result)
     return AnalysisResult(**result)
 
 
+async def _aggregate(
+    db: AsyncSession,
+    lat: float,
+    lng: float,
+    radius: int,
+    industry_code: str,
+    version: int,
+    grid_id: int | None = None,
+    quarter: str | None = None,
+) -> dict:
+    """집계 경로 선택: 현재 버전의 인메모리 엔진 → 표준 반경 사전 집계 → SQL.
+    과거 분기(quarter)는 항상 SQL."""
+    if quarter is not None:
+        return await aggregate_grids(db, lat, lng, radius, industry_code, quarter)
+    if grid_engine.ready:
+        if grid_engine.version == version:
+            return grid_engine.aggregate(lat, lng, radius, industry_code)
+        grid_engine.request_reload()
+    if grid_id is not None:
+        result = await lookup_radius_result(db, grid_id, radius, industry_code)
+        if result is not None:
+            return result
+    return await aggregate_grids(
+        session=db,
+        lat=lat,
+        lng=lng,
+        radius=radius,
+        industry_code=industry_code,
+    )
+
+
+@router.post("/analysis/compare", response_model=IndustryComparisonResponse)
+async def compare_industries(
+    req: IndustryComparisonRequest,
+    db: AsyncSession = Depends(get_db),
+):
+    """한 위치에 대해 전체 업종을 한 번에 분석하고 건강도 순으로 정렬한다.
+
+    반경 멤버십과 업종 무관 지표는 한 번만 계산된다. 결과 캐시가 켜져 있으면
+    /analysis와 같은 격자 중심 스냅을 적용하고 업종별 결과를 캐시에도 채운다.
+    """
+    version = await current_dataset_version(db)
+    lat, lng = req.lat, req.lng
+    cell = None
+    if analysis_cache.enabled:
+        lattice = await get_lattice(db)
+        cell = lattice.cell_of(lat, lng) if lattice else None
+        if cell is not None:
+            lat, lng = lattice.cell_center(*cell)
+
+    codes = [ind["code"] for ind in INDUSTRIES]
+    if req.quarter is None and grid_engine.ready and grid_engine.version == version:
+        results = grid_engine.aggregate_industries(lat, lng, req.radius, codes)
+    else:
+        if req.quarter is None and grid_engine.ready:
+            grid_engine.request_reload()
+        results = await aggregate_industries(db, lat, lng, req.radius, codes, req.quarter)
+
+    if cell is not None:
+        for code, result in results.items():
+            analysis_cache.put((cell, req.radius, code, version, req.quarter), result)
+
+    # 점수가 없는 업종(기본값 50점)은 순위에서 빼고 맨 뒤에 둔다
+    scored = sorted(
+        (ind for ind in INDUSTRIES if results[ind["code"]]["has_score"]),
+        key=lambda ind: -results[ind["code"]]["health_score"],
+    )
+    unscored = [ind for ind in INDUSTRIES if not results[ind["code"]]["has_score"]]
+    rankings = [
+        IndustryRanking(rank=i, **ind, result=AnalysisResult(**results[ind["code"]]))
+        for i, ind in enumerate(scored, start=1)
+    ] + [
+        IndustryRanking(rank=None, **ind, result=AnalysisResult(**results[ind["code"]]))
+        for ind in unscored
+    ]
+    grid_count = rankings[0].result.grid_count if rankings else 0
+    return IndustryComparisonResponse(grid_count=grid_count, rankings=rankings)
+
+
+@router.post("/analysis/batch", response_model=BatchAnalysisResponse)
+async def run_batch_analysis(
+    req: BatchAnalysisRequest,
+    stream: bool = False,
+    db: AsyncSession = Depends(get_db),
+):
+    """다수 후보지를 일괄 분석한다. stream=true면 결과를 NDJSON으로 순차 전송한다."""
+    sites = [(it.lat, it.lng, it.radius, it.industry_code) for it in req.items]
+    if stream:
+        return StreamingResponse(_stream_batch(sites), media_type="application/x-ndjson")
+
+    results = await _aggregate_batch(db, sites)
+    return BatchAnalysisResponse(results=[AnalysisResult(**r) for r in results])
+
+
+async def _aggregate_batch(db: AsyncSession, sites: list[tuple]) -> list[dict]:
+    """현재 버전의 인메모리 엔진이 있으면 사이트별 벡터 연산, 아니면 다중 사이트 SQL."""
+    version = await current_dataset_version(db)
+    if grid_engine.ready:
+        if grid_engine.version == version:
+            return [grid_engine.aggregate(*site) for site in sites]
+        grid_engine.request_reload()
+    return await aggregate_sites(db, sites)
+
+
+async def _stream_batch(sites: list[tuple]):
+    """청크 단위로 집계하며 NDJSON 라인을 내보낸다 (응답 수명 동안 별도 세션 사용)."""
+    async with async_session() as session:
+        for start in range(0, len(sites), BATCH_CHUNK_SIZE):
+            chunk = sites[start:start + BATCH_CHUNK_SIZE]
+            for result in await _aggregate_batch(session, chunk):
+                yield AnalysisResult(**result).model_dump_json() + "\n"
+
+
+@router.get("/analysis/cache")
+async def analysis_cache_stats():
+    """결과 캐시 히트/미스 통계를 반환한다."""
+    return analysis_cache.stats()
+
+
 @router.get("/industries", response_model=list[IndustryItem])
 async def list_industries():
     """업종 목록을 반환한다."""
@@ -71,9 +230,10 @@ async def list_industries():
 @router.get("/health/{grid_id}", response_model=GridHealthResponse)
 async def get_grid_health(
     grid_id: int,
+    quarter: str | None = Query(None, pattern=QUARTER_PATTERN, description="점수 분기 (없으면 최신)"),
     db: AsyncSession = Depends(get_db),
 ):
-    """특정 Grid의 상세 건강도를 반환한다."""
+    """특정 Grid의 상세 건강도를 반환한다 (quarter 분기, 기본값 최신 분기)."""
     grid_row = await db.execute(text(
         "SELECT id, grid_code, center_lat, center_lng FROM grid_master WHERE id = :gid"
     ), {"gid": grid_id})
@@ -81,17 +241,20 @@ async def get_grid_health(
 
     if not grid:
         return GridHealthResponse(
-            grid_id=grid_id, grid_code="", center_lat=0, center_lng=0, scores={}
+            grid_id=grid_id, grid_code="", center_lat=0, center_lng=0, quarter=quarter, scores={}
         )
 
-    score_rows = await db.execute(text("""
+    score_rows = await db.execute(text(f"""
         SELECT industry_code, health_score, competition_index,
-               survival_probability, sales_estimate_low, sales_estimate_high
-        FROM grid_score WHERE grid_id = :gid
-    """), {"gid": grid_id})
+               survival_probability, sales_estimate_low, sales_estimate_high, snapshot_quarter
+        FROM grid_score
+        WHERE grid_id = :gid
+          AND snapshot_quarter = COALESCE(CAST(:quarter AS varchar), {CURRENT_SCORE_QUARTER_SQL})
+    """), {"gid": grid_id, "quarter": quarter})
 
     scores = {}
     for row in score_rows.fetchall():
+        quarter = row[6]
         scores[row[0]] = {
             "health_score": row[1],
             "competition_index": row[2],
@@ -105,10 +268,43 @@ async def get_grid_health(
         grid_code=grid[1],
         center_lat=grid[2],
         center_lng=grid[3],
+        quarter=quarter,
         scores=scores,
     )
 
 
+@router.get("/health/{grid_id}/trend", response_model=ScoreTrendResponse)
+async def get_grid_trend(
+    grid_id: int,
+    industry_code: str = Query(..., min_length=1, description="업종 코드"),
+    db: AsyncSession = Depends(get_db),
+):
+    """Grid x 업종의 분기별 점수 추이 (ux_grid_score_pair 인덱스 범위 조회)."""
+    rows = await db.execute(text("""
+        SELECT snapshot_quarter, health_score, competition_index,
+               survival_probability, sales_estimate_low, sales_estimate_high
+        FROM grid_score
+        WHERE grid_id = :gid AND industry_code = :ic AND snapshot_quarter IS NOT NULL
+        ORDER BY snapshot_quarter
+    """), {"gid": grid_id, "ic": industry_code})
+
+    return ScoreTrendResponse(
+        grid_id=grid_id,
+        industry_code=industry_code,
+        points=[
+            ScoreTrendPoint(
+                quarter=row[0],
+                health_score=row[1],
+                competition_index=row[2],
+                survival_probability=row[3],
+                sales_estimate_low=row[4],
+                sales_estimate_high=row[5],
+            )
+            for row in rows.fetchall()
+        ],
+    )
+
+
 def _run_etl_subprocess(force: bool = False):
     """ETL을 별도 프로세스로 실행 (백그라운드 태스크)."""
     cmd = [sys.executable, "scripts/run_etl.py"]
@@ -119,6 +315,12 @@ def _run_etl_subprocess(force: bool = False):
         result = subprocess.run(cmd, capture_output=True, text=True, timeout=600)
         if result.returncode == 0:
             etl_logger.info("ETL completed successfully")
+            invalidate_dataset_version()
+            analysis_cache.clear()
+            summed_area_index.invalidate()
+            recommend_index.invalidate()
+            if get_settings().GRID_ENGINE_ENABLED:
+                grid_engine.reload()
         else:
             etl_logger.error("ETL failed (rc=%d): %s", result.returncode, result.stderr)
     except subprocess.TimeoutExpired:
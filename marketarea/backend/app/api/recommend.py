@@ -0,0 +1,45 @@
+"""서울 전체 Top-K 입지 추천 API."""
+import asyncio
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_db
+from app.schemas.analysis import RecommendResponse
+from app.services.dataset_version import current_dataset_version
+from app.services.grid_engine import SCORE_COLUMNS
+from app.services.recommender import recommend_index
+
+router = APIRouter()
+
+_load_lock = asyncio.Lock()
+
+
+@router.get("/recommend", response_model=RecommendResponse)
+async def recommend(
+    industry_code: str = Query(..., min_length=1, description="업종 코드"),
+    radius: int = Query(500, ge=100, le=2000, description="반경 (m)"),
+    k: int = Query(50, ge=1, le=500, description="추천 격자 수"),
+    metric: str = Query("health_score", description="순위 기준 grid_score 지표"),
+    min_distance: int | None = Query(
+        None, ge=0, le=5000, description="추천 격자 간 최소 거리 (m, 기본값 = 반경)",
+    ),
+    db: AsyncSession = Depends(get_db),
+):
+    """반경 평균 지표 상위 K개 격자를 비최대 억제로 분산하여 반환한다."""
+    if metric not in SCORE_COLUMNS:
+        raise HTTPException(
+            status_code=400, detail=f"metric은 {', '.join(SCORE_COLUMNS)} 중 하나여야 합니다",
+        )
+
+    version = await current_dataset_version(db)
+    if not recommend_index.loaded or recommend_index.version != version:
+        async with _load_lock:
+            if not recommend_index.loaded or recommend_index.version != version:
+                conn = await db.connection()
+                await conn.run_sync(recommend_index.load)
+
+    items = recommend_index.recommend(industry_code, radius, k, metric, min_distance)
+    return RecommendResponse(
+        industry_code=industry_code, radius=radius, metric=metric, items=items,
+    )
@@ -1,9 +1,13 @@
 from fastapi import APIRouter
 from app.api.analysis import router as analysis_router
+from app.api.recommend import router as recommend_router
 from app.api.saved_analyses import router as saved_analyses_router
 from app.api.users import router as users_router
+from app.api.viewport import router as viewport_router
 
 router = APIRouter()
 router.include_router(analysis_router, tags=["analysis"])
+router.include_router(viewport_router, tags=["viewport"])
+router.include_router(recommend_router, tags=["recommend"])
 router.include_router(saved_analyses_router)
 router.include_router(users_router)
@@ -0,0 +1,38 @@
+"""지도 뷰포트(사각형) 합계 통계 API."""
+import asyncio
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_db
+from app.schemas.analysis import ViewportStatsResponse
+from app.services.dataset_version import current_dataset_version
+from app.services.summed_area import summed_area_index
+
+router = APIRouter()
+
+_load_lock = asyncio.Lock()
+
+
+@router.get("/viewport-stats", response_model=ViewportStatsResponse)
+async def viewport_stats(
+    min_lat: float = Query(..., ge=37.0, le=38.0),
+    min_lng: float = Query(..., ge=126.0, le=128.0),
+    max_lat: float = Query(..., ge=37.0, le=38.0),
+    max_lng: float = Query(..., ge=126.0, le=128.0),
+    industry_code: str | None = Query(None, description="업종 코드 (없으면 전체 업종 점포수)"),
+    db: AsyncSession = Depends(get_db),
+):
+    """사각형 영역의 점포수/거주인구/유동인구 합계를 summed-area table로 O(1) 계산한다."""
+    if min_lat > max_lat or min_lng > max_lng:
+        raise HTTPException(status_code=400, detail="min 좌표가 max 좌표보다 큽니다")
+
+    version = await current_dataset_version(db)
+    if not summed_area_index.loaded or summed_area_index.version != version:
+        async with _load_lock:
+            if not summed_area_index.loaded or summed_area_index.version != version:
+                conn = await db.connection()
+                await conn.run_sync(summed_area_index.load)
+
+    stats = summed_area_index.query(min_lat, min_lng, max_lat, max_lng, industry_code)
+    return ViewportStatsResponse(industry_code=industry_code, **stats)
@@ -16,6 +16,68 @@ class Settings(BaseSettings):
     PORT: int = 8000
     NEXTAUTH_SECRET: str = ""
 
+    # 인메모리 Grid 엔진: 시작 시 격자/통계를 NumPy 배열로 적재해 /api/analysis를 DB 없이 처리
+    GRID_ENGINE_ENABLED: bool = False
+
+    # /api/analysis 결과 캐시 (0이면 비활성). 키: (격자 row/col, 반경, 업종, 데이터 버전)
+    RESULT_CACHE_SIZE: int = 10000
+    RESULT_CACHE_TTL_SECONDS: float = 3600
+    DATASET_VERSION_CHECK_SECONDS: float = 5
+
+    # compute_all_scores 계산 방식: numpy (조인 결과를 가져와 벡터 연산 + COPY) | sql (INSERT ... SELECT)
+    SCORE_MODE: str = "numpy"
+
+    # 증분 점수 계산: score_change_set에 기록된 (격자, 업종)만 다시 계산.
+    # 서울 평균이 직전 기준 대비 SCORE_AVG_TOLERANCE(상대값)를 넘게 움직이면 전체 재계산
+    SCORE_INCREMENTAL: bool = True
+    SCORE_AVG_TOLERANCE: float = 0.02
+
+    # 점수 계산 워커 프로세스 수 (2 이상이면 grid_id 범위로 나눠 병렬 계산)
+    SCORE_WORKERS: int = 1
+
+    # 분산 점수 계산: grid_id 구간을 score_work_queue에 넣고 여러 노드의 scripts/score_worker.py가 처리
+    SCORE_QUEUE_ENABLED: bool = False
+    SCORE_QUEUE_PARTITIONS: int = 64
+    SCORE_QUEUE_LEASE_SECONDS: int = 300   # 계산 중에는 1/3 주기로 연장 (워커가 죽었을 때 회수까지의 시간)
+    SCORE_QUEUE_MAX_ATTEMPTS: int = 3
+    SCORE_QUEUE_TIMEOUT_SECONDS: float = 3600
+    SCORE_QUEUE_POLL_SECONDS: float = 2
+
+    # ETL 스냅샷 게시 시 교체되어 물러난 테이블을 보관하는 개수 (롤백용, 0이면 보관 안 함)
+    SNAPSHOT_RETENTION: int = 3
+
+    # 디스크 컨볼루션으로 사전 집계하는 표준 반경 (m, 콤마 구분). 빈 값이면 비활성
+    PRECOMPUTED_RADII: str = "300,500,1000"
+
+    # 공공데이터 API 기본 URL (scripts/mock_public_api.py 목 서버로 바꿔 벤치마크할 수 있다)
+    API_BASE_URL_DATA_GO_KR: str = "https://apis.data.go.kr"
+    API_BASE_URL_SEOUL: str = "http://openapi.seoul.go.kr:8088"
+    API_BASE_URL_KOSIS: str = "https://kosis.kr"
+
+    # ETL HTTP 클라이언트: 소스별 동시 요청 수 / 초당 요청 수, 재시도(지수 백오프 + 지터)
+    API_CONCURRENCY_DATA_GO_KR: int = 8
+    API_RATE_DATA_GO_KR: float = 20
+    API_CONCURRENCY_SEOUL: int = 4
+    API_RATE_SEOUL: float = 10
+    API_CONCURRENCY_KOSIS: int = 2
+    API_RATE_KOSIS: float = 5
+    API_MAX_RETRIES: int = 4
+    API_TIMEOUT_SECONDS: float = 30
+    API_BACKOFF_BASE_SECONDS: float = 1
+    API_BACKOFF_MAX_SECONDS: float = 30
+
+    # 수집 파이프라인: 단계 사이 큐 크기(페이지/배치 수, backpressure 기준)와 적재 배치 행 수
+    ETL_PIPELINE_QUEUE_SIZE: int = 8
+    ETL_PIPELINE_BATCH_ROWS: int = 5000
+
+    # ETL HTTP 응답 디스크 캐시 (빈 값이면 비활성). 소스별 TTL(초, 0이면 해당 소스 캐시 안 함)
+    # ETL_HTTP_REPLAY: 캐시된 응답만으로 실행 (네트워크 요청 없음, scripts/run_etl.py --replay)
+    ETL_HTTP_CACHE_DIR: str = ".etl_cache"
+    ETL_HTTP_CACHE_TTL_DATA_GO_KR: float = 7 * 24 * 3600
+    ETL_HTTP_CACHE_TTL_SEOUL: float = 24 * 3600
+    ETL_HTTP_CACHE_TTL_KOSIS: float = 30 * 24 * 3600
+    ETL_HTTP_REPLAY: bool = False
+
     @property
     def should_use_sample(self) -> bool:
         """강제 샘플 모드일 때만 True. 개별 키 유무는 각 collector에서 판단."""
@@ -30,10 +92,33 @@ class Settings(BaseSettings):
         }
         return bool(key_map.get(source, ""))
 
+    def get_api_limits(self, source: str) -> tuple[int, float]:
+        """데이터 소스의 (동시 요청 수, 초당 요청 수)."""
+        limit_map = {
+            "data_go_kr": (self.API_CONCURRENCY_DATA_GO_KR, self.API_RATE_DATA_GO_KR),
+            "seoul": (self.API_CONCURRENCY_SEOUL, self.API_RATE_SEOUL),
+            "kosis": (self.API_CONCURRENCY_KOSIS, self.API_RATE_KOSIS),
+        }
+        concurrency, rate = limit_map[source]
+        return max(concurrency, 1), max(rate, 0.1)
+
+    def get_http_cache_ttl(self, source: str) -> float:
+        """데이터 소스의 HTTP 캐시 TTL(초)."""
+        ttl_map = {
+            "data_go_kr": self.ETL_HTTP_CACHE_TTL_DATA_GO_KR,
+            "seoul": self.ETL_HTTP_CACHE_TTL_SEOUL,
+            "kosis": self.ETL_HTTP_CACHE_TTL_KOSIS,
+        }
+        return ttl_map.get(source, 0)
+
     def get_cors_origins(self) -> list[str]:
         """Parse comma-separated ALLOWED_ORIGINS into list."""
         return [o.strip() for o in self.ALLOWED_ORIGINS.split(",") if o.strip()]
 
+    def get_precomputed_radii(self) -> list[int]:
+        """Parse comma-separated PRECOMPUTED_RADII into list."""
+        return [int(r) for r in self.PRECOMPUTED_RADII.split(",") if r.strip()]
+
     def get_async_db_url(self) -> str:
         """Convert Railway DATABASE_URL (postgres://) to asyncpg format."""
         url = self.DATABASE_URL
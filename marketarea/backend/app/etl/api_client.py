@@ -1,34 +1,247 @@
-"""HTTP 요청 공통 래퍼 — 재시도, 타임아웃, 로깅."""
+"""HTTP 요청 공통 래퍼 — 재시도(지터 백오프), 타임아웃, 로깅, 소스별 동시성/속도 제한.
+
+fetch_json은 단건 요청용 동기 함수 (keep-alive 공유 클라이언트).
+페이지가 많은 수집기는 AsyncApiClient로 하나의 httpx.AsyncClient 커넥션 풀을 공유하며
+페이지를 동시에 가져온다. 데이터 소스(data_go_kr / seoul / kosis)마다 동시 요청 수(세마포어)와
+초당 요청 수(토큰 버킷)를 따로 제한해 각 포털의 호출 한도를 넘지 않는다.
+
+소스를 알면 응답을 디스크 캐시(app.etl.http_cache)에서 먼저 찾고, 재생 모드에서는 캐시만 사용한다.
+data.go.kr / 서울 열린데이터 / KOSIS는 키 오류·호출 한도 초과도 HTTP 200 JSON으로 돌려주므로,
+소스별 응답 코드(api_error)가 정상인 응답만 캐시에 저장한다.
+
+    async with AsyncApiClient() as client:
+        pages = await asyncio.gather(*(client.fetch_json("seoul", url) for url in urls))
+"""
+import asyncio
+import random
 import time
+
 import httpx
+
+from app.config import get_settings
+from app.etl.http_cache import get_http_cache, is_replay
 from app.etl.logger import get_etl_logger
 
 logger = get_etl_logger("api_client")
 
+SOURCES = ("data_go_kr", "seoul", "kosis")
+
+_sync_client: httpx.Client | None = None
+
+
+def backoff_delay(attempt: int) -> float:
+    """지수 백오프 + full jitter: [0, min(최대, 기본 * 2^attempt)) 구간의 임의 대기 시간.
+
+    여러 요청이 동시에 실패해도 재시도 시점이 흩어져 한도 초과가 반복되지 않는다.
+    """
+    settings = get_settings()
+    cap = min(settings.API_BACKOFF_MAX_SECONDS, settings.API_BACKOFF_BASE_SECONDS * 2 ** attempt)
+    return random.uniform(0, cap)
+
+
+def _retry_after(resp: httpx.Response) -> float | None:
+    """429/503 응답의 Retry-After(초) — 없거나 날짜 형식이면 None."""
+    value = resp.headers.get("Retry-After")
+    try:
+        return min(float(value), get_settings().API_BACKOFF_MAX_SECONDS) if value else None
+    except ValueError:
+        return None
+
+
+def _data_go_kr_error(data) -> str | None:
+    """data.go.kr: header.resultCode (또는 response.header.resultCode)가 0이 아니면 오류."""
+    if not isinstance(data, dict):
+        return None
+    header = data.get("header") or (data.get("response") or {}).get("header") or data
+    code = str(header.get("resultCode", "00") if isinstance(header, dict) else "00")
+    if code.strip("0"):
+        return f"{code} {header.get('resultMsg', '')}".strip()
+    return None
+
+
+def _seoul_error(data) -> str | None:
+    """서울 열린데이터: RESULT.CODE가 INFO-000이 아니면 오류 (INFO-200 데이터 없음 포함).
+
+    정상 응답은 {서비스명: {RESULT, row, ...}}, 인증/한도 오류는 최상위 {RESULT}로 온다.
+    """
+    if not isinstance(data, dict):
+        return "unexpected response"
+    results = [data.get("RESULT")] + [v.get("RESULT") for v in data.values() if isinstance(v, dict)]
+    results = [r for r in results if isinstance(r, dict)]
+    if not results:
+        return "missing RESULT"
+    for result in results:
+        if result.get("CODE") != "INFO-000":
+            return f"{result.get('CODE')} {result.get('MESSAGE', '')}".strip()
+    return None
+
+
+def _kosis_error(data) -> str | None:
+    """KOSIS: 정상 응답은 행 목록, 오류는 {err, errMsg}."""
+    if isinstance(data, dict) and "err" in data:
+        return f"{data['err']} {data.get('errMsg', '')}".strip()
+    return None
+
+
+_ERROR_CHECKS = {"data_go_kr": _data_go_kr_error, "seoul": _seoul_error, "kosis": _kosis_error}
+
+
+def api_error(source: str, data) -> str | None:
+    """HTTP 200 응답 본문에 담긴 API 오류 (코드 + 메시지). 정상이면 None."""
+    check = _ERROR_CHECKS.get(source)
+    return check(data) if check else None
+
+
+def _cacheable(source: str, url: str, data) -> bool:
+    """정상 응답만 캐시한다 (오류 응답을 캐시하면 TTL 동안/재생 시 빈 데이터로 재사용됨)."""
+    error = api_error(source, data)
+    if error:
+        logger.warning("API error response from %s (%s): %s — not cached", url, source, error)
+    return error is None
+
 
 def fetch_json(
     url: str,
     params: dict | None = None,
-    max_retries: int = 3,
-    timeout: int = 30,
+    max_retries: int | None = None,
+    timeout: float | None = None,
+    source: str | None = None,
 ) -> dict | None:
-    """GET 요청 후 JSON 파싱. 실패 시 지수 백오프 재시도."""
+    """GET 요청 후 JSON 파싱. 실패 시 지터 백오프 재시도. source가 있으면 디스크 캐시를 쓴다."""
+    global _sync_client
+    settings = get_settings()
+    cache = get_http_cache() if source else None
+    if cache is not None:
+        data = cache.get(source, url, params)
+        if data is not None:
+            return data
+    if is_replay():
+        logger.warning("Replay: no cached response for %s", url)
+        return None
+
+    max_retries = max_retries or settings.API_MAX_RETRIES
+    if _sync_client is None:
+        _sync_client = httpx.Client(timeout=settings.API_TIMEOUT_SECONDS)
+
     for attempt in range(max_retries):
         try:
-            resp = httpx.get(url, params=params, timeout=timeout)
+            resp = _sync_client.get(url, params=params, timeout=timeout or settings.API_TIMEOUT_SECONDS)
             if resp.status_code != 200:
                 logger.warning(
                     "HTTP %d from %s (attempt %d/%d)",
                     resp.status_code, url, attempt + 1, max_retries,
                 )
-                time.sleep(2 ** attempt)
+                time.sleep(_retry_after(resp) or backoff_delay(attempt))
                 continue
-            return resp.json()
+            data = resp.json()
+            if cache is not None and _cacheable(source, url, data):
+                cache.put(source, url, params, resp.content)
+            return data
         except (httpx.TimeoutException, httpx.RequestError) as e:
             logger.warning("Request failed: %s (attempt %d/%d)", e, attempt + 1, max_retries)
-            time.sleep(2 ** attempt)
+            time.sleep(backoff_delay(attempt))
         except ValueError:
             logger.error("Invalid JSON response from %s", url)
             return None
     logger.error("All %d attempts failed for %s", max_retries, url)
     return None
+
+
+class TokenBucket:
+    """초당 rate개씩 채워지고 최대 burst개까지 쌓이는 토큰 버킷 (한 이벤트 루프 안에서 공유)."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+
+    async def acquire(self) -> None:
+        while True:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class AsyncApiClient:
+    """소스별 동시성/속도 제한을 공유하는 비동기 HTTP 클라이언트 (async with로 사용)."""
+
+    def __init__(self):
+        settings = get_settings()
+        self._limits = {source: settings.get_api_limits(source) for source in SOURCES}
+        self._semaphores = {
+            source: asyncio.Semaphore(concurrency)
+            for source, (concurrency, _) in self._limits.items()
+        }
+        self._buckets = {
+            source: TokenBucket(rate, burst=concurrency)
+            for source, (concurrency, rate) in self._limits.items()
+        }
+        self._max_retries = settings.API_MAX_RETRIES
+        self._timeout = settings.API_TIMEOUT_SECONDS
+        self._client: httpx.AsyncClient | None = None
+        self._cache = get_http_cache()
+        self.requests = 0
+        self.retries = 0
+        self.cache_hits = 0
+
+    async def __aenter__(self) -> "AsyncApiClient":
+        pool = sum(concurrency for concurrency, _ in self._limits.values())
+        self._client = httpx.AsyncClient(
+            timeout=self._timeout,
+            limits=httpx.Limits(max_connections=pool, max_keepalive_connections=pool),
+        )
+        self._started = time.perf_counter()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self._client.aclose()
+        elapsed = time.perf_counter() - self._started
+        if self.requests or self.cache_hits:
+            logger.info("HTTP: %d requests (%d retries, %d cache hits) in %.1fs (%.1f req/s)",
+                        self.requests, self.retries, self.cache_hits, elapsed,
+                        self.requests / max(elapsed, 1e-9))
+
+    async def fetch_json(self, source: str, url: str, params: dict | None = None) -> dict | list | None:
+        """GET 요청 후 JSON 파싱. 실패 시 지터 백오프 재시도 (대기 중에는 동시성 슬롯을 반납)."""
+        if self._cache is not None:
+            data = await asyncio.to_thread(self._cache.get, source, url, params)
+            if data is not None:
+                self.cache_hits += 1
+                return data
+        if is_replay():
+            logger.warning("Replay: no cached response for %s", url)
+            return None
+
+        for attempt in range(self._max_retries):
+            async with self._semaphores[source]:
+                await self._buckets[source].acquire()
+                self.requests += 1
+                try:
+                    resp = await self._client.get(url, params=params)
+                except (httpx.TimeoutException, httpx.RequestError) as e:
+                    logger.warning("Request failed: %s (attempt %d/%d)", e, attempt + 1, self._max_retries)
+                    delay = backoff_delay(attempt)
+                else:
+                    if resp.status_code == 200:
+                        try:
+                            data = resp.json()
+                        except ValueError:
+                            logger.error("Invalid JSON response from %s", url)
+                            return None
+                        if self._cache is not None and _cacheable(source, url, data):
+                            await asyncio.to_thread(self._cache.put, source, url, params, resp.content)
+                        return data
+                    logger.warning(
+                        "HTTP %d from %s (attempt %d/%d)",
+                        resp.status_code, url, attempt + 1, self._max_retries,
+                    )
+                    delay = _retry_after(resp) or backoff_delay(attempt)
+            self.retries += 1
+            await asyncio.sleep(delay)
+        logger.error("All %d attempts failed for %s", self._max_retries, url)
+        return None
@@ -0,0 +1,103 @@
+"""PostgreSQL COPY FROM STDIN 벌크 적재.
+
+행을 CSV로 직렬화하면서 스트리밍으로 COPY에 흘려 넣는다 (전체 버퍼/행별 INSERT 없음).
+세션의 커넥션/트랜잭션을 그대로 사용하므로 호출자가 commit한다.
+"""
+import csv
+import io
+import struct
+import time
+from collections.abc import Iterable, Sequence
+
+from sqlalchemy.orm import Session
+
+from app.etl.logger import get_etl_logger
+
+logger = get_etl_logger("bulk_copy")
+
+# COPY 스트림에 한 번에 직렬화하는 행 수
+COPY_CHUNK_ROWS = 10_000
+
+# EWKB Point: little endian, wkbPoint | SRID 플래그, SRID, x, y
+_EWKB_POINT = struct.Struct("<BIIdd")
+_EWKB_SRID_FLAG = 0x20000000
+
+
+def ewkb_point(lng: float, lat: float, srid: int = 4326) -> str:
+    """Point geometry의 hex EWKB — COPY로 geometry 컬럼에 그대로 넣을 수 있다 (행별 ST_MakePoint 없음)."""
+    return _EWKB_POINT.pack(1, 1 | _EWKB_SRID_FLAG, srid, lng, lat).hex()
+
+
+class _CsvStream(io.TextIOBase):
+    """행 iterator를 CSV 텍스트로 읽히는 file-like 객체 (copy_expert 입력)."""
+
+    def __init__(self, rows: Iterable[Sequence]):
+        self._rows = iter(rows)
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer, lineterminator="\n")
+        self._pending = ""
+        self.count = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def _fill(self) -> bool:
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        n = 0
+        for row in self._rows:
+            self._writer.writerow(row)
+            n += 1
+            if n >= COPY_CHUNK_ROWS:
+                break
+        self.count += n
+        self._pending = self._buffer.getvalue()
+        return n > 0
+
+    def read(self, size: int = -1) -> str:
+        if not self._pending and not self._fill():
+            return ""
+        if size is None or size < 0:
+            chunks = [self._pending]
+            while self._fill():
+                chunks.append(self._pending)
+            self._pending = ""
+            return "".join(chunks)
+        data, self._pending = self._pending[:size], self._pending[size:]
+        return data
+
+
+def copy_rows(
+    session: Session,
+    table: str,
+    columns: Sequence[str],
+    rows: Iterable[Sequence],
+    log: bool = True,
+) -> int:
+    """행 iterator를 COPY table (columns) FROM STDIN (CSV)로 적재한다. None은 NULL.
+
+    log=False면 처리량 로그를 남기지 않는다 (파이프라인의 배치 단위 적재).
+    """
+    stream = _CsvStream(rows)
+    sql = f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)"
+
+    start = time.perf_counter()
+    raw = session.connection().connection
+    with raw.cursor() as cur:
+        cur.copy_expert(sql, stream)
+    elapsed = time.perf_counter() - start
+
+    if log:
+        logger.info("COPY %s: %s rows in %.2fs (%s rows/s)",
+                    table, f"{stream.count:,}", elapsed,
+                    f"{stream.count / max(elapsed, 1e-9):,.0f}")
+    return stream.count
+
+
+def copy_columns(session: Session, table: str, columns: dict[str, Sequence]) -> int:
+    """컬럼명 → 값 배열(NumPy 배열 또는 list, 길이 동일)을 COPY로 적재한다.
+
+    NumPy 배열은 tolist()로 Python 값으로 바꿔 float가 repr 그대로(손실 없이) 기록된다.
+    """
+    values = [col.tolist() if hasattr(col, "tolist") else col for col in columns.values()]
+    return copy_rows(session, table, list(columns), zip(*values))
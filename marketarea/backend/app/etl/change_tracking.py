@@ -0,0 +1,81 @@
+"""수집기 변경분 기록 — 증분 점수 계산(compute_all_scores)의 입력.
+
+수집기는 stats 테이블을 DELETE 후 다시 적재하므로 적재 전후의 키별 지문(md5)을 비교해
+실제로 값이 바뀐 키만 score_change_set에 기록한다.
+
+    with track_changes(session, "grid_rent_stats"):
+        ...  # DELETE + INSERT
+"""
+from contextlib import contextmanager
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.etl.bulk_copy import copy_rows
+from app.etl.logger import get_etl_logger
+
+logger = get_etl_logger("change_tracking")
+
+# stats 테이블 → (키 컬럼, 점수 계산에 쓰이는 값 컬럼).
+# 키에 industry_code가 없으면 격자 단위 변경 (industry_code = NULL로 기록)
+TRACKED_TABLES = {
+    "grid_store_stats": (("grid_id", "industry_code"), ("store_count", "closure_rate")),
+    "grid_floating_stats": (("grid_id",), ("total_floating",)),
+    "grid_population_stats": (("grid_id",), ("total_population", "age_20_39_ratio")),
+    "grid_sales_stats": (
+        ("grid_id", "industry_code"),
+        ("quarterly_sales", "avg_ticket_price", "snapshot_quarter"),
+    ),
+    "grid_rent_stats": (("grid_id",), ("rent_per_m2", "snapshot_quarter")),
+}
+
+
+def _fingerprints(session: Session, table: str) -> dict[tuple, str]:
+    """키별 값 행 집합의 지문 (행 순서와 무관)."""
+    keys, values = TRACKED_TABLES[table]
+    key_sql = ", ".join(keys)
+    row_sql = f"ROW({', '.join(values)})::text"
+    rows = session.execute(text(f"""
+        SELECT {key_sql}, md5(string_agg({row_sql}, ',' ORDER BY {row_sql}))
+        FROM {table}
+        GROUP BY {key_sql}
+    """)).fetchall()
+    return {tuple(row[:-1]): row[-1] for row in rows}
+
+
+def record_changes(
+    session: Session,
+    table: str,
+    before: dict[tuple, str],
+    after: dict[tuple, str],
+) -> int:
+    """전후 지문이 다른 키(추가/삭제/변경)를 score_change_set에 기록한다 (commit 포함)."""
+    changed = [key for key in before.keys() | after.keys() if before.get(key) != after.get(key)]
+    if not changed:
+        logger.info("%s: no changed keys", table)
+        return 0
+
+    if len(TRACKED_TABLES[table][0]) == 1:
+        rows = ((key[0], None, table) for key in changed)
+    else:
+        rows = ((key[0], key[1], table) for key in changed)
+    count = copy_rows(session, "score_change_set", ("grid_id", "industry_code", "source_table"), rows)
+    session.commit()
+    logger.info("%s: recorded %d changed keys", table, count)
+    return count
+
+
+@contextmanager
+def track_changes(session: Session, table: str):
+    """블록 실행 전후의 table 내용을 비교해 변경된 키를 기록한다.
+
+    블록이 예외로 끝나도 이미 commit된 변경분이 있을 수 있으므로 rollback 후 기록한다.
+    """
+    before = _fingerprints(session, table)
+    try:
+        yield
+    except BaseException:
+        session.rollback()
+        record_changes(session, table, before, _fingerprints(session, table))
+        raise
+    record_changes(session, table, before, _fingerprints(session, table))
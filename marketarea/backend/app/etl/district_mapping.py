@@ -0,0 +1,133 @@
+"""격자 → 구/행정동 매핑 (격자 생성 후 한 번 실행하는 ETL 단계).
+
+    build_district_mapping(session)
+
+1. grid_district: 구 중심 GU_RADIUS_M, 행정동 중심 DONG_RADIUS_M 반경에 걸치는 격자 목록.
+   수집기의 "구/동의 격자" 조회(seoul_districts.get_grid_ids_for_gu/dong)는 이 테이블의
+   인덱스 등호 조회가 된다 (호출마다 geography 반경 검색을 하지 않음).
+2. grid_master.gu_code / dong_code / dong_name: 격자 중심에서 가장 가까운 구 중심, 그 구의
+   행정동 중심 중 DONG_ASSIGN_MAX_M 이내에서 가장 가까운 동. 경계 폴리곤이 없으므로 중심점
+   기준 근사이며, SEOUL_DONG에 없는 동 지역은 dong_code가 NULL이다.
+
+grid_master와 같이 public에 있고 스냅샷 교체 대상이 아니다 (격자를 다시 만들 때만 재생성).
+"""
+import math
+
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.etl.bulk_copy import copy_rows
+from app.etl.grid_lattice import load_lattice
+from app.etl.logger import get_etl_logger
+from app.etl.seoul_districts import SEOUL_DONG, SEOUL_GU
+
+logger = get_etl_logger("district_mapping")
+
+# 기존 get_grid_ids_for_gu / get_grid_ids_for_dong의 반경
+GU_RADIUS_M = 3000
+DONG_RADIUS_M = 500
+# grid_master.dong_code를 채우는 최대 거리 (구의 일부 동만 SEOUL_DONG에 있으므로)
+DONG_ASSIGN_MAX_M = 1500
+
+
+def district_mapping_exists(session: Session) -> bool:
+    return bool(session.execute(text("SELECT EXISTS (SELECT 1 FROM grid_district)")).scalar())
+
+
+def build_district_mapping(session: Session) -> int:
+    """grid_district와 grid_master 구/동 컬럼을 다시 만든다. → grid_district 행 수."""
+    session.execute(text("TRUNCATE grid_district RESTART IDENTITY"))
+
+    lattice = load_lattice(session)
+    districts = [("gu", code, gu, GU_RADIUS_M) for code, gu in SEOUL_GU.items()]
+    districts += [("dong", code, dong, DONG_RADIUS_M) for code, dong in SEOUL_DONG.items()]
+    if lattice is not None:
+        count = copy_rows(session, "grid_district", ("district_type", "district_code", "grid_id"), (
+            (kind, code, grid_id)
+            for kind, code, center, radius in districts
+            for grid_id in lattice.grid_ids_within_meters(center["lat"], center["lng"], radius).tolist()
+        ))
+    else:
+        count = sum(_insert_near(session, *district) for district in districts)
+
+    assigned = _assign_grid_districts(session)
+    session.execute(text("ANALYZE grid_district"))
+    session.commit()
+    logger.info("District mapping: %s grid_district rows, %s grids assigned to a gu",
+                f"{count:,}", f"{assigned:,}")
+    return count
+
+
+def _insert_near(session: Session, kind: str, code: str, center: dict, radius_m: int) -> int:
+    """격자 파라미터가 없는 구버전 격자: GiST 인덱스로 후보를 거른 뒤 geography 거리로 판정한다."""
+    return session.execute(text("""
+        INSERT INTO grid_district (district_type, district_code, grid_id)
+        SELECT :kind, :code, g.id
+        FROM grid_master g,
+             LATERAL (SELECT ST_SetSRID(ST_MakePoint(:lng, :lat), 4326) AS p) c
+        WHERE g.geom && ST_Expand(c.p, :reach_deg)
+          AND ST_DWithin(g.geom::geography, c.p::geography, :radius)
+    """), {
+        "kind": kind, "code": code, "lat": center["lat"], "lng": center["lng"],
+        "radius": radius_m,
+        # 경도 1도 거리가 가장 짧은 위도 기준으로 넉넉하게
+        "reach_deg": radius_m / (111_320 * math.cos(math.radians(center["lat"] + 1))),
+    }).rowcount
+
+
+def _assign_grid_districts(session: Session) -> int:
+    """격자 중심에서 가장 가까운 구/동을 grid_master에 기록한다. → 구가 배정된 격자 수."""
+    rows = session.execute(text("SELECT id, center_lat, center_lng FROM grid_master ORDER BY id")).fetchall()
+    if not rows:
+        return 0
+    ids = np.array([r[0] for r in rows], dtype=np.int64)
+    lat = np.array([r[1] for r in rows], dtype=np.float64)
+    lng = np.array([r[2] for r in rows], dtype=np.float64)
+
+    gu_codes = list(SEOUL_GU)
+    gu_idx = _nearest(lat, lng, [SEOUL_GU[c] for c in gu_codes])[0]
+
+    dong_of = np.full(len(ids), -1, dtype=np.int64)
+    dong_codes = list(SEOUL_DONG)
+    for g, gu_code in enumerate(gu_codes):
+        in_gu = np.flatnonzero(gu_idx == g)
+        candidates = [i for i, code in enumerate(dong_codes) if code.startswith(gu_code)]
+        if not len(in_gu) or not candidates:
+            continue
+        nearest, dist = _nearest(lat[in_gu], lng[in_gu], [SEOUL_DONG[dong_codes[i]] for i in candidates])
+        close = dist <= DONG_ASSIGN_MAX_M
+        dong_of[in_gu[close]] = np.asarray(candidates)[nearest[close]]
+
+    session.execute(text("DROP TABLE IF EXISTS grid_district_assign"))
+    session.execute(text("""
+        CREATE TEMP TABLE grid_district_assign (
+            id integer PRIMARY KEY, gu_code varchar(5), dong_code varchar(10), dong_name varchar(50)
+        )
+    """))
+    copy_rows(session, "grid_district_assign", ("id", "gu_code", "dong_code", "dong_name"), (
+        (
+            grid_id, gu_codes[g],
+            dong_codes[d] if d >= 0 else None,
+            SEOUL_DONG[dong_codes[d]]["name"] if d >= 0 else None,
+        )
+        for grid_id, g, d in zip(ids.tolist(), gu_idx.tolist(), dong_of.tolist())
+    ), log=False)
+    assigned = session.execute(text("""
+        UPDATE grid_master g
+        SET gu_code = a.gu_code, dong_code = a.dong_code, dong_name = a.dong_name
+        FROM grid_district_assign a
+        WHERE g.id = a.id
+    """)).rowcount
+    session.execute(text("DROP TABLE grid_district_assign"))
+    return assigned
+
+
+def _nearest(lat: np.ndarray, lng: np.ndarray, centers: list[dict]) -> tuple[np.ndarray, np.ndarray]:
+    """각 점에서 가장 가까운 중심의 인덱스와 거리(m) — 위도별 1도당 미터 환산 근사."""
+    c_lat = np.array([c["lat"] for c in centers])
+    c_lng = np.array([c["lng"] for c in centers])
+    m_per_lng = 111_320 * np.cos(np.radians(lat))[:, None]
+    d2 = ((lat[:, None] - c_lat) * 111_320) ** 2 + ((lng[:, None] - c_lng) * m_per_lng) ** 2
+    nearest = d2.argmin(axis=1)
+    return nearest, np.sqrt(d2[np.arange(len(lat)), nearest])
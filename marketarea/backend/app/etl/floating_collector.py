@@ -8,28 +8,35 @@ from sqlalchemy.orm import Session
 
 from app.config import get_settings
 from app.etl.api_client import fetch_json
+from app.etl.bulk_copy import copy_rows
+from app.etl.change_tracking import track_changes
 from app.etl.logger import get_etl_logger
 from app.etl.seoul_districts import get_grid_ids_for_dong
 
 logger = get_etl_logger("floating_collector")
 SAMPLE_DIR = Path(__file__).parent / "sample_data"
 
+FLOATING_COLUMNS = (
+    "grid_id", "total_floating", "lunch_ratio", "dinner_ratio",
+    "night_ratio", "weekday_avg", "weekend_avg", "snapshot_date",
+)
+
 
 def collect_floating(session: Session) -> int:
     settings = get_settings()
-    if settings.should_use_sample or not settings.has_key("seoul"):
-        logger.info("Using sample data for floating population")
-        return _load_sample(session)
-    logger.info("Collecting floating population from API")
-    return _collect_from_api(session, settings.SEOUL_OPEN_DATA_API_KEY)
+    with track_changes(session, "grid_floating_stats"):
+        if settings.should_use_sample or not settings.has_key("seoul"):
+            logger.info("Using sample data for floating population")
+            return _load_sample(session)
+        logger.info("Collecting floating population from API")
+        return _collect_from_api(session, settings.SEOUL_OPEN_DATA_API_KEY)
 
 
 def _collect_from_api(session: Session, api_key: str) -> int:
     """서울 생활인구 API (OA-14991)에서 유동인구 수집."""
-    base_url = f"http://openapi.seoul.go.kr:8088/{api_key}/json/SPOP_LOCAL_RESD_DONG"
-    count = 0
+    base_url = f"{get_settings().API_BASE_URL_SEOUL}/{api_key}/json/SPOP_LOCAL_RESD_DONG"
 
-    data = fetch_json(f"{base_url}/1/1000/")
+    data = fetch_json(f"{base_url}/1/1000/", source="seoul")
     if not data:
         logger.error("Failed to fetch floating population data")
         return 0
@@ -77,20 +84,12 @@ def _collect_from_api(session: Session, api_key: str) -> int:
             grid_agg[grid_id]["wd"] += per_grid * 0.7
             grid_agg[grid_id]["we"] += per_grid * 0.3
 
-    # 합산된 데이터를 INSERT
+    # 합산된 데이터를 COPY로 적재
     today = date.today()
-    for grid_id, agg in grid_agg.items():
-        session.execute(text("""
-            INSERT INTO grid_floating_stats
-                (grid_id, total_floating, lunch_ratio, dinner_ratio,
-                 night_ratio, weekday_avg, weekend_avg, snapshot_date)
-            VALUES (:gid, :total, 0.35, 0.30, 0.10, :wd, :we, :sd)
-        """), {
-            "gid": grid_id, "total": agg["total"],
-            "wd": agg["wd"], "we": agg["we"],
-            "sd": today,
-        })
-        count += 1
+    count = copy_rows(session, "grid_floating_stats", FLOATING_COLUMNS, (
+        (grid_id, agg["total"], 0.35, 0.30, 0.10, agg["wd"], agg["we"], today)
+        for grid_id, agg in grid_agg.items()
+    ))
 
     session.commit()
     logger.info("Floating population mapped to %d grid entries", count)
@@ -105,22 +104,14 @@ def _load_sample(session: Session) -> int:
 
     session.execute(text("DELETE FROM grid_floating_stats"))
 
-    for r in records:
-        session.execute(text("""
-            INSERT INTO grid_floating_stats
-                (grid_id, total_floating, lunch_ratio, dinner_ratio,
-                 night_ratio, weekday_avg, weekend_avg, snapshot_date)
-            VALUES (:gid, :total, :lunch, :dinner, :night, :wd, :we, :sd)
-        """), {
-            "gid": r["grid_id"],
-            "total": r["total_floating"],
-            "lunch": r["lunch_ratio"],
-            "dinner": r["dinner_ratio"],
-            "night": r["night_ratio"],
-            "wd": r["weekday_avg"],
-            "we": r["weekend_avg"],
-            "sd": date.today(),
-        })
+    today = date.today()
+    copy_rows(session, "grid_floating_stats", FLOATING_COLUMNS, (
+        (
+            r["grid_id"], r["total_floating"], r["lunch_ratio"], r["dinner_ratio"],
+            r["night_ratio"], r["weekday_avg"], r["weekend_avg"], today,
+        )
+        for r in records
+    ))
 
     session.commit()
     logger.info("Sample floating data loaded: %d records", len(records))
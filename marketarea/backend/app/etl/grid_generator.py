@@ -1,56 +1,41 @@
 """서울 100m x 100m 격자 생성기."""
-import math
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 
-
-# 서울 바운딩박스 (WGS84)
-SEOUL_BOUNDS = {
-    "min_lng": 126.76,
-    "max_lng": 127.18,
-    "min_lat": 37.43,
-    "max_lat": 37.70,
-}
-
-GRID_SIZE_M = 100  # 100m
-
-
-def _meters_to_degrees_lat(meters: float, lat: float) -> float:
-    return meters / 111_320
-
-
-def _meters_to_degrees_lng(meters: float, lat: float) -> float:
-    return meters / (111_320 * math.cos(math.radians(lat)))
+from app.etl.grid_lattice import (  # noqa: F401 — SEOUL_BOUNDS/GRID_SIZE_M 재노출
+    GRID_SIZE_M,
+    SEOUL_BOUNDS,
+    SEOUL_LATTICE,
+    Lattice,
+)
 
 
 def generate_seoul_grids(session: Session, batch_size: int = 1000) -> int:
-    """서울 바운딩박스 내 100m 격자를 생성하여 grid_master에 적재한다."""
-    session.execute(text("TRUNCATE grid_master RESTART IDENTITY CASCADE"))
+    """서울 바운딩박스 내 100m 격자를 생성하여 grid_master에 적재한다.
 
-    mid_lat = (SEOUL_BOUNDS["min_lat"] + SEOUL_BOUNDS["max_lat"]) / 2
-    dlat = _meters_to_degrees_lat(GRID_SIZE_M, mid_lat)
-    dlng = _meters_to_degrees_lng(GRID_SIZE_M, mid_lat)
+    격자는 SEOUL_LATTICE 기준 행 우선(row-major) 순서로 생성되며,
+    id = row * n_cols + col + 1 로 고정되어 좌표 → grid_id를 산술로 구할 수 있다.
+    """
+    lattice = SEOUL_LATTICE
+    session.execute(text("TRUNCATE grid_master RESTART IDENTITY CASCADE"))
 
     rows = []
-    grid_idx = 0
-    lat = SEOUL_BOUNDS["min_lat"]
-
-    while lat < SEOUL_BOUNDS["max_lat"]:
-        lng = SEOUL_BOUNDS["min_lng"]
-        row_num = grid_idx  # track for code
-        while lng < SEOUL_BOUNDS["max_lng"]:
-            x1, y1 = lng, lat
-            x2, y2 = lng + dlng, lat + dlat
+    for row in range(lattice.n_rows):
+        for col in range(lattice.n_cols):
+            x1, y1, x2, y2 = lattice.cell_bounds(row, col)
             cx = (x1 + x2) / 2
             cy = (y1 + y2) / 2
 
-            grid_code = f"G{grid_idx:06d}"
+            grid_idx = row * lattice.n_cols + col
             wkt = f"POLYGON(({x1} {y1},{x2} {y1},{x2} {y2},{x1} {y2},{x1} {y1}))"
 
             rows.append({
-                "grid_code": grid_code,
+                "id": grid_idx + 1,
+                "grid_code": f"G{grid_idx:06d}",
                 "center_lat": round(cy, 7),
                 "center_lng": round(cx, 7),
+                "row_idx": row,
+                "col_idx": col,
                 "wkt": wkt,
             })
 
@@ -58,25 +43,43 @@ def generate_seoul_grids(session: Session, batch_size: int = 1000) -> int:
                 _insert_batch(session, rows)
                 rows.clear()
 
-            grid_idx += 1
-            lng += dlng
-
-        lat += dlat
-
     if rows:
         _insert_batch(session, rows)
 
+    session.execute(text(
+        "SELECT setval(pg_get_serial_sequence('grid_master', 'id'), "
+        "(SELECT MAX(id) FROM grid_master))"
+    ))
+    _save_lattice(session, lattice)
     session.commit()
-    return grid_idx
+    return lattice.size
+
+
+def _save_lattice(session: Session, lattice: Lattice):
+    """생성에 사용한 격자 파라미터를 grid_lattice에 기록한다."""
+    session.execute(text("DELETE FROM grid_lattice"))
+    session.execute(text("""
+        INSERT INTO grid_lattice
+            (origin_lat, origin_lng, dlat, dlng, n_rows, n_cols, cell_size_m)
+        VALUES (:lat0, :lng0, :dlat, :dlng, :n_rows, :n_cols, :size)
+    """), {
+        "lat0": lattice.origin_lat,
+        "lng0": lattice.origin_lng,
+        "dlat": lattice.dlat,
+        "dlng": lattice.dlng,
+        "n_rows": lattice.n_rows,
+        "n_cols": lattice.n_cols,
+        "size": GRID_SIZE_M,
+    })
 
 
 def _insert_batch(session: Session, rows: list[dict]):
     values = ",".join(
-        f"('{r['grid_code']}', {r['center_lat']}, {r['center_lng']}, "
-        f"ST_GeomFromText('{r['wkt']}', 4326))"
+        f"({r['id']}, '{r['grid_code']}', {r['center_lat']}, {r['center_lng']}, "
+        f"{r['row_idx']}, {r['col_idx']}, ST_GeomFromText('{r['wkt']}', 4326))"
         for r in rows
     )
     session.execute(text(
-        f"INSERT INTO grid_master (grid_code, center_lat, center_lng, geom) "
+        f"INSERT INTO grid_master (id, grid_code, center_lat, center_lng, row_idx, col_idx, geom) "
         f"VALUES {values}"
     ))
@@ -0,0 +1,167 @@
+"""서울 100m 격자의 정수 row/col 주소 체계.
+
+generate_seoul_grids가 만드는 격자는 원점 + 고정 간격의 정규 격자이므로,
+좌표 → 격자, 반경 → 격자 집합 변환을 공간 조인 없이 산술로 계산할 수 있다.
+
+    grid_index = row * n_cols + col,  grid_id = grid_index + 1
+"""
+import math
+from dataclasses import dataclass
+
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+# 서울 바운딩박스 (WGS84)
+SEOUL_BOUNDS = {
+    "min_lng": 126.76,
+    "max_lng": 127.18,
+    "min_lat": 37.43,
+    "max_lat": 37.70,
+}
+
+GRID_SIZE_M = 100  # 100m
+
+# aggregate_grids의 degree 변환 상수 (1도 ≈ 111,320m)
+METERS_PER_DEGREE = 111_320
+
+LATTICE_QUERY = text("""
+    SELECT origin_lat, origin_lng, dlat, dlng, n_rows, n_cols
+    FROM grid_lattice ORDER BY id DESC LIMIT 1
+""")
+
+
+@dataclass(frozen=True)
+class Lattice:
+    """정규 격자 파라미터. 격자 (row, col)의 경계는 다음과 같다.
+
+    lat: [origin_lat + row * dlat, 그 값 + dlat)
+    lng: [origin_lng + col * dlng, 그 값 + dlng)
+    """
+
+    origin_lat: float
+    origin_lng: float
+    dlat: float
+    dlng: float
+    n_rows: int
+    n_cols: int
+
+    @classmethod
+    def from_row(cls, row) -> "Lattice":
+        return cls(float(row[0]), float(row[1]), float(row[2]), float(row[3]),
+                   int(row[4]), int(row[5]))
+
+    @property
+    def size(self) -> int:
+        return self.n_rows * self.n_cols
+
+    def grid_id(self, row: int, col: int) -> int:
+        return row * self.n_cols + col + 1
+
+    def row_col(self, grid_id: int) -> tuple[int, int]:
+        return divmod(grid_id - 1, self.n_cols)
+
+    def cell_bounds(self, row: int, col: int) -> tuple[float, float, float, float]:
+        """(min_lng, min_lat, max_lng, max_lat) — generate_seoul_grids와 동일한 계산."""
+        x1 = self.origin_lng + col * self.dlng
+        y1 = self.origin_lat + row * self.dlat
+        return x1, y1, x1 + self.dlng, y1 + self.dlat
+
+    def cell_center(self, row: int, col: int) -> tuple[float, float]:
+        """격자 중심 (lat, lng)."""
+        x1, y1, x2, y2 = self.cell_bounds(row, col)
+        return (y1 + y2) / 2, (x1 + x2) / 2
+
+    def cell_of(self, lat: float, lng: float) -> tuple[int, int] | None:
+        """좌표가 속한 격자 (row, col). 격자 범위 밖이면 None."""
+        row = math.floor((lat - self.origin_lat) / self.dlat)
+        col = math.floor((lng - self.origin_lng) / self.dlng)
+        if 0 <= row < self.n_rows and 0 <= col < self.n_cols:
+            return row, col
+        return None
+
+    def grid_id_of(self, lat: float, lng: float) -> int | None:
+        cell = self.cell_of(lat, lng)
+        return self.grid_id(*cell) if cell else None
+
+    def cell_range(
+        self, min_lat: float, min_lng: float, max_lat: float, max_lng: float,
+    ) -> tuple[int, int, int, int] | None:
+        """사각형과 겹치는 격자의 (row0, row1, col0, col1) 포함 범위. 겹침 없으면 None."""
+        r0 = max(math.floor((min_lat - self.origin_lat) / self.dlat), 0)
+        r1 = min(math.floor((max_lat - self.origin_lat) / self.dlat), self.n_rows - 1)
+        c0 = max(math.floor((min_lng - self.origin_lng) / self.dlng), 0)
+        c1 = min(math.floor((max_lng - self.origin_lng) / self.dlng), self.n_cols - 1)
+        if r0 > r1 or c0 > c1:
+            return None
+        return r0, r1, c0, c1
+
+    def grid_ids_within(self, lat: float, lng: float, radius_m: float) -> np.ndarray:
+        """ST_DWithin(geom, point, radius_m / 111,320)과 같은 기준의 grid_id 배열.
+
+        격자 사각형과 점 사이의 평면(degree) 거리로 판정한다 (aggregate_grids 기준).
+        """
+        radius_deg = radius_m / METERS_PER_DEGREE
+        return self._ids_within(lat, lng, radius_deg, radius_deg, 1.0, 1.0)
+
+    def grid_ids_within_meters(self, lat: float, lng: float, radius_m: float) -> np.ndarray:
+        """ST_DWithin(geom::geography, point::geography, radius_m)의 근사.
+
+        위도별 1도당 미터 환산(WGS84)으로 격자-점 거리를 미터 단위로 판정한다.
+        """
+        phi = math.radians(lat)
+        m_per_lat = 111_132.92 - 559.82 * math.cos(2 * phi) + 1.175 * math.cos(4 * phi)
+        m_per_lng = 111_412.84 * math.cos(phi) - 93.5 * math.cos(3 * phi)
+        return self._ids_within(
+            lat, lng, radius_m / m_per_lat, radius_m / m_per_lng, m_per_lat, m_per_lng,
+        )
+
+    def _ids_within(
+        self, lat: float, lng: float,
+        reach_lat: float, reach_lng: float,
+        scale_lat: float, scale_lng: float,
+    ) -> np.ndarray:
+        radius = reach_lat * scale_lat
+        r0 = max(math.floor((lat - reach_lat - self.origin_lat) / self.dlat) - 1, 0)
+        r1 = min(math.floor((lat + reach_lat - self.origin_lat) / self.dlat) + 1, self.n_rows - 1)
+        c0 = max(math.floor((lng - reach_lng - self.origin_lng) / self.dlng) - 1, 0)
+        c1 = min(math.floor((lng + reach_lng - self.origin_lng) / self.dlng) + 1, self.n_cols - 1)
+        if r0 > r1 or c0 > c1:
+            return np.empty(0, dtype=np.int64)
+
+        rows = np.arange(r0, r1 + 1)
+        cols = np.arange(c0, c1 + 1)
+        y1 = self.origin_lat + rows * self.dlat
+        x1 = self.origin_lng + cols * self.dlng
+        dy = np.maximum(np.maximum(y1 - lat, lat - (y1 + self.dlat)), 0.0) * scale_lat
+        dx = np.maximum(np.maximum(x1 - lng, lng - (x1 + self.dlng)), 0.0) * scale_lng
+        inside = np.sqrt(dy[:, None] ** 2 + dx[None, :] ** 2) <= radius
+
+        rr, cc = np.nonzero(inside)
+        return (rows[rr] * self.n_cols + cols[cc] + 1).astype(np.int64)
+
+
+def build_seoul_lattice() -> Lattice:
+    """SEOUL_BOUNDS / GRID_SIZE_M로 서울 격자 파라미터를 계산한다."""
+    mid_lat = (SEOUL_BOUNDS["min_lat"] + SEOUL_BOUNDS["max_lat"]) / 2
+    dlat = GRID_SIZE_M / METERS_PER_DEGREE
+    dlng = GRID_SIZE_M / (METERS_PER_DEGREE * math.cos(math.radians(mid_lat)))
+    n_rows = math.ceil((SEOUL_BOUNDS["max_lat"] - SEOUL_BOUNDS["min_lat"]) / dlat)
+    n_cols = math.ceil((SEOUL_BOUNDS["max_lng"] - SEOUL_BOUNDS["min_lng"]) / dlng)
+    return Lattice(
+        origin_lat=SEOUL_BOUNDS["min_lat"],
+        origin_lng=SEOUL_BOUNDS["min_lng"],
+        dlat=dlat,
+        dlng=dlng,
+        n_rows=n_rows,
+        n_cols=n_cols,
+    )
+
+
+SEOUL_LATTICE = build_seoul_lattice()
+
+
+def load_lattice(session: Session) -> Lattice | None:
+    """grid_lattice에 기록된 격자 파라미터. 구버전 격자(미기록)면 None."""
+    row = session.execute(LATTICE_QUERY).fetchone()
+    return Lattice.from_row(row) if row else None
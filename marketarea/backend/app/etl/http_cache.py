@@ -0,0 +1,127 @@
+"""ETL HTTP 응답 디스크 캐시 (content-addressed) + 오프라인 재생.
+
+    ETL_HTTP_CACHE_DIR/
+        objects/ab/<sha256(응답 본문)>.json    # 응답 본문 (같은 내용은 한 번만 저장)
+        keys/cd/<sha256(요청)>.json            # 요청 → {url, params, source, fetched_at, object}
+
+요청 키는 URL + 정렬된 params로 만들며, 설정된 API 키 값과 인증 파라미터(serviceKey/apiKey)는
+<redacted>로 바꾼 뒤 해시한다. 캐시 파일에 키가 남지 않고, 키를 교체해도 캐시가 그대로 맞는다.
+
+소스(data_go_kr / seoul / kosis)별 TTL이 지난 항목은 다시 받는다 (TTL 0이면 해당 소스는 캐시 안 함).
+재생 모드(scripts/run_etl.py --replay 또는 ETL_HTTP_REPLAY)에서는 TTL과 무관하게 캐시만 읽고
+네트워크 요청을 보내지 않는다. 캐시에 없는 요청은 응답 없음(None)으로 처리된다.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+from app.config import get_settings
+from app.etl.logger import get_etl_logger
+
+logger = get_etl_logger("http_cache")
+
+REDACTED = "<redacted>"
+# 이름만으로 인증 값임을 알 수 있는 파라미터 (값과 무관하게 가린다)
+SECRET_PARAMS = {"serviceKey", "apiKey"}
+
+_cache: "HttpCache | None" = None
+_replay = False
+
+
+def enable_replay() -> None:
+    """재생 모드를 켠다 (캐시된 응답만 사용, 네트워크 요청 없음)."""
+    global _replay
+    _replay = True
+
+
+def is_replay() -> bool:
+    return _replay or get_settings().ETL_HTTP_REPLAY
+
+
+def get_http_cache() -> "HttpCache | None":
+    """설정된 캐시 (ETL_HTTP_CACHE_DIR가 비어 있으면 None)."""
+    global _cache
+    root = get_settings().ETL_HTTP_CACHE_DIR
+    if not root:
+        return None
+    if _cache is None or _cache.root != Path(root):
+        _cache = HttpCache(Path(root))
+    return _cache
+
+
+def _redact(value: str, secrets: list[str]) -> str:
+    for secret in secrets:
+        value = value.replace(secret, REDACTED)
+    return value
+
+
+class HttpCache:
+    def __init__(self, root: Path):
+        self.root = root
+        self.hits = 0
+        self.misses = 0
+
+    def request_key(self, url: str, params: dict | None) -> tuple[str, dict]:
+        """(요청 해시, 가린 요청 설명)."""
+        settings = get_settings()
+        secrets = [k for k in (
+            settings.DATA_GO_KR_API_KEY, settings.SEOUL_OPEN_DATA_API_KEY, settings.KOSIS_API_KEY,
+        ) if k]
+        redacted = {
+            "url": _redact(url, secrets),
+            "params": {
+                name: REDACTED if name in SECRET_PARAMS else _redact(str(value), secrets)
+                for name, value in sorted((params or {}).items())
+            },
+        }
+        digest = hashlib.sha256(json.dumps(redacted, ensure_ascii=False).encode()).hexdigest()
+        return digest, redacted
+
+    def _path(self, kind: str, digest: str) -> Path:
+        return self.root / kind / digest[:2] / f"{digest}.json"
+
+    def get(self, source: str, url: str, params: dict | None = None) -> dict | list | None:
+        """캐시된 JSON 응답. 없거나 TTL이 지났으면 None (재생 모드는 TTL 무시)."""
+        digest, _ = self.request_key(url, params)
+        try:
+            entry = json.loads(self._path("keys", digest).read_text(encoding="utf-8"))
+            if not is_replay():
+                ttl = get_settings().get_http_cache_ttl(source)
+                if ttl <= 0 or time.time() - entry["fetched_at"] > ttl:
+                    self.misses += 1
+                    return None
+            data = json.loads(self._path("objects", entry["object"]).read_bytes())
+        except (OSError, ValueError, KeyError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return data
+
+    def put(self, source: str, url: str, params: dict | None, content: bytes) -> None:
+        """정상 응답 본문을 저장한다 (TTL 0인 소스는 저장하지 않음). 쓰기 실패는 경고만 남긴다.
+
+        API 오류 응답(HTTP 200 오류 envelope)은 호출 측(api_client)이 걸러서 넘기지 않는다.
+        """
+        if get_settings().get_http_cache_ttl(source) <= 0:
+            return
+        digest, redacted = self.request_key(url, params)
+        obj = hashlib.sha256(content).hexdigest()
+        try:
+            obj_path = self._path("objects", obj)
+            if not obj_path.exists():
+                _write_atomic(obj_path, content)
+            entry = {**redacted, "source": source, "fetched_at": time.time(), "object": obj}
+            _write_atomic(self._path("keys", digest), json.dumps(entry, ensure_ascii=False).encode())
+        except OSError as e:
+            logger.warning("Failed to write HTTP cache entry for %s: %s", redacted["url"], e)
+
+
+def _write_atomic(path: Path, content: bytes) -> None:
+    """임시 파일에 쓴 뒤 이름을 바꿔, 동시에 읽는 쪽이 쓰다 만 파일을 보지 않게 한다."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_bytes(content)
+    os.replace(tmp, path)
@@ -0,0 +1,27 @@
+"""프로세스 메모리 사용량 (ETL 단계별 최대 RSS 로깅)."""
+import resource
+import sys
+
+
+def reset_peak_rss() -> bool:
+    """최대 RSS(VmHWM)를 현재 RSS로 초기화한다 (Linux 전용, 실패하면 False → 프로세스 전체 최대값)."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss_mb() -> float:
+    """마지막 reset_peak_rss() 이후 (또는 프로세스 시작 이후) 최대 RSS (MB)."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss 단위: Linux KB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
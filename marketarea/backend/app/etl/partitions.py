@@ -0,0 +1,148 @@
+"""분기(snapshot_quarter) LIST 파티션 관리 — 통계/점수 테이블은 분기별 파티션으로 나뉜다.
+
+기존 테이블은 alembic 마이그레이션(partition_stats_by_quarter)이 변환하고, create_all로 새로
+만드는 경우는 모델의 postgresql_partition_by + DEFAULT 파티션이 같은 구조를 만든다.
+
+분기마다 전용 파티션(<table>_2024q3)을 두고, 전용 파티션이 없는 분기의 행은 <table>_default에
+쌓인다. "snapshot_quarter = (SELECT MAX(...))" / "snapshot_quarter <= :quarter" 조회는
+파티션 프루닝으로 해당 분기 파티션만 읽으므로 이력이 쌓여도 최신 분기 조회 비용은 같다.
+"""
+import re
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.etl.logger import get_etl_logger
+from app.services.quarters import QUARTER_PATTERN
+
+logger = get_etl_logger("partitions")
+
+PARTITIONED_TABLES = ("grid_store_stats", "grid_sales_stats", "grid_rent_stats", "grid_score")
+PARTITION_KEY = "snapshot_quarter"
+
+# 분리(detach)한 분기 파티션을 보관하는 스키마
+ARCHIVE_SCHEMA = "partition_archive"
+
+
+def partition_name(table: str, quarter: str) -> str:
+    """분기 전용 파티션 이름 ("2024-Q3" → <table>_2024q3)."""
+    if not re.match(QUARTER_PATTERN, quarter):
+        raise ValueError(f"Invalid quarter {quarter!r} (expected e.g. 2024-Q3)")
+    return f"{table}_{quarter[:4]}q{quarter[-1]}"
+
+
+def default_partition_name(table: str) -> str:
+    return f"{table}_default"
+
+
+def _partitioned_schema(session: Session, table: str) -> str | None:
+    """search_path 기준 table이 파티션 테이블이면 그 스키마, 아니면(마이그레이션 전) None."""
+    return session.execute(text("""
+        SELECT n.nspname
+        FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE c.oid = to_regclass(:table) AND c.relkind = 'p'
+    """), {"table": table}).scalar()
+
+
+def list_partitions(session: Session, table: str) -> list:
+    """table의 파티션 목록: (name, bound, est_rows) — est_rows는 통계 기반 추정치."""
+    return session.execute(text("""
+        SELECT c.relname AS name,
+               pg_get_expr(c.relpartbound, c.oid) AS bound,
+               GREATEST(c.reltuples, 0)::bigint AS est_rows
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = to_regclass(:table)
+        ORDER BY c.relname
+    """), {"table": table}).fetchall()
+
+
+def ensure_quarter_partitions(session: Session, table: str, quarters) -> list[str]:
+    """분기 전용 파티션이 없으면 만든다 (commit은 호출 측). → 새로 만든 파티션 이름 목록.
+
+    적재 전에 호출하면 행이 DEFAULT 파티션을 거치지 않고 바로 분기 파티션에 들어간다.
+    DEFAULT 파티션에 이미 그 분기 행이 있으면 새 파티션으로 옮긴다. 부모에 ACCESS EXCLUSIVE
+    락을 거는 CREATE TABLE ... PARTITION OF 대신 별도 테이블을 만들어 ATTACH하므로
+    부모 테이블 조회를 막지 않는다. 파티션 테이블이 아니거나 형식이 다른 분기 라벨은 건너뛴다.
+    """
+    schema = _partitioned_schema(session, table)
+    if schema is None:
+        return []
+    existing = {row.name for row in list_partitions(session, table)}
+    default = default_partition_name(table)
+
+    created = []
+    for quarter in sorted({q for q in quarters if q and re.match(QUARTER_PATTERN, q)}):
+        name = partition_name(table, quarter)
+        if name in existing:
+            continue
+        part = f"{schema}.{name}"
+        session.execute(text(f"CREATE TABLE {part} (LIKE {schema}.{table} INCLUDING CONSTRAINTS)"))
+        if default in existing:
+            session.execute(text(f"""
+                WITH moved AS (
+                    DELETE FROM {schema}.{default} WHERE {PARTITION_KEY} = :quarter RETURNING *
+                )
+                INSERT INTO {part} SELECT * FROM moved
+            """), {"quarter": quarter})
+        session.execute(text(
+            f"ALTER TABLE {schema}.{table} ATTACH PARTITION {part} FOR VALUES IN ('{quarter}')"
+        ))
+        created.append(name)
+
+    if created:
+        logger.info("Created %s partitions: %s", table, ", ".join(created))
+    return created
+
+
+def archive_quarter_partition(session: Session, table: str, quarter: str, drop: bool = False) -> bool:
+    """분기 파티션을 분리해 ARCHIVE_SCHEMA로 옮긴다 (drop=True면 삭제). commit은 호출 측.
+
+    분리된 분기는 조회/점수 계산에서 빠지며 restore_quarter_partition()으로 다시 붙일 수 있다.
+    → 분리했으면 True (그 분기 전용 파티션이 없으면 False)
+    """
+    schema = _partitioned_schema(session, table)
+    name = partition_name(table, quarter)
+    if schema is None or name not in {row.name for row in list_partitions(session, table)}:
+        return False
+
+    session.execute(text(f"ALTER TABLE {schema}.{table} DETACH PARTITION {schema}.{name}"))
+    if drop:
+        session.execute(text(f"DROP TABLE {schema}.{name}"))
+        logger.info("Dropped %s partition %s", table, name)
+        return True
+
+    if session.execute(text("SELECT to_regclass(:name)"), {"name": f"{ARCHIVE_SCHEMA}.{name}"}).scalar():
+        raise ValueError(f"{ARCHIVE_SCHEMA}.{name} already exists")
+    session.execute(text(f"CREATE SCHEMA IF NOT EXISTS {ARCHIVE_SCHEMA}"))
+    session.execute(text(f"ALTER TABLE {schema}.{name} SET SCHEMA {ARCHIVE_SCHEMA}"))
+    logger.info("Archived %s partition %s to %s", table, name, ARCHIVE_SCHEMA)
+    return True
+
+
+def restore_quarter_partition(session: Session, table: str, quarter: str) -> None:
+    """ARCHIVE_SCHEMA에 보관된 분기 파티션을 다시 붙인다. commit은 호출 측."""
+    schema = _partitioned_schema(session, table)
+    name = partition_name(table, quarter)
+    if schema is None:
+        raise ValueError(f"{table} is not partitioned")
+    if not session.execute(text("SELECT to_regclass(:name)"), {"name": f"{ARCHIVE_SCHEMA}.{name}"}).scalar():
+        raise ValueError(f"No archived partition {ARCHIVE_SCHEMA}.{name}")
+    if name in {row.name for row in list_partitions(session, table)}:
+        raise ValueError(f"{table} already has a {quarter} partition")
+
+    session.execute(text(f"ALTER TABLE {ARCHIVE_SCHEMA}.{name} SET SCHEMA {schema}"))
+    session.execute(text(
+        f"ALTER TABLE {schema}.{table} ATTACH PARTITION {schema}.{name} FOR VALUES IN ('{quarter}')"
+    ))
+    logger.info("Restored %s partition %s", table, name)
+
+
+def archived_partitions(session: Session) -> list:
+    """ARCHIVE_SCHEMA에 보관된 파티션 테이블: (name, est_rows)."""
+    return session.execute(text("""
+        SELECT c.relname AS name, GREATEST(c.reltuples, 0)::bigint AS est_rows
+        FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = :schema AND c.relkind = 'r'
+        ORDER BY c.relname
+    """), {"schema": ARCHIVE_SCHEMA}).fetchall()
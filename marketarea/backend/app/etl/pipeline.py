@@ -0,0 +1,127 @@
+"""수집 파이프라인 — fetch → transform → load 단계를 크기 제한 큐로 잇는다.
+
+    stats = run_pipeline("sales", "seoul", seeds=[1], fetch=..., transform=..., load=...)
+
+- fetch(client, key) → (payload | None, 후속 키 목록): 페이지 하나를 받는다. 첫 페이지에서
+  총 건수를 읽어 나머지 페이지 키를 돌려주면 fetcher들이 이어서 동시에 가져온다.
+- transform(payload) → 행 iterable: 응답을 적재할 행(튜플)으로 정규화한다 (이벤트 루프에서 실행).
+- load(rows) → 적재 행 수: 배치를 DB에 쓴다. 별도 스레드에서 실행되어 다음 페이지 수신과 겹친다.
+
+페이지 큐와 배치 큐는 ETL_PIPELINE_QUEUE_SIZE로 제한된다. 적재가 밀리면 transform이, 이어서
+fetcher가 큐에 넣지 못하고 기다리므로(backpressure) 소스의 페이지 수와 관계없이 메모리 안에는
+큐 크기 + fetcher 수만큼의 페이지만 머문다. load는 세션을 쓰는 유일한 단계여야 하며
+commit은 호출 측이 한다.
+"""
+import asyncio
+import time
+from collections.abc import Awaitable, Callable, Iterable, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from app.config import get_settings
+from app.etl.api_client import AsyncApiClient
+from app.etl.logger import get_etl_logger
+
+logger = get_etl_logger("pipeline")
+
+# 단계 종료 표시
+_DONE = object()
+
+FetchFn = Callable[[AsyncApiClient, Any], Awaitable[tuple[Any, list]]]
+
+
+@dataclass
+class PipelineStats:
+    name: str
+    pages: int = 0
+    rows: int = 0
+    loaded: int = 0
+    batches: int = 0
+    fetch_blocked: float = 0.0   # fetcher가 가득 찬 페이지 큐를 기다린 시간 합 (backpressure)
+    load_seconds: float = 0.0
+    elapsed: float = 0.0
+
+
+def run_pipeline(
+    name: str,
+    source: str,
+    seeds: Iterable,
+    fetch: FetchFn,
+    transform: Callable[[Any], Iterable[Sequence]],
+    load: Callable[[list], int],
+) -> PipelineStats:
+    """파이프라인을 끝까지 실행한다 (동기 호출용). 단계 하나가 실패하면 나머지를 취소하고 예외를 올린다."""
+    try:
+        return asyncio.run(_run(name, source, list(seeds), fetch, transform, load))
+    except ExceptionGroup as eg:
+        raise eg.exceptions[0]
+
+
+async def _run(name, source, seeds, fetch, transform, load) -> PipelineStats:
+    settings = get_settings()
+    queue_size = max(settings.ETL_PIPELINE_QUEUE_SIZE, 1)
+    batch_rows = max(settings.ETL_PIPELINE_BATCH_ROWS, 1)
+    n_fetchers, _ = settings.get_api_limits(source)
+
+    stats = PipelineStats(name)
+    work: asyncio.Queue = asyncio.Queue()
+    pages: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+    batches: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+    for key in seeds:
+        work.put_nowait(key)
+
+    async def fetcher(client: AsyncApiClient):
+        while True:
+            key = await work.get()
+            try:
+                payload, follow = await fetch(client, key)
+                for next_key in follow:
+                    work.put_nowait(next_key)
+                if payload is not None:
+                    waited = time.perf_counter()
+                    await pages.put(payload)
+                    stats.fetch_blocked += time.perf_counter() - waited
+                    stats.pages += 1
+            finally:
+                work.task_done()
+
+    async def transformer():
+        batch = []
+        while (payload := await pages.get()) is not _DONE:
+            batch.extend(transform(payload))
+            # 배치가 찼거나 대기 중인 페이지가 없으면 바로 넘겨 적재가 수신과 겹치게 한다
+            if len(batch) >= batch_rows or (batch and pages.empty()):
+                await batches.put(batch)
+                batch = []
+        if batch:
+            await batches.put(batch)
+        await batches.put(_DONE)
+
+    async def loader():
+        while (batch := await batches.get()) is not _DONE:
+            started = time.perf_counter()
+            stats.loaded += await asyncio.to_thread(load, batch)
+            stats.load_seconds += time.perf_counter() - started
+            stats.rows += len(batch)
+            stats.batches += 1
+
+    started = time.perf_counter()
+    async with AsyncApiClient() as client:
+        async with asyncio.TaskGroup() as tg:
+            fetchers = [tg.create_task(fetcher(client)) for _ in range(n_fetchers)]
+            tg.create_task(transformer())
+            tg.create_task(loader())
+            await work.join()
+            for task in fetchers:
+                task.cancel()
+            await pages.put(_DONE)
+    stats.elapsed = time.perf_counter() - started
+
+    logger.info(
+        "Pipeline %s: %d pages → %s rows → %s loaded in %d batches, %.1fs "
+        "(load %.1fs, %s rows/s; fetch blocked %.1fs)",
+        name, stats.pages, f"{stats.rows:,}", f"{stats.loaded:,}", stats.batches,
+        stats.elapsed, stats.load_seconds, f"{stats.loaded / max(stats.load_seconds, 1e-9):,.0f}",
+        stats.fetch_blocked,
+    )
+    return stats
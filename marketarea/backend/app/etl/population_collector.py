@@ -8,26 +8,33 @@ from sqlalchemy.orm import Session
 
 from app.config import get_settings
 from app.etl.api_client import fetch_json
+from app.etl.bulk_copy import copy_rows
+from app.etl.change_tracking import track_changes
 from app.etl.logger import get_etl_logger
-from app.etl.seoul_districts import get_grid_ids_for_dong, get_grid_ids_for_gu, SEOUL_GU
+from app.etl.seoul_districts import get_grid_ids_for_gu, SEOUL_GU
 
 logger = get_etl_logger("population_collector")
 SAMPLE_DIR = Path(__file__).parent / "sample_data"
 
+POPULATION_COLUMNS = (
+    "grid_id", "total_population", "age_20_39_ratio",
+    "age_40_59_ratio", "age_60_plus_ratio", "household_1_2_ratio", "snapshot_date",
+)
+
 
 def collect_population(session: Session) -> int:
     settings = get_settings()
-    if settings.should_use_sample or not settings.has_key("kosis"):
-        logger.info("Using sample data for population")
-        return _load_sample(session)
-    logger.info("Collecting population from API")
-    return _collect_from_api(session, settings.KOSIS_API_KEY)
+    with track_changes(session, "grid_population_stats"):
+        if settings.should_use_sample or not settings.has_key("kosis"):
+            logger.info("Using sample data for population")
+            return _load_sample(session)
+        logger.info("Collecting population from API")
+        return _collect_from_api(session, settings.KOSIS_API_KEY)
 
 
 def _collect_from_api(session: Session, api_key: str) -> int:
     """KOSIS API에서 읍면동별 인구 데이터 수집."""
-    base_url = "https://kosis.kr/openapi/Param/statisticsParameterData.do"
-    count = 0
+    base_url = f"{get_settings().API_BASE_URL_KOSIS}/openapi/Param/statisticsParameterData.do"
 
     data = fetch_json(base_url, params={
         "method": "getList",
@@ -42,7 +49,7 @@ def _collect_from_api(session: Session, api_key: str) -> int:
         "endPrdDe": "202412",
         "orgId": "101",
         "tblId": "DT_1B04005N",
-    })
+    }, source="kosis")
 
     if not data:
         logger.error("Failed to fetch population data from KOSIS")
@@ -108,21 +115,12 @@ def _collect_from_api(session: Session, api_key: str) -> int:
                 grid_agg[grid_id] = {"total": 0, "r1": r1, "r2": r2, "r3": r3}
             grid_agg[grid_id]["total"] += per_grid
 
-    # 합산된 데이터를 INSERT
+    # 합산된 데이터를 COPY로 적재
     today = date.today()
-    for grid_id, agg in grid_agg.items():
-        session.execute(text("""
-            INSERT INTO grid_population_stats
-                (grid_id, total_population, age_20_39_ratio,
-                 age_40_59_ratio, age_60_plus_ratio,
-                 household_1_2_ratio, snapshot_date)
-            VALUES (:gid, :total, :r1, :r2, :r3, 0.40, :sd)
-        """), {
-            "gid": grid_id, "total": agg["total"],
-            "r1": agg["r1"], "r2": agg["r2"], "r3": agg["r3"],
-            "sd": today,
-        })
-        count += 1
+    count = copy_rows(session, "grid_population_stats", POPULATION_COLUMNS, (
+        (grid_id, agg["total"], agg["r1"], agg["r2"], agg["r3"], 0.40, today)
+        for grid_id, agg in grid_agg.items()
+    ))
 
     session.commit()
     logger.info("Population mapped to %d grid entries", count)
@@ -137,22 +135,14 @@ def _load_sample(session: Session) -> int:
 
     session.execute(text("DELETE FROM grid_population_stats"))
 
-    for r in records:
-        session.execute(text("""
-            INSERT INTO grid_population_stats
-                (grid_id, total_population, age_20_39_ratio,
-                 age_40_59_ratio, age_60_plus_ratio,
-                 household_1_2_ratio, snapshot_date)
-            VALUES (:gid, :total, :r1, :r2, :r3, :h12, :sd)
-        """), {
-            "gid": r["grid_id"],
-            "total": r["total_population"],
-            "r1": r["age_20_39_ratio"],
-            "r2": r["age_40_59_ratio"],
-            "r3": r["age_60_plus_ratio"],
-            "h12": r["household_1_2_ratio"],
-            "sd": date.today(),
-        })
+    today = date.today()
+    copy_rows(session, "grid_population_stats", POPULATION_COLUMNS, (
+        (
+            r["grid_id"], r["total_population"], r["age_20_39_ratio"],
+            r["age_40_59_ratio"], r["age_60_plus_ratio"], r["household_1_2_ratio"], today,
+        )
+        for r in records
+    ))
 
     session.commit()
     logger.info("Sample population data loaded: %d records", len(records))
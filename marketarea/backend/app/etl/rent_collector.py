@@ -6,55 +6,69 @@ from sqlalchemy import text
 from sqlalchemy.orm import Session
 
 from app.config import get_settings
-from app.etl.api_client import fetch_json
+from app.etl.api_client import AsyncApiClient
+from app.etl.bulk_copy import copy_rows
+from app.etl.change_tracking import track_changes
 from app.etl.logger import get_etl_logger
+from app.etl.partitions import ensure_quarter_partitions
+from app.etl.pipeline import run_pipeline
 from app.etl.seoul_districts import get_grid_ids_for_gu, GU_CODES
 
 logger = get_etl_logger("rent_collector")
 SAMPLE_DIR = Path(__file__).parent / "sample_data"
 
+# API 수집 분기 (DEAL_YMD 202401)
+RENT_QUARTER = "2024-Q1"
+
+RENT_COLUMNS = ("grid_id", "rent_per_m2", "deposit_per_m2", "rent_price_index", "snapshot_quarter")
+
 
 def collect_rent(session: Session) -> int:
     settings = get_settings()
-    if settings.should_use_sample or not settings.has_key("data_go_kr"):
-        logger.info("Using sample data for rent")
-        return _load_sample(session)
-    logger.info("Collecting rent from API")
-    return _collect_from_api(session, settings.DATA_GO_KR_API_KEY)
+    with track_changes(session, "grid_rent_stats"):
+        if settings.should_use_sample or not settings.has_key("data_go_kr"):
+            logger.info("Using sample data for rent")
+            return _load_sample(session)
+        logger.info("Collecting rent from API")
+        return _collect_from_api(session, settings.DATA_GO_KR_API_KEY)
 
 
 def _collect_from_api(session: Session, api_key: str) -> int:
-    """한국부동산원 임대동향 API (data.go.kr/15002275)."""
-    base_url = "https://apis.data.go.kr/1613000/RTMSDataSvcOffiRent/getRTMSDataSvcOffiRent"
-    count = 0
+    """한국부동산원 임대동향 API (data.go.kr/15002275).
 
-    session.execute(text("DELETE FROM grid_rent_stats"))
+    구별 응답을 동시에 받으면서 받은 구부터 구 평균을 구에 속한 grid들에 균등 배분해
+    COPY로 적재한다 (app.etl.pipeline).
+    """
+    base_url = (
+        f"{get_settings().API_BASE_URL_DATA_GO_KR}"
+        "/1613000/RTMSDataSvcOffiRent/getRTMSDataSvcOffiRent"
+    )
 
-    # 구별 grid_id 캐시
-    gu_grids_cache: dict[str, list[int]] = {}
+    session.execute(text("DELETE FROM grid_rent_stats"))
+    ensure_quarter_partitions(session, "grid_rent_stats", [RENT_QUARTER])
 
-    for gu_code in GU_CODES:
-        data = fetch_json(base_url, params={
+    async def fetch(client: AsyncApiClient, gu_code: str):
+        data = await client.fetch_json("data_go_kr", base_url, params={
             "serviceKey": api_key,
             "LAWD_CD": gu_code,
             "DEAL_YMD": "202401",
             "numOfRows": 1000,
             "type": "json",
         })
-
         if not data:
             logger.warning("No response for rent gu_code=%s, skipping", gu_code)
-            continue
-
+            return None, []
         items = data.get("response", {}).get("body", {}).get("items", {}).get("item", [])
         if not isinstance(items, list):
             items = [items] if items else []
-
         if not items:
             logger.debug("No rent items for gu_code=%s", gu_code)
-            continue
+            return None, []
+        return (gu_code, items), []
 
-        # 구 단위 집계
+    def transform(payload):
+        """구 응답 → [(구 코드, m2당 월세, m2당 보증금, 거래 수)] (면적 없는 거래 제외)."""
+        gu_code, items = payload
         total_rent = 0.0
         total_deposit = 0.0
         total_area = 0.0
@@ -72,40 +86,28 @@ def _collect_from_api(session: Session, api_key: str) -> int:
             item_count += 1
 
         if item_count == 0 or total_area == 0:
-            continue
-
-        avg_rent_per_m2 = total_rent / total_area
-        avg_deposit_per_m2 = total_deposit / total_area
-
-        # 구에 속한 grid들에 균등 배분
-        if gu_code not in gu_grids_cache:
-            gu_grids_cache[gu_code] = get_grid_ids_for_gu(session, gu_code)
-        grids = gu_grids_cache[gu_code]
-
-        if not grids:
-            logger.debug("No grids for gu_code=%s", gu_code)
-            continue
-
-        for grid_id in grids:
-            session.execute(text("""
-                INSERT INTO grid_rent_stats
-                    (grid_id, rent_per_m2, deposit_per_m2,
-                     rent_price_index, snapshot_quarter)
-                VALUES (:gid, :rent, :dep, 100.0, :q)
-            """), {
-                "gid": grid_id,
-                "rent": avg_rent_per_m2,
-                "dep": avg_deposit_per_m2,
-                "q": "2024-Q1",
-            })
-            count += 1
-
-        logger.info("gu_code=%s: %d items → %d grids, avg_rent=%.0f/m2",
-                     gu_code, item_count, len(grids), avg_rent_per_m2)
+            return []
+        return [(gu_code, total_rent / total_area, total_deposit / total_area, item_count)]
+
+    def load(rows: list) -> int:
+        count = 0
+        for gu_code, avg_rent_per_m2, avg_deposit_per_m2, item_count in rows:
+            grids = get_grid_ids_for_gu(session, gu_code)
+            if not grids:
+                logger.debug("No grids for gu_code=%s", gu_code)
+                continue
+            count += copy_rows(session, "grid_rent_stats", RENT_COLUMNS, (
+                (grid_id, avg_rent_per_m2, avg_deposit_per_m2, 100.0, RENT_QUARTER) for grid_id in grids
+            ), log=False)
+            logger.info("gu_code=%s: %d items → %d grids, avg_rent=%.0f/m2",
+                        gu_code, item_count, len(grids), avg_rent_per_m2)
+        return count
+
+    stats = run_pipeline("rent", "data_go_kr", GU_CODES, fetch, transform, load)
 
     session.commit()
-    logger.info("Rent data mapped to %d grid entries", count)
-    return count
+    logger.info("Rent data mapped to %d grid entries", stats.loaded)
+    return stats.loaded
 
 
 def _load_sample(session: Session) -> int:
@@ -115,20 +117,12 @@ def _load_sample(session: Session) -> int:
         records = json.load(f)
 
     session.execute(text("DELETE FROM grid_rent_stats"))
+    ensure_quarter_partitions(session, "grid_rent_stats", {r["snapshot_quarter"] for r in records})
 
-    for r in records:
-        session.execute(text("""
-            INSERT INTO grid_rent_stats
-                (grid_id, rent_per_m2, deposit_per_m2,
-                 rent_price_index, snapshot_quarter)
-            VALUES (:gid, :rent, :dep, :idx, :q)
-        """), {
-            "gid": r["grid_id"],
-            "rent": r["rent_per_m2"],
-            "dep": r["deposit_per_m2"],
-            "idx": r["rent_price_index"],
-            "q": r["snapshot_quarter"],
-        })
+    copy_rows(session, "grid_rent_stats", RENT_COLUMNS, (
+        (r["grid_id"], r["rent_per_m2"], r["deposit_per_m2"], r["rent_price_index"], r["snapshot_quarter"])
+        for r in records
+    ))
 
     session.commit()
     logger.info("Sample rent data loaded: %d records", len(records))
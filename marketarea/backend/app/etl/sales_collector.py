@@ -6,125 +6,127 @@ from sqlalchemy import text
 from sqlalchemy.orm import Session
 
 from app.config import get_settings
-from app.etl.api_client import fetch_json
+from app.etl.api_client import AsyncApiClient
+from app.etl.bulk_copy import copy_rows
+from app.etl.change_tracking import track_changes
 from app.etl.logger import get_etl_logger
-from app.etl.seoul_districts import get_grid_ids_for_gu, GU_CODES
+from app.etl.partitions import ensure_quarter_partitions
+from app.etl.pipeline import run_pipeline
+from app.etl.seoul_districts import GU_CODES
+from app.services.quarters import normalize_quarter
 
 logger = get_etl_logger("sales_collector")
 SAMPLE_DIR = Path(__file__).parent / "sample_data"
 
+# API 페이지 크기 (요청당 최대 행 수)
+PAGE_SIZE = 1000
+
 
 def collect_sales(session: Session) -> int:
     settings = get_settings()
-    if settings.should_use_sample or not settings.has_key("seoul"):
-        logger.info("Using sample data for sales")
-        return _load_sample(session)
-    logger.info("Collecting sales from API")
-    return _collect_from_api(session, settings.SEOUL_OPEN_DATA_API_KEY)
+    with track_changes(session, "grid_sales_stats"):
+        if settings.should_use_sample or not settings.has_key("seoul"):
+            logger.info("Using sample data for sales")
+            return _load_sample(session)
+        logger.info("Collecting sales from API")
+        return _collect_from_api(session, settings.SEOUL_OPEN_DATA_API_KEY)
 
 
 def _collect_from_api(session: Session, api_key: str) -> int:
-    """서울시 상권분석 추정매출 API (OA-15572)."""
-    base_url = f"http://openapi.seoul.go.kr:8088/{api_key}/json/VwsmTrdarSelngQq"
-    count = 0
-    start = 1
-
-    session.execute(text("DELETE FROM grid_sales_stats"))
+    """서울시 상권분석 추정매출 API (OA-15572).
 
-    # 구별 grid_id 캐시 (매번 쿼리하지 않도록)
-    gu_grids_cache: dict[str, list[int]] = {}
-    # grid별 합산 딕셔너리: (grid_id, ind_code, quarter) -> {sales, cnt, ticket}
-    grid_sales_agg: dict[tuple, dict] = {}
+    페이지를 동시에 받으면서 페이지별 구 × 업종 × 분기 합계를 임시 테이블 sales_stage에 COPY로 쌓고
+    (app.etl.pipeline), 모든 페이지가 끝나면 구 합계를 구에 매핑된 grid 수로 나눠 더하는 배분
+    (여러 구에 걸친 grid는 합산)을 grid_district 조인 한 번의 INSERT ... SELECT로 한다.
+    """
+    base_url = f"{get_settings().API_BASE_URL_SEOUL}/{api_key}/json/VwsmTrdarSelngQq"
 
-    while True:
-        end = start + 999
-        data = fetch_json(f"{base_url}/{start}/{end}/")
+    session.execute(text("DELETE FROM grid_sales_stats"))
+    session.execute(text("DROP TABLE IF EXISTS sales_stage"))
+    session.execute(text("""
+        CREATE TEMP TABLE sales_stage (
+            gu_code varchar(5), industry_code varchar(10), quarter varchar(7),
+            sales double precision, cnt bigint
+        )
+    """))
+
+    async def fetch(client: AsyncApiClient, start: int):
+        """시작 행 → (시작 행, rows). 첫 페이지는 list_total_count로 나머지 구간을 예약하고,
+        총 건수가 없으면 꽉 찬 페이지마다 다음 구간을 하나씩 예약한다."""
+        end = start + PAGE_SIZE - 1
+        data = await client.fetch_json("seoul", f"{base_url}/{start}/{end}/")
         if not data:
             logger.warning("No response for sales API at offset %d", start)
-            break
-
+            return None, []
         result = data.get("VwsmTrdarSelngQq", {})
-        items = result.get("row", [])
+        items = result.get("row") or []
         if not items:
-            break
-
-        logger.info("Processing sales batch: rows %d-%d (%d items)", start, end, len(items))
-
-        # 구 단위로 집계 후 grid에 배분
-        # 상권코드(TRDAR_CD) 앞 5자리가 구 코드에 대응하지 않으므로,
-        # 상권코드 → 구 매핑은 별도 API가 필요. 대안: 전체를 구 균등 배분 대신
-        # 상권코드별 데이터를 구 단위 집계 후 배분
-        gu_sales: dict[str, dict[str, dict]] = {}  # gu_code -> ind_code -> {sales, cnt}
-
+            return None, []
+
+        try:
+            total = int(result.get("list_total_count"))
+        except (TypeError, ValueError):
+            total = None
+        if total is None:
+            follow = [start + PAGE_SIZE] if len(items) >= PAGE_SIZE else []
+        elif start == 1:
+            follow = list(range(1 + PAGE_SIZE, total + 1, PAGE_SIZE))
+        else:
+            follow = []
+        return (start, items), follow
+
+    def transform(payload):
+        start, items = payload
+        logger.info("Processing sales batch: rows %d-%d (%d items)",
+                    start, start + PAGE_SIZE - 1, len(items))
+
+        # 상권코드(TRDAR_CD) 앞 5자리로 구를 추정해 구 × 업종 × 분기로 합산한다.
+        # 구 코드로 매핑되지 않는 상권은 배분할 수 없으므로 제외한다
+        gu_sales: dict[tuple, list] = {}  # (gu_code, ind_code, quarter) -> [sales, cnt]
         for item in items:
             trdar_cd = item.get("TRDAR_CD", "")
-            ind_code = item.get("SVC_INDUTY_CD", "")
-            sales = float(item.get("THSMON_SELNG_AMT", 0))
-            sales_cnt = int(item.get("THSMON_SELNG_CO", 0))
-            quarter = item.get("STDR_YYQU_CD", "")
-
-            # 상권코드에서 구 코드 추출 시도 (앞 5자리)
             gu_code = trdar_cd[:5] if len(trdar_cd) >= 5 else ""
             if gu_code not in GU_CODES:
-                # 구 코드로 매핑 안 되면 전체 서울 균등 배분용으로 모음
-                gu_code = "11000"  # placeholder for citywide
-
-            key = f"{gu_code}_{ind_code}_{quarter}"
-            if gu_code not in gu_sales:
-                gu_sales[gu_code] = {}
-            if ind_code not in gu_sales[gu_code]:
-                gu_sales[gu_code][ind_code] = {
-                    "sales": 0.0, "cnt": 0, "quarter": quarter,
-                }
-            gu_sales[gu_code][ind_code]["sales"] += sales
-            gu_sales[gu_code][ind_code]["cnt"] += sales_cnt
-
-        # 구별로 grid에 배분 → grid별 합산 딕셔너리에 축적
-        for gu_code, industries in gu_sales.items():
-            if gu_code == "11000":
-                continue
-
-            if gu_code not in gu_grids_cache:
-                gu_grids_cache[gu_code] = get_grid_ids_for_gu(session, gu_code)
-            grids = gu_grids_cache[gu_code]
-            if not grids:
                 continue
-
-            for ind_code, agg in industries.items():
-                total_sales = agg["sales"]
-                total_cnt = agg["cnt"]
-                quarter = agg["quarter"]
-                per_grid_sales = total_sales / len(grids)
-                per_grid_cnt = max(total_cnt // len(grids), 1)
-                avg_ticket = total_sales / total_cnt if total_cnt > 0 else 0
-
-                for grid_id in grids:
-                    key = (grid_id, ind_code, quarter)
-                    if key not in grid_sales_agg:
-                        grid_sales_agg[key] = {"sales": 0.0, "cnt": 0, "ticket": avg_ticket}
-                    grid_sales_agg[key]["sales"] += per_grid_sales
-                    grid_sales_agg[key]["cnt"] += per_grid_cnt
-
-        if len(items) < 1000:
-            break
-        start += 1000
-
-    # 합산된 데이터를 INSERT
-    for (grid_id, ind_code, quarter), agg in grid_sales_agg.items():
-        session.execute(text("""
-            INSERT INTO grid_sales_stats
-                (grid_id, industry_code, quarterly_sales,
-                 quarterly_count, avg_ticket_price, snapshot_quarter)
-            VALUES (:gid, :code, :sales, :cnt, :ticket, :q)
-        """), {
-            "gid": grid_id,
-            "code": ind_code,
-            "sales": agg["sales"],
-            "cnt": agg["cnt"],
-            "ticket": agg["ticket"],
-            "q": quarter,
-        })
-        count += 1
+            key = (gu_code, item.get("SVC_INDUTY_CD", ""), normalize_quarter(item.get("STDR_YYQU_CD", "")))
+            agg = gu_sales.setdefault(key, [0.0, 0])
+            agg[0] += float(item.get("THSMON_SELNG_AMT", 0))
+            agg[1] += int(item.get("THSMON_SELNG_CO", 0))
+        return [(*key, sales, cnt) for key, (sales, cnt) in gu_sales.items()]
+
+    def load(rows: list) -> int:
+        return copy_rows(
+            session, "sales_stage", ("gu_code", "industry_code", "quarter", "sales", "cnt"), rows, log=False,
+        )
+
+    run_pipeline("sales", "seoul", [1], fetch, transform, load)
+
+    # 분기 파티션을 먼저 만든다
+    quarters = session.execute(text("SELECT DISTINCT quarter FROM sales_stage")).scalars().all()
+    ensure_quarter_partitions(session, "grid_sales_stats", quarters)
+    count = session.execute(text("""
+        INSERT INTO grid_sales_stats
+            (grid_id, industry_code, quarterly_sales,
+             quarterly_count, avg_ticket_price, snapshot_quarter)
+        SELECT m.grid_id, s.industry_code,
+               SUM(s.sales / n.grids),
+               SUM(GREATEST(s.cnt / n.grids, 1)),
+               COALESCE(SUM(s.sales) / NULLIF(SUM(s.cnt), 0), 0),
+               s.quarter
+        FROM (
+            SELECT gu_code, industry_code, quarter, SUM(sales) AS sales, CAST(SUM(cnt) AS bigint) AS cnt
+            FROM sales_stage
+            GROUP BY gu_code, industry_code, quarter
+        ) s
+        JOIN grid_district m ON m.district_type = 'gu' AND m.district_code = s.gu_code
+        JOIN (
+            SELECT district_code, COUNT(*) AS grids
+            FROM grid_district WHERE district_type = 'gu'
+            GROUP BY district_code
+        ) n ON n.district_code = s.gu_code
+        GROUP BY m.grid_id, s.industry_code, s.quarter
+    """)).rowcount
+    session.execute(text("DROP TABLE sales_stage"))
 
     session.commit()
     logger.info("Sales data mapped to %d grid entries", count)
@@ -138,23 +140,18 @@ def _load_sample(session: Session) -> int:
         records = json.load(f)
 
     session.execute(text("DELETE FROM grid_sales_stats"))
-
-    for r in records:
-        session.execute(text("""
-            INSERT INTO grid_sales_stats
-                (grid_id, industry_code, quarterly_sales,
-                 quarterly_count, avg_ticket_price, sales_per_store,
-                 snapshot_quarter)
-            VALUES (:gid, :code, :sales, :cnt, :ticket, :sps, :q)
-        """), {
-            "gid": r["grid_id"],
-            "code": r["industry_code"],
-            "sales": r["quarterly_sales"],
-            "cnt": r["quarterly_count"],
-            "ticket": r["avg_ticket_price"],
-            "sps": r.get("sales_per_store", 0),
-            "q": r["snapshot_quarter"],
-        })
+    ensure_quarter_partitions(session, "grid_sales_stats", {r["snapshot_quarter"] for r in records})
+
+    copy_rows(session, "grid_sales_stats", (
+        "grid_id", "industry_code", "quarterly_sales", "quarterly_count",
+        "avg_ticket_price", "sales_per_store", "snapshot_quarter",
+    ), (
+        (
+            r["grid_id"], r["industry_code"], r["quarterly_sales"], r["quarterly_count"],
+            r["avg_ticket_price"], r.get("sales_per_store", 0), r["snapshot_quarter"],
+        )
+        for r in records
+    ))
 
     session.commit()
     logger.info("Sample sales data loaded: %d records", len(records))
@@ -1,4 +1,4 @@
-"""서울 25개 구 코드, 이름, 중심 좌표 매핑 + 행정동 중심 좌표."""
+"""서울 25개 구 코드, 이름, 중심 좌표 매핑 + 행정동 중심 좌표 + 구/동 → 격자 조회."""
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 from app.etl.logger import get_etl_logger
@@ -223,42 +223,28 @@ def get_gu_code_from_dong_code(dong_code: str) -> str | None:
     return None
 
 
-def get_grid_ids_for_gu(session: Session, gu_code: str, radius_m: int = 3000) -> list[int]:
-    """구 중심 좌표에서 radius_m 반경 내 grid_id 목록을 반환."""
-    gu = SEOUL_GU.get(gu_code)
-    if not gu:
-        return []
-    rows = session.execute(text("""
-        SELECT id FROM grid_master
-        WHERE ST_DWithin(
-            geom::geography,
-            ST_SetSRID(ST_MakePoint(:lng, :lat), 4326)::geography,
-            :radius
-        )
-    """), {"lat": gu["lat"], "lng": gu["lng"], "radius": radius_m}).fetchall()
-    return [r[0] for r in rows]
+def _mapped_grid_ids(session: Session, kind: str, code: str) -> list[int]:
+    """grid_district에 매핑된 grid_id 목록 (인덱스 등호 조회, app.etl.district_mapping)."""
+    return session.execute(text("""
+        SELECT grid_id FROM grid_district
+        WHERE district_type = :kind AND district_code = :code
+        ORDER BY grid_id
+    """), {"kind": kind, "code": code}).scalars().all()
 
 
-def get_grid_ids_for_dong(session: Session, dong_code: str, radius_m: int = 500) -> list[int]:
-    """행정동 중심 좌표에서 radius_m 반경 내 grid_id 목록을 반환."""
-    dong = SEOUL_DONG.get(dong_code)
-    if not dong:
-        # 동 코드를 못 찾으면 구 단위로 폴백
-        gu_code = get_gu_code_from_dong_code(dong_code)
-        if gu_code:
-            return get_grid_ids_for_gu(session, gu_code)
+def get_grid_ids_for_gu(session: Session, gu_code: str) -> list[int]:
+    """구 중심 좌표에서 3km 반경 내 grid_id 목록을 반환."""
+    if gu_code not in SEOUL_GU:
         return []
-    rows = session.execute(text("""
-        SELECT id FROM grid_master
-        WHERE ST_DWithin(
-            geom::geography,
-            ST_SetSRID(ST_MakePoint(:lng, :lat), 4326)::geography,
-            :radius
-        )
-    """), {"lat": dong["lat"], "lng": dong["lng"], "radius": radius_m}).fetchall()
-    if not rows:
-        # 반경 내 grid가 없으면 구 단위로 폴백
+    return _mapped_grid_ids(session, "gu", gu_code)
+
+
+def get_grid_ids_for_dong(session: Session, dong_code: str) -> list[int]:
+    """행정동 중심 좌표에서 500m 반경 내 grid_id 목록을 반환."""
+    grid_ids = _mapped_grid_ids(session, "dong", dong_code) if dong_code in SEOUL_DONG else []
+    if not grid_ids:
+        # 동 코드를 못 찾았거나 반경 내 grid가 없으면 구 단위로 폴백
         gu_code = get_gu_code_from_dong_code(dong_code)
         if gu_code:
             return get_grid_ids_for_gu(session, gu_code)
-    return [r[0] for r in rows]
+    return grid_ids
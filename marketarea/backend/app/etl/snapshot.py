@@ -0,0 +1,240 @@
+"""스냅샷 게시 — ETL은 섀도 스키마에 쓰고, 한 트랜잭션의 스키마 이동으로 교체한다.
+
+    prepare_shadow(session)                    # public 테이블 → etl_shadow 복제
+    engine = create_engine(url, connect_args=shadow_connect_args())
+    ...                                        # 수집/점수/집계 (search_path로 섀도에 기록)
+    publish_snapshot(session, "run_etl")       # public ↔ etl_shadow 교체
+    discard_shadow(session)                    # (단계 실패 시) 게시하지 않고 섀도 삭제
+
+API는 public만 읽으므로 ETL 도중에도 직전에 게시된 완전한 스냅샷을 본다.
+교체되어 물러난 테이블은 snapshot_<id> 스키마에 SNAPSHOT_RETENTION개까지 보관되며
+rollback_snapshot()으로 다시 게시할 수 있다.
+
+스냅샷 테이블에는 grid_master 외래키를 두지 않는다 (격자 재생성의
+TRUNCATE grid_master CASCADE가 게시/보관된 스냅샷까지 비우지 않도록).
+분기 파티션 테이블(app.etl.partitions)은 파티션까지 함께 복제/이동한다.
+"""
+import re
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.etl.logger import get_etl_logger
+from app.services.dataset_version import publish_dataset_version
+
+logger = get_etl_logger("snapshot")
+
+SHADOW_SCHEMA = "etl_shadow"
+ARCHIVE_PREFIX = "snapshot_"
+
+# 한 스냅샷으로 함께 교체되는 테이블 (ETL이 쓰는 테이블 전부, grid_master 제외)
+SNAPSHOT_TABLES = (
+    "store_master",
+    "grid_store_stats",
+    "grid_floating_stats",
+    "grid_population_stats",
+    "grid_sales_stats",
+    "grid_rent_stats",
+    "grid_score",
+    "score_run",
+    "score_change_set",
+    "grid_summed_area",
+    "grid_radius_stats",
+    "grid_radius_score",
+)
+
+# 교체 시 ACCESS EXCLUSIVE 락 대기 한도 (긴 API 쿼리 뒤에서 무한정 기다리지 않도록)
+SWAP_LOCK_TIMEOUT = "30s"
+
+
+def shadow_connect_args() -> dict:
+    """ETL 엔진용 connect_args — 이름만 쓴 테이블이 섀도 스키마를 먼저 가리키게 한다."""
+    return {"options": f"-csearch_path={SHADOW_SCHEMA},public"}
+
+
+def prepare_shadow(session: Session) -> None:
+    """현재 게시된 테이블을 섀도 스키마에 데이터째 복제한다 (증분 수집/점수의 시작점)."""
+    session.execute(text(f"DROP SCHEMA IF EXISTS {SHADOW_SCHEMA} CASCADE"))
+    session.execute(text(f"CREATE SCHEMA {SHADOW_SCHEMA}"))
+    for table in SNAPSHOT_TABLES:
+        _drop_foreign_keys(session, f"public.{table}")
+        _clone_table(session, table, "public", SHADOW_SCHEMA)
+    session.commit()
+    logger.info("Prepared shadow schema %s (%d tables)", SHADOW_SCHEMA, len(SNAPSHOT_TABLES))
+
+
+def _drop_foreign_keys(session: Session, table: str) -> None:
+    """create_all이 만든 외래키를 제거한다 (스냅샷 테이블은 grid_master와 독립)."""
+    names = session.execute(text("""
+        SELECT conname FROM pg_constraint
+        WHERE contype = 'f' AND conrelid = CAST(:table AS regclass)
+    """), {"table": table}).scalars().all()
+    for name in names:
+        session.execute(text(f"ALTER TABLE {table} DROP CONSTRAINT {name}"))
+
+
+def _partitions(session: Session, table: str) -> list:
+    """파티션 테이블의 파티션 (이름, 범위 절). 일반 테이블이면 빈 목록."""
+    return session.execute(text("""
+        SELECT c.relname, pg_get_expr(c.relpartbound, c.oid)
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = CAST(:table AS regclass)
+        ORDER BY c.relname
+    """), {"table": table}).fetchall()
+
+
+def _clone_table(session: Session, table: str, source: str, target: str) -> None:
+    """컬럼/기본값/인덱스 이름까지 같은 테이블을 만들고 데이터를 복사한다.
+
+    id 시퀀스는 새 테이블 소유로 따로 만들어, 원본이 보관/삭제되어도 영향이 없다.
+    인덱스는 데이터 복사 후에 만든다. 파티션 테이블은 같은 파티션 키/파티션을 만든 뒤 복사한다
+    (부모에 만든 인덱스/기본 키는 모든 파티션에 전파된다).
+    """
+    src, dst = f"{source}.{table}", f"{target}.{table}"
+    indexes = session.execute(text("""
+        SELECT c.relname, pg_get_indexdef(i.indexrelid), i.indisprimary,
+               pg_get_constraintdef(con.oid)
+        FROM pg_index i
+        JOIN pg_class c ON c.oid = i.indexrelid
+        LEFT JOIN pg_constraint con ON con.conindid = i.indexrelid AND con.contype = 'p'
+        WHERE i.indrelid = CAST(:table AS regclass)
+        ORDER BY i.indisprimary DESC, c.relname
+    """), {"table": src}).fetchall()
+    partition_key = session.execute(text("""
+        SELECT pg_get_partkeydef(CAST(:table AS regclass))
+    """), {"table": src}).scalar()
+
+    like = f"CREATE TABLE {dst} (LIKE {src} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+    if partition_key:
+        session.execute(text(f"{like} PARTITION BY {partition_key}"))
+        for name, bound in _partitions(session, src):
+            session.execute(text(f"CREATE TABLE {target}.{name} PARTITION OF {dst} {bound}"))
+    else:
+        session.execute(text(like))
+    session.execute(text(f"INSERT INTO {dst} SELECT * FROM {src}"))
+    session.execute(text(f"CREATE SEQUENCE {dst}_id_seq OWNED BY {dst}.id"))
+    session.execute(text(f"ALTER TABLE {dst} ALTER COLUMN id SET DEFAULT nextval('{dst}_id_seq')"))
+    session.execute(text(
+        f"SELECT setval('{dst}_id_seq', COALESCE((SELECT MAX(id) FROM {dst}), 0) + 1, false)"
+    ))
+
+    on_source = re.compile(rf" ON (ONLY )?(\S+\.)?{table} ")
+    for name, indexdef, is_primary, constraintdef in indexes:
+        if is_primary:
+            # 파티션 테이블은 PRIMARY KEY USING INDEX를 지원하지 않으므로 제약으로 만든다
+            session.execute(text(f"ALTER TABLE {dst} ADD CONSTRAINT {name} {constraintdef}"))
+        else:
+            session.execute(text(on_source.sub(f" ON {dst} ", indexdef, count=1)))
+
+
+def _swap(session: Session, incoming_schema: str, archive_schema: str) -> None:
+    """public 테이블을 archive_schema로, incoming_schema 테이블을 public으로 옮긴다.
+
+    ALTER TABLE SET SCHEMA는 인덱스/제약/소유 시퀀스를 함께 옮기며 트랜잭션 안에서 원자적이다.
+    파티션은 부모와 따로 옮겨야 하므로 부모와 같은 스키마로 함께 옮긴다.
+    """
+    session.execute(text(f"SET LOCAL lock_timeout = '{SWAP_LOCK_TIMEOUT}'"))
+    session.execute(text(f"CREATE SCHEMA {archive_schema}"))
+    for table in SNAPSHOT_TABLES:
+        _set_schema(session, table, "public", archive_schema)
+        _set_schema(session, table, incoming_schema, "public")
+
+
+def _set_schema(session: Session, table: str, source: str, target: str) -> None:
+    partitions = _partitions(session, f"{source}.{table}")
+    session.execute(text(f"ALTER TABLE {source}.{table} SET SCHEMA {target}"))
+    for name, _ in partitions:
+        session.execute(text(f"ALTER TABLE {source}.{name} SET SCHEMA {target}"))
+
+
+def _next_snapshot_id(session: Session) -> int:
+    return session.execute(text(
+        "SELECT nextval(pg_get_serial_sequence('data_snapshot', 'id'))"
+    )).scalar()
+
+
+def _record_snapshot(session: Session, snapshot_id: int, action: str, archive: str, version: int):
+    session.execute(text("""
+        INSERT INTO data_snapshot (id, action, archive_schema, dataset_version)
+        VALUES (:id, :action, :archive, :version)
+    """), {"id": snapshot_id, "action": action, "archive": archive, "version": version})
+
+
+def publish_snapshot(session: Session, source: str) -> int:
+    """섀도 스키마를 게시한다 (스키마 교체 + 새 데이터 버전, 한 트랜잭션). → 데이터 버전."""
+    snapshot_id = _next_snapshot_id(session)
+    archive = f"{ARCHIVE_PREFIX}{snapshot_id}"
+
+    _swap(session, SHADOW_SCHEMA, archive)
+    session.execute(text(f"DROP SCHEMA {SHADOW_SCHEMA}"))
+    version = publish_dataset_version(session, source)
+    _record_snapshot(session, snapshot_id, "publish", archive, version)
+    _prune_archives(session)
+    session.commit()
+
+    logger.info("Published snapshot %d (dataset version %d, previous tables in %s)",
+                snapshot_id, version, archive)
+    return version
+
+
+def discard_shadow(session: Session) -> None:
+    """게시하지 않고 섀도 스키마를 버린다 (실패한 ETL — public은 직전 스냅샷 그대로)."""
+    session.rollback()
+    session.execute(text(f"DROP SCHEMA IF EXISTS {SHADOW_SCHEMA} CASCADE"))
+    session.commit()
+    logger.warning("Discarded shadow schema %s without publishing", SHADOW_SCHEMA)
+
+
+def retained_snapshots(session: Session) -> list:
+    """아직 보관 중인 스냅샷 (최신순): (id, action, archive_schema, dataset_version, created_at)."""
+    return session.execute(text("""
+        SELECT s.id, s.action, s.archive_schema, s.dataset_version, s.created_at
+        FROM data_snapshot s
+        JOIN pg_namespace n ON n.nspname = s.archive_schema
+        ORDER BY s.id DESC
+    """)).fetchall()
+
+
+def rollback_snapshot(session: Session, snapshot_id: int | None = None) -> int:
+    """보관된 테이블을 다시 게시한다 (기본값: 가장 최근 보관본 = 직전 게시 상태).
+
+    현재 게시된 테이블은 새 snapshot_<id>로 보관되므로 롤백도 되돌릴 수 있다. → 데이터 버전.
+    """
+    retained = {row.id: row for row in retained_snapshots(session)}
+    if not retained:
+        raise ValueError("No retained snapshot to roll back to")
+    if snapshot_id is None:
+        snapshot_id = max(retained)
+    if snapshot_id not in retained:
+        raise ValueError(f"Snapshot {snapshot_id} is not retained (available: {sorted(retained)})")
+    source_schema = retained[snapshot_id].archive_schema
+
+    present = session.execute(text("""
+        SELECT COUNT(*) FROM information_schema.tables
+        WHERE table_schema = :schema AND table_name = ANY(:tables)
+    """), {"schema": source_schema, "tables": list(SNAPSHOT_TABLES)}).scalar()
+    if present != len(SNAPSHOT_TABLES):
+        raise ValueError(f"Snapshot {snapshot_id} is incomplete ({present}/{len(SNAPSHOT_TABLES)} tables)")
+
+    new_id = _next_snapshot_id(session)
+    archive = f"{ARCHIVE_PREFIX}{new_id}"
+    _swap(session, source_schema, archive)
+    session.execute(text(f"DROP SCHEMA {source_schema}"))
+    version = publish_dataset_version(session, f"rollback:{snapshot_id}")
+    _record_snapshot(session, new_id, "rollback", archive, version)
+    _prune_archives(session)
+    session.commit()
+
+    logger.info("Rolled back to snapshot %d (dataset version %d, replaced tables in %s)",
+                snapshot_id, version, archive)
+    return version
+
+
+def _prune_archives(session: Session) -> None:
+    """최근 SNAPSHOT_RETENTION개를 넘는 보관 스키마를 삭제한다."""
+    keep = max(get_settings().SNAPSHOT_RETENTION, 0)
+    for row in retained_snapshots(session)[keep:]:
+        session.execute(text(f"DROP SCHEMA IF EXISTS {row.archive_schema} CASCADE"))
+        logger.info("Dropped archived snapshot %d (%s)", row.id, row.archive_schema)
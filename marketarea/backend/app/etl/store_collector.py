@@ -7,94 +7,113 @@ from sqlalchemy import text
 from sqlalchemy.orm import Session
 
 from app.config import get_settings
-from app.etl.api_client import fetch_json
+from app.etl.api_client import AsyncApiClient
+from app.etl.bulk_copy import copy_rows, ewkb_point
+from app.etl.change_tracking import track_changes
+from app.etl.grid_lattice import load_lattice
 from app.etl.logger import get_etl_logger
+from app.etl.partitions import ensure_quarter_partitions
+from app.etl.pipeline import run_pipeline
 
 logger = get_etl_logger("store_collector")
 SAMPLE_DIR = Path(__file__).parent / "sample_data"
 
+# API 페이지 크기 (요청당 최대 행 수)
+PAGE_SIZE = 1000
+
+# COPY 적재 컬럼 (geom은 클라이언트에서 만든 hex EWKB)
+STORE_COLUMNS = (
+    "store_name", "industry_code", "industry_name", "address",
+    "lat", "lng", "geom", "is_active", "snapshot_date",
+)
+
 
 def collect_stores(session: Session) -> int:
     settings = get_settings()
-    if settings.should_use_sample or not settings.has_key("data_go_kr"):
-        logger.info("Using sample data for stores")
-        return _load_sample(session)
-    logger.info("Collecting stores from API")
-    return _collect_from_api(session, settings.DATA_GO_KR_API_KEY)
+    with track_changes(session, "grid_store_stats"):
+        if settings.should_use_sample or not settings.has_key("data_go_kr"):
+            logger.info("Using sample data for stores")
+            return _load_sample(session)
+        logger.info("Collecting stores from API")
+        return _collect_from_api(session, settings.DATA_GO_KR_API_KEY)
 
 
 def _collect_from_api(session: Session, api_key: str) -> int:
-    """소상공인진흥공단 API에서 서울 점포 데이터 수집."""
-    base_url = "https://apis.data.go.kr/B553077/api/open/sdsc2/storeListInDong"
+    """소상공인진흥공단 API에서 서울 점포 데이터 수집.
+
+    구별 페이지를 동시에 받으면서 받은 페이지부터 store_master에 COPY로 적재한다 (app.etl.pipeline).
+    """
+    base_url = f"{get_settings().API_BASE_URL_DATA_GO_KR}/B553077/api/open/sdsc2/storeListInDong"
     gu_codes = [
         "11110", "11140", "11170", "11200", "11215", "11230", "11260",
         "11290", "11305", "11320", "11350", "11380", "11410", "11440",
         "11470", "11500", "11530", "11545", "11560", "11590", "11620",
         "11650", "11680", "11710", "11740",
     ]
-
-    count = 0
     today = date.today()
-
-    for gu_code in gu_codes:
-        page = 1
-        gu_count = 0
-        while True:
-            data = fetch_json(base_url, params={
-                "serviceKey": api_key,
-                "divId": "signguCd",
-                "key": gu_code,
-                "numOfRows": 1000,
-                "pageNo": page,
-                "type": "json",
-            })
-            if not data:
-                logger.warning("No response for gu_code=%s page=%d, skipping", gu_code, page)
-                break
-
-            items = data.get("body", {}).get("items", [])
-            if not items:
-                break
-
-            for item in items:
-                lat = item.get("lat")
-                lng = item.get("lon")
-                if not lat or not lng:
-                    continue
-                try:
-                    session.execute(text("""
-                        INSERT INTO store_master
-                            (store_name, industry_code, industry_name, address,
-                             lat, lng, geom, is_active, snapshot_date)
-                        VALUES
-                            (:name, :code, :ind_name, :addr,
-                             :lat, :lng, ST_SetSRID(ST_MakePoint(:lng, :lat), 4326),
-                             1, :snap_date)
-                    """), {
-                        "name": item.get("bizesNm", ""),
-                        "code": item.get("indsLclsCd", ""),
-                        "ind_name": item.get("indsLclsNm", ""),
-                        "addr": item.get("lnoAdr", ""),
-                        "lat": float(lat),
-                        "lng": float(lng),
-                        "snap_date": today,
-                    })
-                    count += 1
-                    gu_count += 1
-                except Exception as e:
-                    logger.warning("Failed to insert store: %s", e)
-
-            if len(items) < 1000:
-                break
-            page += 1
-
+    gu_counts = dict.fromkeys(gu_codes, 0)
+
+    async def fetch(client: AsyncApiClient, key: tuple[str, int]):
+        """(구 코드, 페이지) → (구 코드, items). 첫 페이지는 totalCount로 나머지 페이지를 예약하고,
+        totalCount가 없으면 꽉 찬 페이지마다 다음 페이지를 하나씩 예약한다."""
+        gu_code, page = key
+        data = await client.fetch_json("data_go_kr", base_url, params={
+            "serviceKey": api_key,
+            "divId": "signguCd",
+            "key": gu_code,
+            "numOfRows": PAGE_SIZE,
+            "pageNo": page,
+            "type": "json",
+        })
+        if not data:
+            logger.warning("No response for gu_code=%s page=%d, skipping", gu_code, page)
+            return None, []
+        body = data.get("body", {})
+        items = body.get("items") or []
+        if not items:
+            return None, []
+
+        try:
+            total = int(body.get("totalCount"))
+        except (TypeError, ValueError):
+            total = None
+        if total is None:
+            follow = [(gu_code, page + 1)] if len(items) >= PAGE_SIZE else []
+        elif page == 1:
+            follow = [(gu_code, p) for p in range(2, -(-total // PAGE_SIZE) + 1)]
+        else:
+            follow = []
+        return (gu_code, items), follow
+
+    def transform(payload):
+        gu_code, items = payload
+        for item in items:
+            try:
+                lat, lng = float(item.get("lat")), float(item.get("lon"))
+            except (TypeError, ValueError):
+                continue
+            if not lat or not lng:
+                continue
+            gu_counts[gu_code] += 1
+            yield (
+                item.get("bizesNm", ""), item.get("indsLclsCd", ""), item.get("indsLclsNm", ""),
+                item.get("lnoAdr", ""), lat, lng, ewkb_point(lng, lat), 1, today,
+            )
+
+    def load(rows: list) -> int:
+        return copy_rows(session, "store_master", STORE_COLUMNS, rows, log=False)
+
+    stats = run_pipeline(
+        "stores", "data_go_kr", [(gu_code, 1) for gu_code in gu_codes], fetch, transform, load,
+    )
+    for gu_code, gu_count in gu_counts.items():
         logger.info("gu_code=%s: %d stores collected", gu_code, gu_count)
 
     session.commit()
     _assign_grid_ids(session)
     _compute_store_stats(session)
-    logger.info("Total stores collected: %d", count)
-    return count
+    logger.info("Total stores collected: %d", stats.loaded)
+    return stats.loaded
 
 
 def _load_sample(session: Session) -> int:
@@ -104,25 +123,13 @@ def _load_sample(session: Session) -> int:
         stores = json.load(f)
 
     today = date.today()
-    for s in stores:
-        session.execute(text("""
-            INSERT INTO store_master
-                (store_name, industry_code, industry_name, address,
-                 lat, lng, geom, is_active, snapshot_date)
-            VALUES
-                (:name, :code, :ind_name, :addr,
-                 :lat, :lng, ST_SetSRID(ST_MakePoint(:lng, :lat), 4326),
-                 :active, :snap_date)
-        """), {
-            "name": s["store_name"],
-            "code": s["industry_code"],
-            "ind_name": s["industry_name"],
-            "addr": s["address"],
-            "lat": s["lat"],
-            "lng": s["lng"],
-            "active": s.get("is_active", 1),
-            "snap_date": today,
-        })
+    copy_rows(session, "store_master", STORE_COLUMNS, (
+        (
+            s["store_name"], s["industry_code"], s["industry_name"], s["address"],
+            s["lat"], s["lng"], ewkb_point(s["lng"], s["lat"]), s.get("is_active", 1), today,
+        )
+        for s in stores
+    ))
 
     session.commit()
     _assign_grid_ids(session)
@@ -132,24 +139,50 @@ def _load_sample(session: Session) -> int:
 
 
 def _assign_grid_ids(session: Session):
-    """점포를 가장 가까운 Grid에 배정."""
+    """점포를 가장 가까운 Grid에 배정.
+
+    grid_lattice가 있으면 위경도 → (row, col) 산술로 grid_id를 계산하고,
+    구버전 격자면 ST_Contains 공간 조인으로 배정한다.
+    """
+    lattice = load_lattice(session)
+    if lattice is None:
+        session.execute(text("""
+            UPDATE store_master s
+            SET grid_id = g.id
+            FROM grid_master g
+            WHERE ST_Contains(g.geom, s.geom)
+        """))
+        session.commit()
+        return
+
     session.execute(text("""
-        UPDATE store_master s
-        SET grid_id = g.id
-        FROM grid_master g
-        WHERE ST_Contains(g.geom, s.geom)
-    """))
+        UPDATE store_master
+        SET grid_id =
+            LEAST(FLOOR((lat - :lat0) / :dlat)::int, :n_rows - 1) * :n_cols
+            + LEAST(FLOOR((lng - :lng0) / :dlng)::int, :n_cols - 1) + 1
+        WHERE lat >= :lat0 AND lat < :lat0 + :n_rows * :dlat
+          AND lng >= :lng0 AND lng < :lng0 + :n_cols * :dlng
+    """), {
+        "lat0": lattice.origin_lat,
+        "lng0": lattice.origin_lng,
+        "dlat": lattice.dlat,
+        "dlng": lattice.dlng,
+        "n_rows": lattice.n_rows,
+        "n_cols": lattice.n_cols,
+    })
     session.commit()
 
 
 def _compute_store_stats(session: Session):
     """grid_store_stats 집계."""
+    quarter = session.execute(text("""SELECT TO_CHAR(NOW(), 'YYYY-"Q"Q')""")).scalar()
+    ensure_quarter_partitions(session, "grid_store_stats", [quarter])
     session.execute(text("DELETE FROM grid_store_stats"))
     session.execute(text("""
         INSERT INTO grid_store_stats (grid_id, industry_code, store_count, snapshot_quarter)
-        SELECT grid_id, industry_code, COUNT(*), TO_CHAR(NOW(), 'YYYY-"Q"Q')
+        SELECT grid_id, industry_code, COUNT(*), :quarter
         FROM store_master
         WHERE grid_id IS NOT NULL AND is_active = 1
         GROUP BY grid_id, industry_code
-    """))
+    """), {"quarter": quarter})
     session.commit()
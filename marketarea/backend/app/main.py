@@ -8,6 +8,7 @@ from sqlalchemy import text
 from app.api.router import router
 from app.config import get_settings
 from app.database import get_db_engine
+from app.services.grid_engine import grid_engine
 
 settings = get_settings()
 logger = logging.getLogger("etl.startup")
@@ -34,6 +35,14 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning("Could not check ETL status: %s", e)
 
+    # Startup: 인메모리 Grid 엔진 적재 (실패 시 SQL 경로로 동작)
+    if settings.GRID_ENGINE_ENABLED:
+        try:
+            async with get_db_engine().connect() as conn:
+                await conn.run_sync(grid_engine.load)
+        except Exception as e:
+            logger.warning("Could not load grid engine, falling back to SQL: %s", e)
+
     yield
 
 
@@ -1,4 +1,4 @@
-from app.models.grid import GridMaster
+from app.models.grid import GridMaster, GridLattice, GridDistrict
 from app.models.store import StoreMaster
 from app.models.stats import (
     GridStoreStats,
@@ -7,12 +7,19 @@ from app.models.stats import (
     GridSalesStats,
     GridRentStats,
     GridScore,
+    GridSummedArea,
+    GridRadiusStats,
+    GridRadiusScore,
 )
 from app.models.user import User
 from app.models.saved_analysis import SavedAnalysis
+from app.models.dataset_version import DatasetVersion, DataSnapshot
+from app.models.score_run import ScoreChangeSet, ScoreRun, ScoreWorkItem
 
 __all__ = [
     "GridMaster",
+    "GridLattice",
+    "GridDistrict",
     "StoreMaster",
     "GridStoreStats",
     "GridFloatingStats",
@@ -20,6 +27,14 @@ __all__ = [
     "GridSalesStats",
     "GridRentStats",
     "GridScore",
+    "GridSummedArea",
+    "GridRadiusStats",
+    "GridRadiusScore",
     "User",
     "SavedAnalysis",
+    "DatasetVersion",
+    "DataSnapshot",
+    "ScoreChangeSet",
+    "ScoreRun",
+    "ScoreWorkItem",
 ]
@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, String, DateTime, func
+from app.database import Base
+
+
+class DatasetVersion(Base):
+    """ETL이 새 데이터셋을 게시할 때마다 한 행씩 추가된다 (id = 데이터 버전)."""
+    __tablename__ = "dataset_version"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    source = Column(String(50), nullable=False)   # run_etl | compute_all_scores
+    published_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class DataSnapshot(Base):
+    """스냅샷 게시/롤백 기록. archive_schema에는 이때 교체되어 물러난 테이블이 보관된다."""
+    __tablename__ = "data_snapshot"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    action = Column(String(20), nullable=False)   # publish | rollback
+    archive_schema = Column(String(63), nullable=False)
+    dataset_version = Column(Integer, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
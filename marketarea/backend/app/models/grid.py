@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, Index
+from sqlalchemy import Column, Integer, String, Float, DateTime, Index, func
 from geoalchemy2 import Geometry
 from app.database import Base
 
@@ -13,7 +13,44 @@ class GridMaster(Base):
     geom = Column(Geometry("POLYGON", srid=4326), nullable=False)
     dong_code = Column(String(10))
     dong_name = Column(String(50))
+    gu_code = Column(String(5), index=True)   # 가장 가까운 구 중심 (app.etl.district_mapping)
+    row_idx = Column(Integer)   # 격자 행 (위도 방향, grid_lattice 기준)
+    col_idx = Column(Integer)   # 격자 열 (경도 방향)
 
     __table_args__ = (
         Index("ix_grid_master_geom", "geom", postgresql_using="gist"),
+        Index("ix_grid_master_row_col", "row_idx", "col_idx"),
+    )
+
+
+class GridLattice(Base):
+    """grid_master 생성에 사용한 정규 격자 파라미터 (id = row * n_cols + col + 1)."""
+    __tablename__ = "grid_lattice"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    origin_lat = Column(Float, nullable=False)
+    origin_lng = Column(Float, nullable=False)
+    dlat = Column(Float, nullable=False)
+    dlng = Column(Float, nullable=False)
+    n_rows = Column(Integer, nullable=False)
+    n_cols = Column(Integer, nullable=False)
+    cell_size_m = Column(Integer, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class GridDistrict(Base):
+    """구/행정동 → 격자 매핑 (app.etl.district_mapping이 격자 생성 후 한 번 만든다).
+
+    구는 중심 좌표 3km, 행정동은 500m 반경에 걸치는 격자이며 한 격자가 여러 구/동에 속할 수 있다.
+    "X의 격자" 조회는 (district_type, district_code) 인덱스 등호 조회다.
+    """
+    __tablename__ = "grid_district"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    district_type = Column(String(4), nullable=False)    # gu | dong
+    district_code = Column(String(10), nullable=False)
+    grid_id = Column(Integer, nullable=False)
+
+    __table_args__ = (
+        Index("ux_grid_district_code_grid", "district_type", "district_code", "grid_id", unique=True),
     )
@@ -0,0 +1,59 @@
+from sqlalchemy import Column, Integer, String, Float, Text, DateTime, Index, func
+from app.database import Base
+
+
+class ScoreChangeSet(Base):
+    """수집기가 변경한 (grid_id, industry_code) — 다음 점수 계산에서 이 쌍만 다시 계산한다.
+
+    industry_code가 NULL이면 격자 단위 통계(유동인구/인구/임대료) 변경 → 해당 격자의 모든 업종.
+    """
+    __tablename__ = "score_change_set"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    grid_id = Column(Integer, nullable=False, index=True)
+    industry_code = Column(String(10))
+    source_table = Column(String(50), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class ScoreRun(Base):
+    """compute_all_scores 실행 기록. avg_*는 그 분기 grid_score 점수의 기준이 된 서울 평균값."""
+    __tablename__ = "score_run"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    mode = Column(String(20), nullable=False)   # full | incremental
+    snapshot_quarter = Column(String(7))
+    avg_stores = Column(Float, nullable=False)
+    avg_floating = Column(Float, nullable=False)
+    avg_population = Column(Float, nullable=False)
+    avg_sales = Column(Float, nullable=False)
+    avg_rent = Column(Float, nullable=False)
+    changed_pairs = Column(Integer, nullable=False, default=0)
+    scored_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class ScoreWorkItem(Base):
+    """분산 점수 계산 작업 큐 — grid_id 구간 하나 = 항목 하나 (FOR UPDATE SKIP LOCKED로 할당).
+
+    task는 워커가 계산에 필요한 값(JSON: 모드, 서울 평균, 범위, staging 테이블, search_path).
+    """
+    __tablename__ = "score_work_queue"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    run_id = Column(String(32), nullable=False, index=True)
+    grid_lo = Column(Integer, nullable=False)
+    grid_hi = Column(Integer, nullable=False)
+    task = Column(Text, nullable=False)
+    status = Column(String(10), nullable=False, default="pending")  # pending | running | done | failed
+    worker = Column(String(100))
+    attempts = Column(Integer, nullable=False, default=0)
+    lease_expires_at = Column(DateTime(timezone=True))
+    rows = Column(Integer)
+    error = Column(Text)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    finished_at = Column(DateTime(timezone=True))
+
+    __table_args__ = (
+        Index("ix_score_work_queue_claim", "status", "id"),
+    )
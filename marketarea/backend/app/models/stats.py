@@ -1,6 +1,12 @@
-from sqlalchemy import Column, Integer, String, Float, Date, ForeignKey
+from sqlalchemy import (
+    DDL, Column, Integer, String, Float, Date, DateTime, ForeignKey, Index, LargeBinary, Text,
+    event, func,
+)
 from app.database import Base
 
+# 분기별 LIST 파티션 테이블 (파티션 관리는 app.etl.partitions). 파티션 키가 기본 키에 포함돼야 한다.
+_PARTITION_BY_QUARTER = {"postgresql_partition_by": "LIST (snapshot_quarter)"}
+
 
 class GridStoreStats(Base):
     __tablename__ = "grid_store_stats"
@@ -12,7 +18,9 @@ class GridStoreStats(Base):
     open_count = Column(Integer, default=0)
     close_count = Column(Integer, default=0)
     closure_rate = Column(Float)
-    snapshot_quarter = Column(String(7))  # e.g. "2024-Q3"
+    snapshot_quarter = Column(String(7), primary_key=True)  # e.g. "2024-Q3"
+
+    __table_args__ = (_PARTITION_BY_QUARTER,)
 
 
 class GridFloatingStats(Base):
@@ -52,7 +60,9 @@ class GridSalesStats(Base):
     quarterly_count = Column(Integer)      # 분기 건수
     avg_ticket_price = Column(Float)       # 객단가
     sales_per_store = Column(Float)        # 점포당 매출
-    snapshot_quarter = Column(String(7))
+    snapshot_quarter = Column(String(7), primary_key=True)
+
+    __table_args__ = (_PARTITION_BY_QUARTER,)
 
 
 class GridRentStats(Base):
@@ -63,7 +73,9 @@ class GridRentStats(Base):
     rent_per_m2 = Column(Float)             # m2당 임대료
     rent_price_index = Column(Float)        # 임대가격지수
     deposit_per_m2 = Column(Float)          # m2당 보증금
-    snapshot_quarter = Column(String(7))
+    snapshot_quarter = Column(String(7), primary_key=True)
+
+    __table_args__ = (_PARTITION_BY_QUARTER,)
 
 
 class GridScore(Base):
@@ -81,4 +93,78 @@ class GridScore(Base):
     floating_score = Column(Float)        # 유동인구 점수
     rent_score = Column(Float)            # 임대료 점수
     risk_flags = Column(String(500))      # JSON 리스크 경고
-    snapshot_quarter = Column(String(7))
+    snapshot_quarter = Column(String(7), primary_key=True, index=True)
+
+    __table_args__ = (
+        # 증분 점수 계산의 upsert 키 (ON CONFLICT)
+        Index("ux_grid_score_pair", "grid_id", "industry_code", "snapshot_quarter", unique=True),
+        _PARTITION_BY_QUARTER,
+    )
+
+
+# create_all로 새로 만드는 파티션 테이블에 기본(DEFAULT) 파티션을 붙인다 (분기 파티션은 적재 시 생성)
+for _model in (GridStoreStats, GridSalesStats, GridRentStats, GridScore):
+    event.listen(
+        _model.__table__, "after_create",
+        DDL("CREATE TABLE %(table)s_default PARTITION OF %(table)s DEFAULT"),
+    )
+
+
+class GridSummedArea(Base):
+    """격자 단위 지표의 2D 누적합(summed-area table). 뷰포트 합계를 O(1)로 계산한다.
+
+    data는 (n_rows + 1) x (n_cols + 1) float64 배열의 raw bytes (little endian).
+    """
+    __tablename__ = "grid_summed_area"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    metric = Column(String(30), nullable=False, index=True)  # stores | population | floating
+    industry_code = Column(String(10))                      # stores 업종별 (NULL = 전체)
+    n_rows = Column(Integer, nullable=False)
+    n_cols = Column(Integer, nullable=False)
+    data = Column(LargeBinary, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class GridRadiusStats(Base):
+    """격자 중심 기준 표준 반경 집계 (업종 무관 지표). 디스크 컨볼루션으로 사전 계산된다."""
+    __tablename__ = "grid_radius_stats"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    grid_id = Column(Integer, nullable=False)
+    radius = Column(Integer, nullable=False)       # m
+    grid_count = Column(Integer, nullable=False)   # 반경 내 격자 수
+    avg_floating = Column(Float)
+    total_population = Column(Float)
+    avg_rent = Column(Float)
+
+    __table_args__ = (
+        Index("ix_grid_radius_stats_grid_radius", "grid_id", "radius", unique=True),
+    )
+
+
+class GridRadiusScore(Base):
+    """격자 중심 기준 표준 반경 집계 (업종별). 반경 내 점포/점수가 없는 업종은 행이 없다."""
+    __tablename__ = "grid_radius_score"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    grid_id = Column(Integer, nullable=False)
+    radius = Column(Integer, nullable=False)
+    industry_code = Column(String(10), nullable=False)
+    store_count = Column(Float)
+    health_score = Column(Float)           # 이하 반경 내 grid_score 평균 (점수 없으면 NULL)
+    competition_index = Column(Float)
+    survival_probability = Column(Float)
+    sales_estimate_low = Column(Float)
+    sales_estimate_high = Column(Float)
+    population_score = Column(Float)
+    floating_score = Column(Float)
+    rent_score = Column(Float)
+    risk_flags = Column(Text)              # aggregate_grids와 같은 순서의 중복 제거된 JSON
+
+    __table_args__ = (
+        Index(
+            "ix_grid_radius_score_grid_radius_industry",
+            "grid_id", "radius", "industry_code", unique=True,
+        ),
+    )
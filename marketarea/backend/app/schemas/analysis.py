@@ -1,11 +1,16 @@
 from pydantic import BaseModel, Field
 
+from app.services.quarters import QUARTER_PATTERN
+
 
 class AnalysisRequest(BaseModel):
     lat: float = Field(..., ge=37.0, le=38.0, description="위도")
     lng: float = Field(..., ge=126.0, le=128.0, description="경도")
     radius: int = Field(default=500, ge=100, le=2000, description="반경 (m)")
     industry_code: str = Field(..., min_length=1, description="업종 코드")
+    quarter: str | None = Field(
+        None, pattern=QUARTER_PATTERN, description="점수 분기 (예: 2024-Q3, 없으면 최신 분기)",
+    )
 
 
 class RiskFlag(BaseModel):
@@ -28,6 +33,37 @@ class AnalysisResult(BaseModel):
     rent_score: float
     risk_flags: list[RiskFlag] = []
     grid_count: int = Field(..., description="분석에 포함된 격자 수")
+    has_score: bool = Field(True, description="반경 내 grid_score가 있는지 (False면 점수는 기본값)")
+
+
+class BatchAnalysisRequest(BaseModel):
+    items: list[AnalysisRequest] = Field(..., min_length=1, max_length=10000, description="후보지 목록")
+
+
+class BatchAnalysisResponse(BaseModel):
+    results: list[AnalysisResult] = Field(..., description="입력 순서와 동일한 분석 결과")
+
+
+class IndustryComparisonRequest(BaseModel):
+    lat: float = Field(..., ge=37.0, le=38.0, description="위도")
+    lng: float = Field(..., ge=126.0, le=128.0, description="경도")
+    radius: int = Field(default=500, ge=100, le=2000, description="반경 (m)")
+    quarter: str | None = Field(
+        None, pattern=QUARTER_PATTERN, description="점수 분기 (예: 2024-Q3, 없으면 최신 분기)",
+    )
+
+
+class IndustryRanking(BaseModel):
+    rank: int | None = Field(..., description="health_score 내림차순 순위 (1부터, 점수 없는 업종은 null)")
+    code: str
+    name: str
+    category: str
+    result: AnalysisResult
+
+
+class IndustryComparisonResponse(BaseModel):
+    grid_count: int = Field(..., description="분석에 포함된 격자 수")
+    rankings: list[IndustryRanking] = Field(..., description="업종별 결과 (건강도 순, 점수 없는 업종은 맨 뒤)")
 
 
 class IndustryItem(BaseModel):
@@ -41,4 +77,45 @@ class GridHealthResponse(BaseModel):
     grid_code: str
     center_lat: float
     center_lng: float
+    quarter: str | None = Field(None, description="점수 분기")
     scores: dict
+
+
+class ScoreTrendPoint(BaseModel):
+    quarter: str
+    health_score: float
+    competition_index: float
+    survival_probability: float
+    sales_estimate_low: float
+    sales_estimate_high: float
+
+
+class ScoreTrendResponse(BaseModel):
+    grid_id: int
+    industry_code: str
+    points: list[ScoreTrendPoint] = Field(..., description="분기 오름차순 점수")
+
+
+class ViewportStatsResponse(BaseModel):
+    industry_code: str | None = Field(None, description="점포수 업종 (없으면 전체 업종)")
+    grid_count: int = Field(..., description="사각형과 겹치는 격자 수")
+    store_count: int = Field(..., description="점포수 합계")
+    resident_population: int = Field(..., description="거주인구 합계")
+    floating_population: float = Field(..., description="유동인구 합계")
+
+
+class RecommendItem(BaseModel):
+    rank: int
+    grid_id: int
+    center_lat: float
+    center_lng: float
+    value: float = Field(..., description="격자 중심 기준 반경 평균 지표값")
+    store_count: int = Field(..., description="반경 내 동일업종 점포수")
+    grid_count: int = Field(..., description="반경 내 격자 수")
+
+
+class RecommendResponse(BaseModel):
+    industry_code: str
+    radius: int
+    metric: str
+    items: list[RecommendItem] = Field(..., description="지표 순 추천 격자 (인접 격자 억제)")
@@ -0,0 +1,174 @@
+"""다수 후보지 일괄 집계 서비스 — 멤버십 1회 계산 + 다중 사이트 단일 쿼리 집계."""
+import numpy as np
+from sqlalchemy import ARRAY, Float, Integer, String, bindparam, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services.grid_aggregator import build_result, get_lattice, merge_risk_flags
+from app.services.quarters import CURRENT_SCORE_QUARTER_SQL
+
+# 한 번의 SQL로 집계할 최대 사이트 수 (파라미터 배열 크기 제한)
+BATCH_CHUNK_SIZE = 500
+
+# 격자 파라미터가 없는 구버전 격자용: 모든 사이트의 반경 검색을 한 번의 공간 조인으로 처리
+_MEMBERS_BY_POINTS = text("""
+    SELECT p.site - 1 AS site, g.id AS grid_id
+    FROM unnest(:lats, :lngs, :radii) WITH ORDINALITY AS p(lat, lng, radius_deg, site)
+    JOIN grid_master g ON ST_DWithin(
+        g.geom,
+        ST_SetSRID(ST_MakePoint(p.lng, p.lat), 4326),
+        p.radius_deg
+    )
+""").bindparams(
+    bindparam("lats", type_=ARRAY(Float)),
+    bindparam("lngs", type_=ARRAY(Float)),
+    bindparam("radii", type_=ARRAY(Float)),
+)
+
+# (site, grid_id) 멤버십 배열과 사이트별 업종 배열로 모든 사이트를 한 번에 집계한다.
+# 사이트별 결과는 aggregate_grids의 단일 CTE와 같은 규칙으로 계산된다 (점수는 최신 분기).
+_AGGREGATE_SITES = text(f"""
+    WITH members AS (
+        SELECT m.site, m.grid_id
+        FROM unnest(:member_sites, :member_grids) AS m(site, grid_id)
+        JOIN grid_master g ON g.id = m.grid_id
+    ),
+    sites AS (
+        SELECT s.site - 1 AS site, s.industry_code
+        FROM unnest(:industries) WITH ORDINALITY AS s(industry_code, site)
+    ),
+    grid_counts AS (
+        SELECT site, COUNT(*) AS grid_count FROM members GROUP BY site
+    ),
+    stores AS (
+        SELECT m.site, SUM(gs.store_count) AS store_count
+        FROM members m
+        JOIN sites s USING (site)
+        JOIN grid_store_stats gs
+          ON gs.grid_id = m.grid_id AND gs.industry_code = s.industry_code
+        GROUP BY m.site
+    ),
+    floating AS (
+        SELECT m.site, AVG(gf.total_floating) AS avg_floating
+        FROM members m JOIN grid_floating_stats gf USING (grid_id)
+        GROUP BY m.site
+    ),
+    population AS (
+        SELECT m.site, SUM(gp.total_population) AS total_pop
+        FROM members m JOIN grid_population_stats gp USING (grid_id)
+        GROUP BY m.site
+    ),
+    rent AS (
+        SELECT m.site, AVG(gr.rent_per_m2) AS avg_rent
+        FROM members m JOIN grid_rent_stats gr USING (grid_id)
+        GROUP BY m.site
+    ),
+    scored AS (
+        SELECT m.site, sc.id, sc.health_score, sc.competition_index,
+               sc.survival_probability, sc.sales_estimate_low, sc.sales_estimate_high,
+               sc.population_score, sc.floating_score, sc.rent_score, sc.risk_flags
+        FROM members m
+        JOIN sites s USING (site)
+        JOIN grid_score sc
+          ON sc.grid_id = m.grid_id AND sc.industry_code = s.industry_code
+        WHERE sc.snapshot_quarter = {CURRENT_SCORE_QUARTER_SQL}
+    ),
+    scores AS (
+        SELECT
+            site,
+            AVG(health_score) AS health_score,
+            AVG(competition_index) AS competition_index,
+            AVG(survival_probability) AS survival_probability,
+            AVG(sales_estimate_low) AS sales_estimate_low,
+            AVG(sales_estimate_high) AS sales_estimate_high,
+            AVG(population_score) AS population_score,
+            AVG(floating_score) AS floating_score,
+            AVG(rent_score) AS rent_score
+        FROM scored GROUP BY site
+    ),
+    site_flags AS (
+        SELECT site, array_agg(risk_flags ORDER BY id) AS risk_flags
+        FROM scored
+        WHERE risk_flags IS NOT NULL AND risk_flags != '[]'
+        GROUP BY site
+    )
+    SELECT
+        s.site,
+        COALESCE(gc.grid_count, 0),
+        COALESCE(st.store_count, 0),
+        COALESCE(fl.avg_floating, 0),
+        COALESCE(pp.total_pop, 0),
+        COALESCE(rt.avg_rent, 0),
+        sc.health_score,
+        sc.competition_index,
+        sc.survival_probability,
+        sc.sales_estimate_low,
+        sc.sales_estimate_high,
+        sc.population_score,
+        sc.floating_score,
+        sc.rent_score,
+        sf.risk_flags
+    FROM sites s
+    LEFT JOIN grid_counts gc USING (site)
+    LEFT JOIN stores st USING (site)
+    LEFT JOIN floating fl USING (site)
+    LEFT JOIN population pp USING (site)
+    LEFT JOIN rent rt USING (site)
+    LEFT JOIN scores sc USING (site)
+    LEFT JOIN site_flags sf USING (site)
+    ORDER BY s.site
+""").bindparams(
+    bindparam("member_sites", type_=ARRAY(Integer)),
+    bindparam("member_grids", type_=ARRAY(Integer)),
+    bindparam("industries", type_=ARRAY(String)),
+)
+
+
+async def resolve_memberships(
+    session: AsyncSession,
+    sites: list[tuple[float, float, int, str]],
+) -> tuple[list[int], list[int]]:
+    """모든 사이트의 반경 내 grid_id를 한 번에 구한다 → (site 인덱스 배열, grid_id 배열)."""
+    lattice = await get_lattice(session)
+    if lattice is not None:
+        per_site = [lattice.grid_ids_within(lat, lng, radius) for lat, lng, radius, _ in sites]
+        if not per_site:
+            return [], []
+        member_sites = np.repeat(np.arange(len(sites)), [len(g) for g in per_site])
+        return member_sites.tolist(), np.concatenate(per_site).tolist()
+
+    rows = (await session.execute(_MEMBERS_BY_POINTS, {
+        "lats": [s[0] for s in sites],
+        "lngs": [s[1] for s in sites],
+        "radii": [s[2] / 111_320 for s in sites],
+    })).fetchall()
+    return [r[0] for r in rows], [r[1] for r in rows]
+
+
+async def aggregate_sites(
+    session: AsyncSession,
+    sites: list[tuple[float, float, int, str]],
+) -> list[dict]:
+    """(lat, lng, radius, industry_code) 목록을 입력 순서대로 집계한다."""
+    results: list[dict] = []
+    for start in range(0, len(sites), BATCH_CHUNK_SIZE):
+        chunk = sites[start:start + BATCH_CHUNK_SIZE]
+        member_sites, member_grids = await resolve_memberships(session, chunk)
+        rows = (await session.execute(_AGGREGATE_SITES, {
+            "member_sites": member_sites,
+            "member_grids": member_grids,
+            "industries": [s[3] for s in chunk],
+        })).fetchall()
+        results.extend(_row_to_result(row) for row in rows)
+    return results
+
+
+def _row_to_result(row) -> dict:
+    return build_result(
+        grid_count=int(row[1]),
+        store_count=row[2],
+        avg_floating=row[3],
+        total_pop=row[4],
+        avg_rent=row[5],
+        score=tuple(row[6:14]),
+        risk_flags=merge_risk_flags(row[14]),
+    )
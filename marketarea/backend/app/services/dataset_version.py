@@ -0,0 +1,39 @@
+"""데이터셋 버전 — ETL 게시 시점마다 증가하며 캐시/인메모리 인덱스 무효화 기준이 된다."""
+import time
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+
+CURRENT_VERSION_QUERY = text("SELECT COALESCE(MAX(id), 0) FROM dataset_version")
+
+_version_cache: dict = {"version": None, "checked_at": float("-inf")}
+
+
+def publish_dataset_version(session: Session, source: str) -> int:
+    """새 데이터 버전을 기록한다. 커밋은 호출 측 트랜잭션에서 함께 수행한다."""
+    return session.execute(text("""
+        INSERT INTO dataset_version (source) VALUES (:source) RETURNING id
+    """), {"source": source}).scalar()
+
+
+def read_dataset_version(conn: Connection) -> int:
+    """동기 Connection용 현재 버전 조회 (인메모리 인덱스 적재 시 사용)."""
+    return int(conn.execute(CURRENT_VERSION_QUERY).scalar() or 0)
+
+
+async def current_dataset_version(session: AsyncSession) -> int:
+    """현재 데이터 버전. DATASET_VERSION_CHECK_SECONDS 동안은 프로세스 내 값을 재사용한다."""
+    now = time.monotonic()
+    if now - _version_cache["checked_at"] > get_settings().DATASET_VERSION_CHECK_SECONDS:
+        _version_cache["version"] = int((await session.execute(CURRENT_VERSION_QUERY)).scalar() or 0)
+        _version_cache["checked_at"] = now
+    return _version_cache["version"]
+
+
+def invalidate_dataset_version() -> None:
+    """다음 요청에서 버전을 즉시 다시 조회하도록 한다 (API가 트리거한 ETL 완료 시)."""
+    _version_cache["checked_at"] = float("-inf")
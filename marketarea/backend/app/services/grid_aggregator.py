@@ -1,8 +1,181 @@
 """반경 기반 Grid 집계 서비스."""
 import json
-from sqlalchemy import text
+import time
+from sqlalchemy import ARRAY, Integer, String, bindparam, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.etl.grid_lattice import LATTICE_QUERY, Lattice
+from app.services.quarters import score_quarter_sql
+
+# grid_lattice 조회 결과 캐시 (격자 재생성 시에도 파라미터는 동일하므로 길게 유지)
+LATTICE_RECHECK_SECONDS = 300
+_lattice_cache: dict = {"lattice": None, "checked_at": float("-inf")}
+
+
+# 반경 내 Grid 멤버십 CTE — 좌표/반경 버전과 grid_id 배열 버전
+_GRIDS_BY_POINT = """
+    SELECT id AS grid_id FROM grid_master
+    WHERE ST_DWithin(
+        geom,
+        ST_SetSRID(ST_MakePoint(:lng, :lat), 4326),
+        :radius_deg
+    )
+"""
+
+_GRIDS_BY_IDS = """
+    SELECT id AS grid_id FROM grid_master
+    WHERE id = ANY(:grid_ids)
+"""
+
+# 멤버십 + 6개 집계 + 리스크 플래그 원문 수집을 단일 왕복으로 처리한다.
+# risk_flags는 텍스트 그대로 id 순 배열로 받아 Python에서 파싱/중복 제거한다
+# (SQL에서 ::json으로 캐스팅하면 잘못된 행 하나로 쿼리 전체가 실패하므로).
+# 쿼리 텍스트가 항상 동일하므로 asyncpg prepared statement 캐시가 재사용된다.
+# 점수는 :quarter 분기 (NULL이면 grid_score의 최신 분기).
+_AGGREGATE_SQL = """
+    WITH grids AS ({grids}),
+    stores AS (
+        SELECT COALESCE(SUM(gs.store_count), 0) AS store_count
+        FROM grid_store_stats gs JOIN grids USING (grid_id)
+        WHERE gs.industry_code = :ic
+    ),
+    floating AS (
+        SELECT COALESCE(AVG(gf.total_floating), 0) AS avg_floating
+        FROM grid_floating_stats gf JOIN grids USING (grid_id)
+    ),
+    population AS (
+        SELECT COALESCE(SUM(gp.total_population), 0) AS total_pop
+        FROM grid_population_stats gp JOIN grids USING (grid_id)
+    ),
+    rent AS (
+        SELECT COALESCE(AVG(gr.rent_per_m2), 0) AS avg_rent
+        FROM grid_rent_stats gr JOIN grids USING (grid_id)
+    ),
+    scores AS (
+        SELECT
+            AVG(sc.health_score) AS health_score,
+            AVG(sc.competition_index) AS competition_index,
+            AVG(sc.survival_probability) AS survival_probability,
+            AVG(sc.sales_estimate_low) AS sales_estimate_low,
+            AVG(sc.sales_estimate_high) AS sales_estimate_high,
+            AVG(sc.population_score) AS population_score,
+            AVG(sc.floating_score) AS floating_score,
+            AVG(sc.rent_score) AS rent_score
+        FROM grid_score sc JOIN grids USING (grid_id)
+        WHERE sc.industry_code = :ic AND {quarter}
+    ),
+    flags AS (
+        SELECT array_agg(sc.risk_flags ORDER BY sc.id) AS risk_flags
+        FROM grid_score sc JOIN grids USING (grid_id)
+        WHERE sc.industry_code = :ic AND {quarter}
+          AND sc.risk_flags IS NOT NULL AND sc.risk_flags != '[]'
+    )
+    SELECT
+        (SELECT COUNT(*) FROM grids) AS grid_count,
+        stores.store_count,
+        floating.avg_floating,
+        population.total_pop,
+        rent.avg_rent,
+        scores.health_score,
+        scores.competition_index,
+        scores.survival_probability,
+        scores.sales_estimate_low,
+        scores.sales_estimate_high,
+        scores.population_score,
+        scores.floating_score,
+        scores.rent_score,
+        flags.risk_flags
+    FROM stores, floating, population, rent, scores, flags
+"""
+
+_QUARTER = score_quarter_sql("sc")
+
+_AGGREGATE_BY_POINT = text(_AGGREGATE_SQL.format(grids=_GRIDS_BY_POINT, quarter=_QUARTER))
+_AGGREGATE_BY_IDS = text(_AGGREGATE_SQL.format(grids=_GRIDS_BY_IDS, quarter=_QUARTER)).bindparams(
+    bindparam("grid_ids", type_=ARRAY(Integer)),
+)
+
+
+# 한 위치의 여러 업종 비교: 멤버십과 업종 무관 지표(유동/거주인구/임대료)는 한 번만
+# 계산하고, grid_store_stats / grid_score는 industry_code로 그룹핑해 업종별 행을 만든다.
+_COMPARE_SQL = """
+    WITH grids AS ({grids}),
+    industries AS (
+        SELECT DISTINCT unnest(:industries) AS industry_code
+    ),
+    shared AS (
+        SELECT
+            (SELECT COUNT(*) FROM grids) AS grid_count,
+            (SELECT COALESCE(AVG(gf.total_floating), 0)
+             FROM grid_floating_stats gf JOIN grids USING (grid_id)) AS avg_floating,
+            (SELECT COALESCE(SUM(gp.total_population), 0)
+             FROM grid_population_stats gp JOIN grids USING (grid_id)) AS total_pop,
+            (SELECT COALESCE(AVG(gr.rent_per_m2), 0)
+             FROM grid_rent_stats gr JOIN grids USING (grid_id)) AS avg_rent
+    ),
+    stores AS (
+        SELECT gs.industry_code, SUM(gs.store_count) AS store_count
+        FROM grid_store_stats gs JOIN grids USING (grid_id)
+        WHERE gs.industry_code = ANY(:industries)
+        GROUP BY gs.industry_code
+    ),
+    scored AS (
+        SELECT sc.industry_code, sc.id, sc.health_score, sc.competition_index,
+               sc.survival_probability, sc.sales_estimate_low, sc.sales_estimate_high,
+               sc.population_score, sc.floating_score, sc.rent_score, sc.risk_flags
+        FROM grid_score sc JOIN grids USING (grid_id)
+        WHERE sc.industry_code = ANY(:industries) AND {quarter}
+    ),
+    scores AS (
+        SELECT
+            industry_code,
+            AVG(health_score) AS health_score,
+            AVG(competition_index) AS competition_index,
+            AVG(survival_probability) AS survival_probability,
+            AVG(sales_estimate_low) AS sales_estimate_low,
+            AVG(sales_estimate_high) AS sales_estimate_high,
+            AVG(population_score) AS population_score,
+            AVG(floating_score) AS floating_score,
+            AVG(rent_score) AS rent_score
+        FROM scored GROUP BY industry_code
+    ),
+    industry_flags AS (
+        SELECT industry_code, array_agg(risk_flags ORDER BY id) AS risk_flags
+        FROM scored
+        WHERE risk_flags IS NOT NULL AND risk_flags != '[]'
+        GROUP BY industry_code
+    )
+    SELECT
+        i.industry_code,
+        shared.grid_count,
+        COALESCE(st.store_count, 0),
+        shared.avg_floating,
+        shared.total_pop,
+        shared.avg_rent,
+        sc.health_score,
+        sc.competition_index,
+        sc.survival_probability,
+        sc.sales_estimate_low,
+        sc.sales_estimate_high,
+        sc.population_score,
+        sc.floating_score,
+        sc.rent_score,
+        fl.risk_flags
+    FROM industries i
+    CROSS JOIN shared
+    LEFT JOIN stores st USING (industry_code)
+    LEFT JOIN scores sc USING (industry_code)
+    LEFT JOIN industry_flags fl USING (industry_code)
+"""
+
+_COMPARE_BY_POINT = text(_COMPARE_SQL.format(grids=_GRIDS_BY_POINT, quarter=_QUARTER)).bindparams(
+    bindparam("industries", type_=ARRAY(String)),
+)
+_COMPARE_BY_IDS = text(_COMPARE_SQL.format(grids=_GRIDS_BY_IDS, quarter=_QUARTER)).bindparams(
+    bindparam("grid_ids", type_=ARRAY(Integer)),
+    bindparam("industries", type_=ARRAY(String)),
+)
+
 
 async def aggregate_grids(
     session: AsyncSession,
@@ -10,96 +183,125 @@ async def aggregate_grids(
     lng: float,
     radius: int,
     industry_code: str,
+    quarter: str | None = None,
 ) -> dict:
-    """주어진 좌표 반경 내 Grid들을 집계하여 분석 결과를 반환한다."""
+    """주어진 좌표 반경 내 Grid들을 집계하여 분석 결과를 반환한다.
+
+    격자 파라미터가 있으면 반경 내 grid_id를 산술로 구해 배열 파라미터로 넘기고,
+    구버전 격자면 ST_DWithin 멤버십 CTE를 사용한다. quarter가 없으면 최신 분기 점수.
+    """
+    lattice = await get_lattice(session)
+    if lattice is not None:
+        grid_ids = lattice.grid_ids_within(lat, lng, radius)
+        return await aggregate_grid_ids(session, grid_ids.tolist(), industry_code, quarter)
 
-    # 반경 내 Grid ID 추출 (ST_DWithin은 degree 단위이므로 미터 변환)
-    # 대략 1도 ≈ 111,320m
+    # ST_DWithin은 degree 단위이므로 미터 변환 (대략 1도 ≈ 111,320m)
     radius_deg = radius / 111_320
 
-    grid_rows = await session.execute(text("""
-        SELECT id FROM grid_master
-        WHERE ST_DWithin(
-            geom,
-            ST_SetSRID(ST_MakePoint(:lng, :lat), 4326),
-            :radius_deg
-        )
-    """), {"lat": lat, "lng": lng, "radius_deg": radius_deg})
+    row = (await session.execute(_AGGREGATE_BY_POINT, {
+        "lat": lat, "lng": lng, "radius_deg": radius_deg, "ic": industry_code, "quarter": quarter,
+    })).fetchone()
+    return _row_to_result(row)
 
-    grid_ids = [r[0] for r in grid_rows.fetchall()]
 
-    if not grid_ids:
-        return _empty_result()
+async def aggregate_grid_ids(
+    session: AsyncSession,
+    grid_ids: list[int],
+    industry_code: str,
+    quarter: str | None = None,
+) -> dict:
+    """이미 구한 grid_id 목록(배열 파라미터)에 대해 동일한 집계를 수행한다."""
+    row = (await session.execute(_AGGREGATE_BY_IDS, {
+        "grid_ids": list(grid_ids), "ic": industry_code, "quarter": quarter,
+    })).fetchone()
+    return _row_to_result(row)
 
-    grid_id_list = ",".join(str(gid) for gid in grid_ids)
-
-    # 점포 수
-    store_row = await session.execute(text(f"""
-        SELECT COALESCE(SUM(store_count), 0)
-        FROM grid_store_stats
-        WHERE grid_id IN ({grid_id_list}) AND industry_code = :ic
-    """), {"ic": industry_code})
-    store_count = store_row.scalar() or 0
-
-    # 유동인구 평균
-    floating_row = await session.execute(text(f"""
-        SELECT COALESCE(AVG(total_floating), 0)
-        FROM grid_floating_stats
-        WHERE grid_id IN ({grid_id_list})
-    """))
-    avg_floating = floating_row.scalar() or 0
-
-    # 거주인구 합계
-    pop_row = await session.execute(text(f"""
-        SELECT COALESCE(SUM(total_population), 0)
-        FROM grid_population_stats
-        WHERE grid_id IN ({grid_id_list})
-    """))
-    total_pop = pop_row.scalar() or 0
-
-    # 임대료 평균
-    rent_row = await session.execute(text(f"""
-        SELECT COALESCE(AVG(rent_per_m2), 0)
-        FROM grid_rent_stats
-        WHERE grid_id IN ({grid_id_list})
-    """))
-    avg_rent = rent_row.scalar() or 0
-
-    # Grid Score 가중 평균
-    score_row = await session.execute(text(f"""
-        SELECT
-            AVG(health_score),
-            AVG(competition_index),
-            AVG(survival_probability),
-            AVG(sales_estimate_low),
-            AVG(sales_estimate_high),
-            AVG(population_score),
-            AVG(floating_score),
-            AVG(rent_score)
-        FROM grid_score
-        WHERE grid_id IN ({grid_id_list}) AND industry_code = :ic
-    """), {"ic": industry_code})
-
-    score = score_row.fetchone()
-
-    # 리스크 플래그 집계
-    risk_rows = await session.execute(text(f"""
-        SELECT risk_flags FROM grid_score
-        WHERE grid_id IN ({grid_id_list}) AND industry_code = :ic
-        AND risk_flags IS NOT NULL AND risk_flags != '[]'
-    """), {"ic": industry_code})
 
+async def aggregate_industries(
+    session: AsyncSession,
+    lat: float,
+    lng: float,
+    radius: int,
+    industry_codes: list[str],
+    quarter: str | None = None,
+) -> dict[str, dict]:
+    """한 위치에 대해 여러 업종을 단일 쿼리로 집계한다 → {industry_code: 결과}.
+
+    업종별 결과는 aggregate_grids를 업종마다 호출한 것과 동일하다.
+    """
+    params = {"industries": list(industry_codes), "quarter": quarter}
+    lattice = await get_lattice(session)
+    if lattice is not None:
+        params["grid_ids"] = lattice.grid_ids_within(lat, lng, radius).tolist()
+        stmt = _COMPARE_BY_IDS
+    else:
+        params.update(lat=lat, lng=lng, radius_deg=radius / 111_320)
+        stmt = _COMPARE_BY_POINT
+
+    rows = (await session.execute(stmt, params)).fetchall()
+    return {row[0]: _row_to_result(row[1:]) for row in rows}
+
+
+async def get_lattice(session: AsyncSession) -> Lattice | None:
+    """grid_lattice 파라미터 (프로세스 내 캐시). 구버전 격자면 None."""
+    now = time.monotonic()
+    if now - _lattice_cache["checked_at"] > LATTICE_RECHECK_SECONDS:
+        row = (await session.execute(LATTICE_QUERY)).fetchone()
+        _lattice_cache["lattice"] = Lattice.from_row(row) if row else None
+        _lattice_cache["checked_at"] = now
+    return _lattice_cache["lattice"]
+
+
+def merge_risk_flags(rows) -> list[dict]:
+    """grid_score.id 순 risk_flags JSON 텍스트들을 메시지 기준으로 중복 제거한다 (첫 등장 순서 유지).
+
+    파싱할 수 없거나 message가 없는 플래그가 섞인 행은 통째로 건너뛴다 (인메모리 엔진과 동일).
+    """
     risk_flags = []
     seen_messages = set()
-    for (rf_json,) in risk_rows.fetchall():
+    for rf_json in rows or ():
+        if not rf_json or rf_json == "[]":
+            continue
         try:
             flags = json.loads(rf_json)
-            for f in flags:
-                if f["message"] not in seen_messages:
-                    risk_flags.append(f)
-                    seen_messages.add(f["message"])
-        except (json.JSONDecodeError, KeyError):
-            pass
+            messages = [f["message"] for f in flags]
+        except (json.JSONDecodeError, KeyError, TypeError):
+            continue
+        for f, message in zip(flags, messages):
+            if message not in seen_messages:
+                risk_flags.append(f)
+                seen_messages.add(message)
+    return risk_flags
+
+
+def _row_to_result(row) -> dict:
+    return build_result(
+        grid_count=int(row[0]),
+        store_count=row[1] or 0,
+        avg_floating=row[2] or 0,
+        total_pop=row[3] or 0,
+        avg_rent=row[4] or 0,
+        score=tuple(row[5:13]),
+        risk_flags=merge_risk_flags(row[13]),
+    )
+
+
+def build_result(
+    grid_count: int,
+    store_count: float,
+    avg_floating: float,
+    total_pop: float,
+    avg_rent: float,
+    score,
+    risk_flags: list[dict],
+) -> dict:
+    """집계값으로 분석 결과 dict를 구성한다 (SQL 경로/인메모리 엔진 공용).
+
+    score는 (health, competition, survival, sales_low, sales_high,
+    population, floating, rent) 평균 순서의 시퀀스 또는 None.
+    """
+    if not grid_count:
+        return _empty_result()
 
     if score and score[0] is not None:
         return {
@@ -116,13 +318,14 @@ async def aggregate_grids(
             "floating_score": round(float(score[6]), 1),
             "rent_score": round(float(score[7]), 1),
             "risk_flags": risk_flags,
-            "grid_count": len(grid_ids),
+            "grid_count": grid_count,
+            "has_score": True,
         }
 
-    # Grid Score가 아직 계산되지 않은 경우 기본 결과
+    # Grid Score가 아직 계산되지 않은 경우 기본 결과 (점수는 자리표시 값, has_score=False)
     return {
         "health_score": 50.0,
-        "competition_index": store_count / max(len(grid_ids), 1),
+        "competition_index": store_count / max(grid_count, 1),
         "survival_probability": 0.75,
         "sales_estimate_low": 0,
         "sales_estimate_high": 0,
@@ -134,7 +337,8 @@ async def aggregate_grids(
         "floating_score": 50.0,
         "rent_score": 50.0,
         "risk_flags": [],
-        "grid_count": len(grid_ids),
+        "grid_count": grid_count,
+        "has_score": False,
     }
 
 
@@ -154,4 +358,5 @@ def _empty_result() -> dict:
         "rent_score": 0,
         "risk_flags": [{"level": "warning", "message": "해당 위치에 분석 데이터가 없습니다"}],
         "grid_count": 0,
+        "has_score": False,
     }
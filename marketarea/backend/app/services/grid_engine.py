@@ -0,0 +1,345 @@
+"""인메모리 컬럼형 Grid 엔진 — 반경 집계를 NumPy 벡터 연산으로 처리.
+
+grid_master 격자 경계와 grid_*_stats / grid_score 컬럼을 시작 시 NumPy 배열로
+적재해 두고, /api/analysis 요청을 DB 왕복 없이 계산한다.
+결과는 SQL 경로(aggregate_grids)와 동일한 AnalysisResult dict를 반환한다.
+"""
+import json
+import logging
+import threading
+import time
+
+import numpy as np
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.pool import NullPool
+
+from app.config import get_settings
+from app.services.dataset_version import read_dataset_version
+from app.services.grid_aggregator import build_result
+from app.services.quarters import CURRENT_SCORE_QUARTER_SQL
+
+logger = logging.getLogger("api.grid_engine")
+
+# aggregate_grids와 동일한 degree 변환 (1도 ≈ 111,320m)
+METERS_PER_DEGREE = 111_320
+
+# grid_score 평균 컬럼 (build_result의 score 시퀀스 순서)
+SCORE_COLUMNS = (
+    "health_score",
+    "competition_index",
+    "survival_probability",
+    "sales_estimate_low",
+    "sales_estimate_high",
+    "population_score",
+    "floating_score",
+    "rent_score",
+)
+
+MAX_RISK_FLAGS = 64
+
+
+class _RowTable:
+    """stats 테이블 한 개(또는 업종 하나)의 행 단위 컬럼 배열.
+
+    idx: 각 행의 grid dense index, values: (행 x 컬럼) float 배열 (NULL은 NaN).
+    SQL의 SUM/AVG가 NULL을 무시하는 것과 같이 NaN을 제외하고 집계한다.
+    """
+
+    __slots__ = ("idx", "values")
+
+    def __init__(self, idx: np.ndarray, values: np.ndarray):
+        self.idx = idx
+        self.values = values
+
+    def select(self, mask: np.ndarray) -> np.ndarray:
+        return self.values[mask[self.idx]]
+
+
+class _Snapshot:
+    """한 시점의 전체 데이터 스냅샷 (불변). reload 시 통째로 교체된다."""
+
+    def __init__(self):
+        self.ids = np.empty(0, dtype=np.int64)
+        self.xmin = self.xmax = self.ymin = self.ymax = np.empty(0)
+        self.y_order = np.empty(0, dtype=np.int64)
+        self.ymin_sorted = np.empty(0)
+        self.max_height = 0.0
+        self.floating: _RowTable | None = None
+        self.population: _RowTable | None = None
+        self.rent: _RowTable | None = None
+        self.stores: dict[str, _RowTable] = {}
+        self.scores: dict[str, _RowTable] = {}
+        self.risk_bits: dict[str, np.ndarray] = {}
+        self.risk_json: dict[str, list[str]] = {}
+        self.risk_catalog: list[dict] = []
+        self.version = 0
+        self.loaded_at = 0.0
+
+    def dense_index(self, grid_ids: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """grid_id → dense index. grid_master에 없는 id는 valid=False."""
+        pos = np.searchsorted(self.ids, grid_ids)
+        pos = np.minimum(pos, max(len(self.ids) - 1, 0))
+        valid = self.ids[pos] == grid_ids if len(self.ids) else np.zeros(len(grid_ids), bool)
+        return pos, valid
+
+
+class GridEngine:
+    """반경 집계용 인메모리 엔진. 모듈 전역 grid_engine 인스턴스로 사용한다."""
+
+    def __init__(self):
+        self._snapshot: _Snapshot | None = None
+        self._lock = threading.Lock()
+        self._reloading = False
+
+    @property
+    def ready(self) -> bool:
+        return self._snapshot is not None
+
+    @property
+    def version(self) -> int | None:
+        """적재된 스냅샷의 데이터 버전 (dataset_version.id)."""
+        return self._snapshot.version if self._snapshot else None
+
+    def request_reload(self) -> None:
+        """데이터 버전이 바뀌었을 때 백그라운드 스레드로 재적재한다 (중복 실행 방지)."""
+        if self._reloading:
+            return
+        self._reloading = True
+
+        def _run():
+            try:
+                self.reload()
+            except Exception as e:
+                logger.warning("Grid engine reload failed: %s", e)
+            finally:
+                self._reloading = False
+
+        threading.Thread(target=_run, name="grid-engine-reload", daemon=True).start()
+
+    def load(self, conn: Connection) -> None:
+        """동기 Connection으로 전체 스냅샷을 적재하고 원자적으로 교체한다."""
+        with self._lock:
+            start = time.perf_counter()
+            snap = _load_snapshot(conn)
+            self._snapshot = snap
+            logger.info(
+                "Grid engine loaded: version=%d grids=%d industries=%d (%.2fs)",
+                snap.version, len(snap.ids), len(snap.scores), time.perf_counter() - start,
+            )
+
+    def reload(self) -> None:
+        """ETL 완료 후 동기 DB URL로 재적재한다 (백그라운드 스레드용)."""
+        engine = create_engine(get_settings().get_sync_db_url(), poolclass=NullPool)
+        try:
+            with engine.connect() as conn:
+                self.load(conn)
+        finally:
+            engine.dispose()
+
+    def aggregate(self, lat: float, lng: float, radius: int, industry_code: str) -> dict:
+        """aggregate_grids와 동일한 결과를 인메모리 벡터 연산으로 계산한다."""
+        return self.aggregate_industries(lat, lng, radius, [industry_code])[industry_code]
+
+    def aggregate_industries(
+        self, lat: float, lng: float, radius: int, industry_codes: list[str],
+    ) -> dict[str, dict]:
+        """반경 마스크와 업종 무관 지표를 한 번만 계산하고 업종별 결과를 만든다."""
+        snap = self._snapshot
+        if snap is None:
+            raise RuntimeError("Grid engine is not loaded")
+
+        mask = _radius_mask(snap, lat, lng, radius)
+        grid_count = int(mask.sum())
+        if not grid_count:
+            return {code: build_result(0, 0, 0, 0, 0, None, []) for code in industry_codes}
+
+        avg_floating = _nanmean(snap.floating.select(mask)[:, 0]) if snap.floating else None
+        total_pop = float(np.nansum(snap.population.select(mask))) if snap.population else 0.0
+        avg_rent = _nanmean(snap.rent.select(mask)[:, 0]) if snap.rent else None
+
+        results = {}
+        for industry_code in industry_codes:
+            store_count = 0.0
+            stores = snap.stores.get(industry_code)
+            if stores is not None:
+                store_count = float(np.nansum(stores.select(mask)))
+
+            score = None
+            risk_flags: list[dict] = []
+            scores = snap.scores.get(industry_code)
+            if scores is not None:
+                row_sel = mask[scores.idx]
+                selected = scores.values[row_sel]
+                if len(selected):
+                    score = [_nanmean(selected[:, i]) for i in range(len(SCORE_COLUMNS))]
+                risk_flags = _collect_risk_flags(snap, industry_code, row_sel)
+
+            results[industry_code] = build_result(
+                grid_count=grid_count,
+                store_count=store_count,
+                avg_floating=avg_floating or 0,
+                total_pop=total_pop,
+                avg_rent=avg_rent or 0,
+                score=score,
+                risk_flags=risk_flags,
+            )
+        return results
+
+
+def _nanmean(values: np.ndarray) -> float | None:
+    """NULL(NaN)을 제외한 평균. 값이 없으면 None (SQL AVG와 동일)."""
+    valid = values[~np.isnan(values)]
+    if not len(valid):
+        return None
+    return float(valid.sum() / len(valid))
+
+
+def _radius_mask(snap: _Snapshot, lat: float, lng: float, radius: int) -> np.ndarray:
+    """ST_DWithin(geom, point, radius_deg)과 같은 기준의 격자 마스크.
+
+    격자 사각형과 점 사이의 평면(degree) 거리가 radius_deg 이하인 격자를 선택한다.
+    ymin 정렬 인덱스로 위도 밴드 후보만 추린 뒤 정밀 판정한다.
+    """
+    radius_deg = radius / METERS_PER_DEGREE
+    lo = np.searchsorted(snap.ymin_sorted, lat - radius_deg - snap.max_height, side="left")
+    hi = np.searchsorted(snap.ymin_sorted, lat + radius_deg, side="right")
+    cand = snap.y_order[lo:hi]
+
+    dx = np.maximum(np.maximum(snap.xmin[cand] - lng, lng - snap.xmax[cand]), 0.0)
+    dy = np.maximum(np.maximum(snap.ymin[cand] - lat, lat - snap.ymax[cand]), 0.0)
+    inside = np.sqrt(dx * dx + dy * dy) <= radius_deg
+
+    mask = np.zeros(len(snap.ids), dtype=bool)
+    mask[cand[inside]] = True
+    return mask
+
+
+def _collect_risk_flags(snap: _Snapshot, industry_code: str, row_sel: np.ndarray) -> list[dict]:
+    """선택된 행들의 리스크 플래그를 메시지 기준 중복 제거 (첫 등장 순서 유지).
+
+    비트마스크로 각 메시지가 처음 등장하는 행만 찾은 뒤, 그 행들의 JSON만
+    SQL 경로와 같은 순서로 다시 읽어 결과를 만든다.
+    """
+    rows = np.flatnonzero(row_sel)
+    if not len(rows):
+        return []
+    bits = snap.risk_bits[industry_code][rows]
+    present = np.bitwise_or.reduce(bits)
+    if not present:
+        return []
+
+    first_rows = set()
+    for i in range(len(snap.risk_catalog)):
+        bit = np.uint64(1 << i)
+        if present & bit:
+            first_rows.add(int(rows[np.flatnonzero(bits & bit)[0]]))
+
+    risk_json = snap.risk_json[industry_code]
+    risk_flags = []
+    seen_messages = set()
+    for row in sorted(first_rows):
+        for f in json.loads(risk_json[row]):
+            if f["message"] not in seen_messages:
+                risk_flags.append(f)
+                seen_messages.add(f["message"])
+    return risk_flags
+
+
+def _grid_rows(conn: Connection, sql: str) -> list:
+    return conn.execute(text(sql)).fetchall()
+
+
+def _row_table(snap: _Snapshot, rows: list, n_values: int) -> _RowTable:
+    """[(grid_id, v1, v2, ...)] → _RowTable. grid_master에 없는 grid_id는 제외."""
+    if not rows:
+        return _RowTable(np.empty(0, dtype=np.int64), np.empty((0, n_values)))
+    grid_ids = np.fromiter((r[0] for r in rows), dtype=np.int64, count=len(rows))
+    values = np.array(
+        [[np.nan if v is None else v for v in r[1:n_values + 1]] for r in rows],
+        dtype=np.float64,
+    ).reshape(len(rows), n_values)
+    idx, valid = snap.dense_index(grid_ids)
+    return _RowTable(idx[valid], values[valid])
+
+
+def _group_by_industry(snap: _Snapshot, rows: list, n_values: int) -> dict[str, _RowTable]:
+    """[(industry_code, grid_id, v...)] → 업종별 _RowTable (행 순서 유지)."""
+    grouped: dict[str, list] = {}
+    for r in rows:
+        grouped.setdefault(r[0], []).append(r[1:])
+    return {code: _row_table(snap, items, n_values) for code, items in grouped.items()}
+
+
+def _load_snapshot(conn: Connection) -> _Snapshot:
+    snap = _Snapshot()
+    # 적재 도중 새 버전이 게시되면 다음 요청에서 다시 재적재되도록 먼저 읽는다
+    snap.version = read_dataset_version(conn)
+
+    grids = _grid_rows(conn, """
+        SELECT id, ST_XMin(geom), ST_XMax(geom), ST_YMin(geom), ST_YMax(geom)
+        FROM grid_master ORDER BY id
+    """)
+    if grids:
+        arr = np.array(grids, dtype=np.float64)
+        snap.ids = arr[:, 0].astype(np.int64)
+        snap.xmin, snap.xmax, snap.ymin, snap.ymax = (
+            np.ascontiguousarray(arr[:, i]) for i in range(1, 5)
+        )
+        snap.y_order = np.argsort(snap.ymin, kind="stable")
+        snap.ymin_sorted = snap.ymin[snap.y_order]
+        snap.max_height = float((snap.ymax - snap.ymin).max())
+
+    snap.floating = _row_table(snap, _grid_rows(conn, """
+        SELECT grid_id, total_floating FROM grid_floating_stats ORDER BY id
+    """), 1)
+    snap.population = _row_table(snap, _grid_rows(conn, """
+        SELECT grid_id, total_population FROM grid_population_stats ORDER BY id
+    """), 1)
+    snap.rent = _row_table(snap, _grid_rows(conn, """
+        SELECT grid_id, rent_per_m2 FROM grid_rent_stats ORDER BY id
+    """), 1)
+    snap.stores = _group_by_industry(snap, _grid_rows(conn, """
+        SELECT industry_code, grid_id, store_count FROM grid_store_stats ORDER BY id
+    """), 1)
+
+    score_rows = _grid_rows(conn, f"""
+        SELECT industry_code, grid_id, {", ".join(SCORE_COLUMNS)}, risk_flags
+        FROM grid_score WHERE snapshot_quarter = {CURRENT_SCORE_QUARTER_SQL} ORDER BY id
+    """)
+    snap.scores = _group_by_industry(snap, score_rows, len(SCORE_COLUMNS))
+    _build_risk_bits(snap, score_rows)
+    snap.loaded_at = time.time()
+    return snap
+
+
+def _build_risk_bits(snap: _Snapshot, score_rows: list) -> None:
+    """risk_flags JSON을 메시지 카탈로그 + 행별 비트마스크로 변환한다."""
+    bit_of: dict[str, int] = {}
+    rows_by_industry: dict[str, list] = {}
+
+    for r in score_rows:
+        industry_code, grid_id, rf_json = r[0], r[1], r[-1]
+        mask = 0
+        if rf_json and rf_json != "[]":
+            try:
+                for f in json.loads(rf_json):
+                    msg = f["message"]
+                    if msg not in bit_of:
+                        if len(snap.risk_catalog) >= MAX_RISK_FLAGS:
+                            continue
+                        bit_of[msg] = len(snap.risk_catalog)
+                        snap.risk_catalog.append(f)
+                    mask |= 1 << bit_of[msg]
+            except (json.JSONDecodeError, KeyError, TypeError):
+                mask = 0
+        rows_by_industry.setdefault(industry_code, []).append((grid_id, mask, rf_json))
+
+    for code, items in rows_by_industry.items():
+        grid_ids = np.array([it[0] for it in items], dtype=np.int64)
+        _, valid = snap.dense_index(grid_ids)
+        snap.risk_bits[code] = np.array([it[1] for it in items], dtype=np.uint64)[valid]
+        snap.risk_json[code] = [it[2] for it, ok in zip(items, valid) if ok]
+
+
+grid_engine = GridEngine()
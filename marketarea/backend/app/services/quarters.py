@@ -0,0 +1,34 @@
+"""분기(snapshot_quarter) 라벨과 조회 조건 — grid_score는 분기별 점수를 모두 보관한다."""
+import re
+
+# API 입력 검증용 ("2024-Q3")
+QUARTER_PATTERN = r"^\d{4}-Q[1-4]$"
+
+# 현재 분기 = grid_score의 최신 분기 (snapshot_quarter 인덱스로 한 번 조회되는 InitPlan,
+# 파티션 테이블에서는 그 값으로 실행 시점 파티션 프루닝 → 최신 분기 파티션만 읽는다)
+CURRENT_SCORE_QUARTER_SQL = "(SELECT MAX(snapshot_quarter) FROM grid_score)"
+
+_QUARTER_FORMATS = (
+    re.compile(r"^(\d{4})-?Q([1-4])$", re.IGNORECASE),   # 2024-Q3, 2024Q3
+    re.compile(r"^(\d{4})([1-4])$"),                       # 20243 (서울시 STDR_YYQU_CD)
+)
+
+
+def normalize_quarter(value: str | None) -> str | None:
+    """분기 표기를 "YYYY-QN"으로 통일한다. 알 수 없는 형식은 그대로 돌려준다."""
+    if value is None:
+        return None
+    value = str(value).strip()
+    for pattern in _QUARTER_FORMATS:
+        m = pattern.match(value)
+        if m:
+            return f"{m.group(1)}-Q{m.group(2)}"
+    return value
+
+
+def score_quarter_sql(alias: str) -> str:
+    """:quarter 분기(NULL이면 현재 분기)의 grid_score 행 조건."""
+    return (
+        f"{alias}.snapshot_quarter = "
+        f"COALESCE(CAST(:quarter AS varchar), {CURRENT_SCORE_QUARTER_SQL})"
+    )
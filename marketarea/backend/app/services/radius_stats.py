@@ -0,0 +1,385 @@
+"""표준 반경 디스크 컨볼루션 사전 집계.
+
+격자 중심으로 스냅된 요청의 반경 멤버십은 모든 격자에서 같은 모양(디스크 커널)이므로,
+격자 지표 배열을 디스크 커널로 컨볼루션하면 전 격자의 반경 집계를 한 번에 얻는다.
+커널을 행 단위 구간(row span)으로 분해하고 행별 누적합으로 구간합을 구하므로
+FFT와 달리 반올림 오차 없이 합계/개수가 정확하다 (격자 밖은 0 패딩 = 멤버십 제외).
+
+ETL: build_radius_tables()가 표준 반경별 결과를 grid_radius_stats(업종 무관) /
+grid_radius_score(업종별)에 저장한다.
+API: lookup_radius_result()가 (grid_id, 반경, 업종) 인덱스 조회 한 번으로
+aggregate_grids와 같은 결과를 반환한다.
+"""
+import json
+import math
+
+import numpy as np
+from sqlalchemy import insert, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.etl.grid_lattice import METERS_PER_DEGREE, Lattice, load_lattice
+from app.etl.logger import get_etl_logger
+from app.models.stats import GridRadiusScore, GridRadiusStats
+from app.services.grid_aggregator import build_result
+from app.services.grid_engine import SCORE_COLUMNS
+from app.services.quarters import CURRENT_SCORE_QUARTER_SQL
+from app.services.summed_area import lattice_array
+
+logger = get_etl_logger("radius_stats")
+
+INSERT_CHUNK_SIZE = 5000
+
+
+def disk_spans(lattice: Lattice, radius_m: float) -> list[tuple[int, int]]:
+    """격자 중심 기준 반경 멤버십을 [(행 오프셋, 열 반폭)]으로 분해한다.
+
+    Lattice.grid_ids_within(격자 중심, radius_m)과 같은 평면(degree) 거리 기준:
+    오프셋 (dr, dc) 격자는 max(|dr| * dlat - dlat / 2, 0)과
+    max(|dc| * dlng - dlng / 2, 0)의 유클리드 거리가 반경 이하일 때 포함된다.
+    """
+    radius_deg = radius_m / METERS_PER_DEGREE
+    max_dr = math.floor(radius_deg / lattice.dlat + 0.5)
+    spans = []
+    for dr in range(-max_dr, max_dr + 1):
+        dy = max(abs(dr) * lattice.dlat - lattice.dlat / 2, 0.0)
+        if dy > radius_deg:
+            continue
+        dx_max = math.sqrt(radius_deg * radius_deg - dy * dy)
+        spans.append((dr, math.floor(dx_max / lattice.dlng + 0.5)))
+    return spans
+
+
+def disk_sum(values: np.ndarray, spans: list[tuple[int, int]]) -> np.ndarray:
+    """(n_rows, n_cols) 배열의 디스크 커널 합 (격자 밖은 0으로 간주)."""
+    n_rows, n_cols = values.shape
+    prefix = np.zeros((n_rows, n_cols + 1), dtype=np.float64)
+    prefix[:, 1:] = values.cumsum(axis=1)
+    cols = np.arange(n_cols)
+    out = np.zeros((n_rows, n_cols), dtype=np.float64)
+    for dr, half in spans:
+        r0, r1 = max(0, -dr), min(n_rows, n_rows - dr)
+        if r0 >= r1:
+            continue
+        lo = np.clip(cols - half, 0, n_cols)
+        hi = np.clip(cols + half + 1, 0, n_cols)
+        src = prefix[r0 + dr:r1 + dr]
+        out[r0:r1] += src[:, hi] - src[:, lo]
+    return out
+
+
+def disk_min(values: np.ndarray, spans: list[tuple[int, int]]) -> np.ndarray:
+    """(n_rows, n_cols) 배열의 디스크 커널 최솟값 (격자 밖은 +inf로 간주).
+
+    행별 sparse table(2^k 구간 최솟값)로 각 열 구간의 최솟값을 O(1)에 구한다.
+    """
+    n_rows, n_cols = values.shape
+    levels = [values.astype(np.float64)]
+    width = 1
+    while width * 2 <= n_cols:
+        prev = levels[-1]
+        nxt = prev.copy()
+        nxt[:, :n_cols - width] = np.minimum(prev[:, :n_cols - width], prev[:, width:])
+        levels.append(nxt)
+        width *= 2
+    table = np.stack(levels)
+
+    cols = np.arange(n_cols)
+    out = np.full((n_rows, n_cols), np.inf)
+    for dr, half in spans:
+        r0, r1 = max(0, -dr), min(n_rows, n_rows - dr)
+        if r0 >= r1:
+            continue
+        lo = np.clip(cols - half, 0, n_cols - 1)
+        hi = np.clip(cols + half, 0, n_cols - 1)
+        k = np.floor(np.log2(hi - lo + 1)).astype(np.int64)
+        rows = np.arange(r0 + dr, r1 + dr)[:, None]
+        span_min = np.minimum(
+            table[k[None, :], rows, lo[None, :]],
+            table[k[None, :], rows, (hi - (1 << k) + 1)[None, :]],
+        )
+        out[r0:r1] = np.minimum(out[r0:r1], span_min)
+    return out
+
+
+class LatticeMetrics:
+    """격자 배열로 펼친 지표 (디스크 컨볼루션 입력). SQL의 SUM/AVG 규칙과 같이
+    합계와 NULL 제외 행 수를 따로 들고 있다가 반경 합계 후 나눈다."""
+
+    def __init__(self, lattice: Lattice):
+        self.lattice = lattice
+        shape = (lattice.n_rows, lattice.n_cols)
+        self.exists = np.zeros(shape)
+        self.floating_sum = np.zeros(shape)
+        self.floating_cnt = np.zeros(shape)
+        self.population_sum = np.zeros(shape)
+        self.rent_sum = np.zeros(shape)
+        self.rent_cnt = np.zeros(shape)
+        self.store_sum: dict[str, np.ndarray] = {}
+        self.score_sum: dict[str, np.ndarray] = {}   # (8, n_rows, n_cols)
+        self.score_cnt: dict[str, np.ndarray] = {}
+        # 업종별 리스크 메시지 → 그 메시지를 가진 grid_score 최소 id 배열 (없으면 inf)
+        self.risk_min_id: dict[str, dict[str, np.ndarray]] = {}
+        # grid_score id → {메시지: (ord, flag)} (행 내 첫 등장)
+        self.risk_rows: dict[int, dict[str, tuple[int, dict]]] = {}
+
+    def array(self, rows: list) -> np.ndarray:
+        return lattice_array(self.lattice, rows)
+
+    def industries(self) -> list[str]:
+        return sorted(set(self.store_sum) | set(self.score_sum))
+
+
+def load_lattice_metrics(
+    session: Session | Connection, lattice: Lattice, with_risk_flags: bool = True,
+) -> LatticeMetrics:
+    """grid_master / stats / grid_score를 격자 배열로 적재한다."""
+    m = LatticeMetrics(lattice)
+    ids = session.execute(text("SELECT id, 1 FROM grid_master")).fetchall()
+    m.exists = m.array(ids)
+
+    floating = session.execute(text("""
+        SELECT grid_id, SUM(total_floating), COUNT(total_floating)
+        FROM grid_floating_stats GROUP BY grid_id
+    """)).fetchall()
+    m.floating_sum = m.array([(r[0], r[1]) for r in floating])
+    m.floating_cnt = m.array([(r[0], r[2]) for r in floating])
+
+    population = session.execute(text("""
+        SELECT grid_id, SUM(total_population) FROM grid_population_stats GROUP BY grid_id
+    """)).fetchall()
+    m.population_sum = m.array(population)
+
+    rent = session.execute(text("""
+        SELECT grid_id, SUM(rent_per_m2), COUNT(rent_per_m2)
+        FROM grid_rent_stats GROUP BY grid_id
+    """)).fetchall()
+    m.rent_sum = m.array([(r[0], r[1]) for r in rent])
+    m.rent_cnt = m.array([(r[0], r[2]) for r in rent])
+
+    stores: dict[str, list] = {}
+    for code, grid_id, cnt in session.execute(text("""
+        SELECT industry_code, grid_id, SUM(store_count)
+        FROM grid_store_stats GROUP BY industry_code, grid_id
+    """)):
+        stores.setdefault(code, []).append((grid_id, cnt))
+    m.store_sum = {code: m.array(rows) for code, rows in stores.items()}
+
+    sums = ", ".join(f"SUM({c})" for c in SCORE_COLUMNS)
+    scores: dict[str, list] = {}
+    for row in session.execute(text(f"""
+        SELECT industry_code, grid_id, COUNT(*), {sums}
+        FROM grid_score WHERE snapshot_quarter = {CURRENT_SCORE_QUARTER_SQL}
+        GROUP BY industry_code, grid_id
+    """)):
+        scores.setdefault(row[0], []).append(row[1:])
+    for code, rows in scores.items():
+        m.score_cnt[code] = m.array([(r[0], r[1]) for r in rows])
+        m.score_sum[code] = np.stack([
+            m.array([(r[0], r[2 + i]) for r in rows]) for i in range(len(SCORE_COLUMNS))
+        ])
+
+    if with_risk_flags:
+        _load_risk_flags(session, m)
+    return m
+
+
+def _load_risk_flags(session: Session | Connection, m: LatticeMetrics) -> None:
+    """메시지별로 격자 내 최소 grid_score.id를 기록한다 (반경 내 첫 등장 = 디스크 최솟값)."""
+    size = m.lattice.size
+    for score_id, grid_id, code, rf_json in session.execute(text(f"""
+        SELECT id, grid_id, industry_code, risk_flags FROM grid_score
+        WHERE snapshot_quarter = {CURRENT_SCORE_QUARTER_SQL}
+          AND risk_flags IS NOT NULL AND risk_flags != '[]'
+    """)):
+        try:
+            flags = json.loads(rf_json)
+        except json.JSONDecodeError:
+            continue
+        idx = grid_id - 1
+        if not 0 <= idx < size:
+            continue
+        first: dict[str, tuple[int, dict]] = {}
+        for ord_, f in enumerate(flags):
+            if isinstance(f, dict) and "message" in f:
+                first.setdefault(f["message"], (ord_, f))
+        if not first:
+            continue
+        m.risk_rows[score_id] = first
+        by_message = m.risk_min_id.setdefault(code, {})
+        for msg in first:
+            arr = by_message.get(msg)
+            if arr is None:
+                arr = by_message[msg] = np.full(size, np.inf)
+            if score_id < arr[idx]:
+                arr[idx] = score_id
+
+    for by_message in m.risk_min_id.values():
+        for msg, arr in by_message.items():
+            by_message[msg] = arr.reshape(m.lattice.n_rows, m.lattice.n_cols)
+
+
+def _ratio(num: np.ndarray, den: np.ndarray) -> np.ndarray:
+    """AVG = 합계 / 행 수. 행이 없으면 NaN (SQL AVG의 NULL)."""
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(den > 0, num / np.where(den > 0, den, 1), np.nan)
+
+
+def _risk_json(m: LatticeMetrics, min_ids: list[np.ndarray], cell: int) -> str:
+    """셀의 메시지별 최소 id로 aggregate_grids와 같은 (id, ord) 순서의 JSON을 만든다."""
+    found = []
+    for msg, arr in min_ids:
+        score_id = arr[cell]
+        if np.isfinite(score_id):
+            ord_, flag = m.risk_rows[int(score_id)][msg]
+            found.append((int(score_id), ord_, flag))
+    found.sort(key=lambda t: (t[0], t[1]))
+    return json.dumps([f for _, _, f in found], ensure_ascii=False)
+
+
+def build_radius_tables(session: Session, radii: list[int] | None = None) -> int:
+    """표준 반경별 디스크 컨볼루션 결과로 grid_radius_stats / grid_radius_score를 갱신한다."""
+    lattice = load_lattice(session)
+    if lattice is None:
+        logger.warning("No grid_lattice row (grids generated before lattice support), skipping")
+        return 0
+    radii = radii if radii is not None else get_settings().get_precomputed_radii()
+
+    m = load_lattice_metrics(session, lattice)
+    session.execute(text("DELETE FROM grid_radius_score"))
+    session.execute(text("DELETE FROM grid_radius_stats"))
+
+    total = 0
+    for radius in radii:
+        spans = disk_spans(lattice, radius)
+        grid_count = disk_sum(m.exists, spans).ravel()
+        avg_floating = _ratio(disk_sum(m.floating_sum, spans), disk_sum(m.floating_cnt, spans))
+        total_pop = disk_sum(m.population_sum, spans)
+        avg_rent = _ratio(disk_sum(m.rent_sum, spans), disk_sum(m.rent_cnt, spans))
+
+        cells = np.flatnonzero(grid_count > 0)
+        stats_rows = [
+            {
+                "grid_id": int(c) + 1,
+                "radius": radius,
+                "grid_count": int(round(grid_count[c])),
+                "avg_floating": _float(v_f),
+                "total_population": float(v_p),
+                "avg_rent": _float(v_r),
+            }
+            for c, v_f, v_p, v_r in zip(
+                cells,
+                avg_floating.ravel()[cells],
+                total_pop.ravel()[cells],
+                avg_rent.ravel()[cells],
+            )
+        ]
+        _insert_chunks(session, GridRadiusStats, stats_rows)
+        total += len(stats_rows)
+
+        for code in m.industries():
+            total += _build_industry(session, m, code, radius, spans, grid_count)
+        logger.info("Radius %dm: %d cells, %d kernel rows", radius, len(cells), len(spans))
+
+    session.commit()
+    logger.info("Built %d precomputed radius rows for radii %s", total, radii)
+    return total
+
+
+def _build_industry(
+    session: Session,
+    m: LatticeMetrics,
+    code: str,
+    radius: int,
+    spans: list[tuple[int, int]],
+    grid_count: np.ndarray,
+) -> int:
+    """업종 하나의 반경 집계 행 (반경 내 점포 또는 점수가 있는 셀만)."""
+    shape = (m.lattice.n_rows, m.lattice.n_cols)
+    store_count = disk_sum(m.store_sum.get(code, np.zeros(shape)), spans).ravel()
+    if code in m.score_sum:
+        score_cnt = disk_sum(m.score_cnt[code], spans).ravel()
+        score_avg = [
+            _ratio(disk_sum(m.score_sum[code][i], spans).ravel(), score_cnt)
+            for i in range(len(SCORE_COLUMNS))
+        ]
+    else:
+        score_cnt = np.zeros(store_count.shape)
+        score_avg = [np.full(store_count.shape, np.nan)] * len(SCORE_COLUMNS)
+    min_ids = [
+        (msg, disk_min(arr, spans).ravel())
+        for msg, arr in m.risk_min_id.get(code, {}).items()
+    ]
+
+    cells = np.flatnonzero((grid_count > 0) & ((store_count != 0) | (score_cnt > 0)))
+    rows = []
+    for c in cells:
+        row = {
+            "grid_id": int(c) + 1,
+            "radius": radius,
+            "industry_code": code,
+            "store_count": float(store_count[c]),
+            "risk_flags": _risk_json(m, min_ids, c) if min_ids else "[]",
+        }
+        for i, col in enumerate(SCORE_COLUMNS):
+            row[col] = _float(score_avg[i][c])
+        rows.append(row)
+    _insert_chunks(session, GridRadiusScore, rows)
+    return len(rows)
+
+
+def _float(value) -> float | None:
+    return None if np.isnan(value) else float(value)
+
+
+def _insert_chunks(session: Session, model, rows: list[dict]) -> None:
+    for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+        session.execute(insert(model.__table__), rows[start:start + INSERT_CHUNK_SIZE])
+
+
+_LOOKUP = text("""
+    SELECT
+        rs.grid_count,
+        COALESCE(sc.store_count, 0),
+        COALESCE(rs.avg_floating, 0),
+        rs.total_population,
+        COALESCE(rs.avg_rent, 0),
+        sc.health_score,
+        sc.competition_index,
+        sc.survival_probability,
+        sc.sales_estimate_low,
+        sc.sales_estimate_high,
+        sc.population_score,
+        sc.floating_score,
+        sc.rent_score,
+        COALESCE(sc.risk_flags, '[]')
+    FROM grid_radius_stats rs
+    LEFT JOIN grid_radius_score sc
+      ON sc.grid_id = rs.grid_id AND sc.radius = rs.radius AND sc.industry_code = :ic
+    WHERE rs.grid_id = :gid AND rs.radius = :radius
+""")
+
+
+async def lookup_radius_result(
+    session: AsyncSession,
+    grid_id: int,
+    radius: int,
+    industry_code: str,
+) -> dict | None:
+    """격자 중심 + 표준 반경 요청의 사전 집계 결과. 미계산이면 None (실시간 경로 사용)."""
+    row = (await session.execute(_LOOKUP, {
+        "gid": grid_id, "radius": radius, "ic": industry_code,
+    })).fetchone()
+    if row is None:
+        return None
+    return build_result(
+        grid_count=int(row[0]),
+        store_count=row[1],
+        avg_floating=row[2],
+        total_pop=row[3],
+        avg_rent=row[4],
+        score=tuple(row[5:13]),
+        risk_flags=json.loads(row[13]),
+    )
@@ -0,0 +1,138 @@
+"""서울 전체 Top-K 입지 추천 — 전 격자 디스크 컨볼루션 + 비최대 억제(NMS).
+
+격자 중심 기준 반경 평균 점수를 radius_stats의 디스크 합계로 전 격자에 대해 한 번에
+계산하고 (격자마다 aggregate_grids를 호출한 것과 같은 값), 높은 순으로 고르되
+이미 고른 격자에서 min_distance 이내의 격자는 제외해 인접 격자가 몰리지 않게 한다.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+from sqlalchemy.engine import Connection
+
+from app.etl.grid_lattice import LATTICE_QUERY, Lattice
+from app.etl.logger import get_etl_logger
+from app.services.dataset_version import read_dataset_version
+from app.services.grid_engine import SCORE_COLUMNS
+from app.services.radius_stats import LatticeMetrics, disk_spans, disk_sum, load_lattice_metrics
+
+logger = get_etl_logger("recommender")
+
+# 값이 낮을수록 좋은 지표 (오름차순으로 순위를 매긴다)
+LOWER_IS_BETTER = {"competition_index"}
+
+# (업종, 반경, 지표)별 전 격자 컨볼루션 결과 캐시 크기
+SURFACE_CACHE_SIZE = 64
+
+
+class RecommendIndex:
+    """API 프로세스 내 격자 지표 배열 캐시. 첫 요청 또는 데이터 버전 변경 시 적재."""
+
+    def __init__(self):
+        self._metrics: LatticeMetrics | None = None
+        self._surfaces: OrderedDict = OrderedDict()
+        self._loaded = False
+        self._lock = threading.Lock()
+        self.version: int | None = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def invalidate(self) -> None:
+        self._loaded = False
+
+    def load(self, conn: Connection) -> None:
+        with self._lock:
+            start = time.perf_counter()
+            version = read_dataset_version(conn)
+            row = conn.execute(LATTICE_QUERY).fetchone()
+            metrics = None
+            if row:
+                metrics = load_lattice_metrics(conn, Lattice.from_row(row), with_risk_flags=False)
+            self._metrics, self._surfaces, self._loaded = metrics, OrderedDict(), True
+            self.version = version
+            logger.info("Recommend index loaded: %d industries (%.2fs)",
+                        len(metrics.industries()) if metrics else 0,
+                        time.perf_counter() - start)
+
+    def _surface(self, industry_code: str, radius: int, metric: str) -> tuple:
+        """전 격자의 (반경 평균 지표, 반경 점포수, 반경 격자수). 점수가 없는 격자는 NaN."""
+        key = (industry_code, radius, metric)
+        cached = self._surfaces.get(key)
+        if cached is not None:
+            self._surfaces.move_to_end(key)
+            return cached
+
+        m = self._metrics
+        shape = (m.lattice.n_rows, m.lattice.n_cols)
+        spans = disk_spans(m.lattice, radius)
+        values = np.full(shape, np.nan)
+        if industry_code in m.score_sum:
+            cnt = disk_sum(m.score_cnt[industry_code], spans)
+            total = disk_sum(m.score_sum[industry_code][SCORE_COLUMNS.index(metric)], spans)
+            np.divide(total, cnt, out=values, where=cnt > 0)
+        stores = disk_sum(m.store_sum.get(industry_code, np.zeros(shape)), spans)
+        grid_count = disk_sum(m.exists, spans)
+
+        surface = (values.ravel(), stores.ravel(), grid_count.ravel())
+        self._surfaces[key] = surface
+        if len(self._surfaces) > SURFACE_CACHE_SIZE:
+            self._surfaces.popitem(last=False)
+        return surface
+
+    def recommend(
+        self,
+        industry_code: str,
+        radius: int,
+        k: int,
+        metric: str = "health_score",
+        min_distance: int | None = None,
+    ) -> list[dict]:
+        """지표 상위 K개 격자 (선택된 격자 간 거리 > min_distance, 기본값 = 반경)."""
+        m = self._metrics
+        if m is None:
+            return []
+        values, stores, grid_count = self._surface(industry_code, radius, metric)
+
+        candidates = np.flatnonzero(~np.isnan(values))
+        keys = values[candidates] if metric in LOWER_IS_BETTER else -values[candidates]
+        order = candidates[np.argsort(keys, kind="stable")]
+
+        # 억제 반경 안의 (행, 열) 오프셋 — 선택 격자 중심 기준 disk_spans와 같은 판정
+        spans = disk_spans(m.lattice, radius if min_distance is None else min_distance)
+        off_r = np.concatenate([np.full(2 * h + 1, dr) for dr, h in spans])
+        off_c = np.concatenate([np.arange(-h, h + 1) for _, h in spans])
+
+        n_rows, n_cols = m.lattice.n_rows, m.lattice.n_cols
+        suppressed = np.zeros(len(values), dtype=bool)
+        picks = []
+        for idx in order:
+            if suppressed[idx]:
+                continue
+            picks.append(int(idx))
+            if len(picks) >= k:
+                break
+            r, c = divmod(int(idx), n_cols)
+            rr, cc = r + off_r, c + off_c
+            ok = (rr >= 0) & (rr < n_rows) & (cc >= 0) & (cc < n_cols)
+            suppressed[rr[ok] * n_cols + cc[ok]] = True
+
+        results = []
+        for rank, idx in enumerate(picks, start=1):
+            row, col = divmod(idx, n_cols)
+            lat, lng = m.lattice.cell_center(row, col)
+            results.append({
+                "rank": rank,
+                "grid_id": idx + 1,
+                "center_lat": round(lat, 7),
+                "center_lng": round(lng, 7),
+                "value": round(float(values[idx]), 3),
+                "store_count": int(round(stores[idx])),
+                "grid_count": int(round(grid_count[idx])),
+            })
+        return results
+
+
+recommend_index = RecommendIndex()
@@ -1,8 +1,26 @@
 """점수 계산 엔진 — 건강도, 경쟁지수, 생존확률 등 (벌크 SQL 최적화)."""
 import json
-from sqlalchemy import text
+import multiprocessing
+import os
+import time
+from collections.abc import Callable
+from concurrent.futures import FIRST_EXCEPTION, ProcessPoolExecutor, wait
+from sqlalchemy import create_engine, text
 from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+from app.config import get_settings
+from app.etl.bulk_copy import copy_columns
 from app.etl.logger import get_etl_logger
+from app.etl.memory import peak_rss_mb, reset_peak_rss
+from app.etl.partitions import ensure_quarter_partitions
+from app.services.dataset_version import publish_dataset_version
+from app.services.score_engine import (
+    RISK_FLAG_JSON,
+    WEIGHT_TOTAL,
+    WEIGHTS,
+    ScoreInputs,
+    compute_scores,
+)
 
 logger = get_etl_logger("score_calculator")
 
@@ -19,77 +37,710 @@ DEFAULT_CLOSURE_RATES = {
 
 DEFAULT_CLOSURE_RATE = 0.20
 
+# stats에 분기 정보가 없을 때 점수에 붙이는 기본 분기
+SNAPSHOT_QUARTER = "2024-Q3"
+
+SCORE_MODES = ("numpy", "sql")
+
+# 병렬 모드: 워커당 grid_id 범위 파티션 수 (파티션별 편차를 흡수하도록 워커 수보다 많게)
+PARTITIONS_PER_WORKER = 4
+
+# 서버 사이드 커서로 조인 결과를 읽을 때 한 번에 가져오는 행 수
+SCORE_CHUNK_ROWS = 50_000
+
+_MAX_GRID_ID = 2**31 - 1
+
+
+# 점수 계산 범위 조건 (scope_params). [grid_lo, grid_hi) 범위 안에서 full_scope이면 전체,
+# 아니면 변경된 격자(모든 업종)와 변경된 (grid_id, industry_code) 쌍만
+def _scope_sql(alias: str) -> str:
+    return f"""{alias}.grid_id >= :grid_lo AND {alias}.grid_id < :grid_hi AND (
+        CAST(:full_scope AS boolean)
+        OR {alias}.grid_id = ANY(CAST(:changed_grids AS integer[]))
+        OR ({alias}.grid_id, {alias}.industry_code) IN (
+            SELECT * FROM unnest(
+                CAST(:changed_pair_grids AS integer[]),
+                CAST(:changed_pair_industries AS varchar[])
+            )
+        )
+    )"""
+
+
+# :quarter 기준 매출/임대료 — 해당 분기 이전(포함)의 가장 최근 분기 값
+_SALES_AS_OF_SQL = """
+        SELECT DISTINCT ON (grid_id, industry_code)
+            grid_id, industry_code, quarterly_sales, avg_ticket_price
+        FROM grid_sales_stats
+        WHERE snapshot_quarter <= :quarter
+        ORDER BY grid_id, industry_code, snapshot_quarter DESC
+"""
+_RENT_AS_OF_SQL = """
+        SELECT DISTINCT ON (grid_id)
+            grid_id, rent_per_m2
+        FROM grid_rent_stats
+        WHERE snapshot_quarter <= :quarter
+        ORDER BY grid_id, snapshot_quarter DESC
+"""
+
+
+# store_stats에 존재하는 (grid_id, industry_code) 쌍에 대해 :quarter 기준 stats를 LEFT JOIN
+# (컬럼 순서는 _compute_score / ScoreInputs.from_rows의 행 인덱스, src_id = gs.id)
+_JOINED_ROWS_SQL = f"""
+    SELECT
+        gs.grid_id,
+        gs.industry_code,
+        gs.store_count,
+        COALESCE(gs.closure_rate, :default_closure) as closure_rate,
+        COALESCE(gf.total_floating, 0) as total_floating,
+        COALESCE(gp.total_population, 0) as total_population,
+        COALESCE(gp.age_20_39_ratio, 0.3) as age_20_39_ratio,
+        COALESCE(gsa.quarterly_sales, 0) as quarterly_sales,
+        COALESCE(gsa.avg_ticket_price, 0) as avg_ticket_price,
+        COALESCE(gr.rent_per_m2, 0) as rent_per_m2,
+        gs.id as src_id
+    FROM grid_store_stats gs
+    LEFT JOIN grid_floating_stats gf ON gf.grid_id = gs.grid_id
+    LEFT JOIN grid_population_stats gp ON gp.grid_id = gs.grid_id
+    LEFT JOIN ({_SALES_AS_OF_SQL}) gsa
+        ON gsa.grid_id = gs.grid_id AND gsa.industry_code = gs.industry_code
+    LEFT JOIN ({_RENT_AS_OF_SQL}) gr ON gr.grid_id = gs.grid_id
+    WHERE {_scope_sql("gs")}
+"""
+
+# grid_score 점수 컬럼 (id 제외, 적재/upsert 순서)
+_SCORE_TABLE_COLUMNS = (
+    "grid_id", "industry_code", "health_score", "competition_index",
+    "survival_probability", "sales_estimate_low", "sales_estimate_high",
+    "population_score", "floating_score", "rent_score",
+    "risk_flags", "snapshot_quarter",
+)
+_UPSERT_KEY = ("grid_id", "industry_code", "snapshot_quarter")
+
+# 이번 실행에서 계산한 점수를 담는 트랜잭션 임시 테이블 → grid_score로 upsert
+_STAGING_TABLE = "grid_score_staging"
+
+
+def scope_params(
+    changes: list | None = None,
+    grid_range: tuple[int, int] | None = None,
+    quarter: str = SNAPSHOT_QUARTER,
+) -> dict:
+    """점수 계산 범위 바인드 파라미터 (_scope_sql + 조인의 :quarter).
+
+    changes는 score_change_set의 (grid_id, industry_code) 목록, None이면 전체 범위
+    (industry_code가 None인 항목은 해당 격자의 모든 업종).
+    grid_range는 병렬 모드 파티션의 [grid_lo, grid_hi), quarter는 계산할 점수 분기.
+    """
+    changes = changes or []
+    pairs = [(grid_id, ic) for grid_id, ic in changes if ic is not None]
+    grid_lo, grid_hi = grid_range or (0, _MAX_GRID_ID)
+    return {
+        "quarter": quarter,
+        "grid_lo": grid_lo,
+        "grid_hi": grid_hi,
+        "full_scope": not changes,
+        "changed_grids": sorted({grid_id for grid_id, ic in changes if ic is None}),
+        "changed_pair_grids": [grid_id for grid_id, _ in pairs],
+        "changed_pair_industries": [ic for _, ic in pairs],
+    }
 
-def compute_all_scores(session: Session) -> int:
-    """벌크 SQL로 모든 Grid x 업종 점수를 계산한다.
+
+def compute_all_scores(
+    session: Session,
+    mode: str | None = None,
+    full: bool = False,
+    workers: int | None = None,
+    distributed: bool | None = None,
+    quarter: str | None = None,
+    publish_version: bool = True,
+) -> int:
+    """벌크 SQL로 Grid x 업종 점수를 계산해 grid_score에 upsert한다.
 
     기존: 56,000 grids x N industries = 수십만 개별 쿼리
     개선: store_stats에 존재하는 (grid_id, industry_code) 쌍만 대상으로
-          단일 쿼리에서 모든 stats를 JOIN → Python에서 점수 계산 → 벌크 INSERT
-    """
-    session.execute(text("DELETE FROM grid_score"))
+          단일 쿼리에서 모든 stats를 JOIN → NumPy 컬럼 연산으로 점수 계산 → COPY 적재
 
-    # 1) 서울 전체 평균값 (단일 쿼리)
-    seoul_avg = _compute_seoul_averages(session)
-    logger.info("Seoul averages: %s", seoul_avg)
+    증분 계산 (SCORE_INCREMENTAL): 수집기가 score_change_set에 기록한 쌍만 다시 계산하고
+    직전 실행의 기준 서울 평균을 그대로 쓴다. 현재 서울 평균이 기준 대비
+    SCORE_AVG_TOLERANCE(상대 오차)를 넘게 움직였거나 full=True면 전체를 다시 계산한다.
+    어느 쪽이든 grid_score를 비우지 않고 upsert + 범위 내 사라진 쌍만 삭제한다.
 
-    # 2) store_stats에 존재하는 (grid_id, industry_code) 쌍에 대해
-    #    모든 stats를 LEFT JOIN한 결과를 한 번에 가져옴
-    rows = session.execute(text("""
+    mode (기본값 SCORE_MODE):
+        numpy — 조인 결과를 가져와 score_engine으로 계산 후 COPY
+        sql   — INSERT ... SELECT 한 문장으로 DB 안에서 계산
+
+    workers (기본값 SCORE_WORKERS)가 2 이상이면 grid_id 범위 파티션을 워커 프로세스들이
+    각자의 커넥션으로 계산해 공유 staging 테이블에 적재하고, 모두 성공했을 때만
+    이 세션의 트랜잭션에서 grid_score에 반영한다.
+    distributed (기본값 SCORE_QUEUE_ENABLED)면 구간들을 score_work_queue에 넣고
+    여러 노드의 scripts/score_worker.py와 함께 처리한다 (score_queue 참고).
+
+    quarter (기본값: stats의 최신 분기)의 점수만 계산/교체하며 다른 분기 점수는 그대로 둔다.
+    매출/임대료는 그 분기 이전(포함)의 최신 값, 서울 평균도 그 분기 기준이다.
+    증분 계산과 변경분(score_change_set) 소비는 최신 분기에만 적용된다.
+
+    publish_version이면 점수가 바뀌었을 때 같은 트랜잭션에서 새 데이터 버전을 게시한다.
+    섀도 스키마에 쓰는 run_etl은 False로 호출한다 (버전은 publish_snapshot이 교체와 함께 올림).
+    """
+    settings = get_settings()
+    mode = mode or settings.SCORE_MODE
+    if mode not in SCORE_MODES:
+        raise ValueError(f"Unknown score mode: {mode} (expected one of {SCORE_MODES})")
+    workers = workers or settings.SCORE_WORKERS
+    distributed = settings.SCORE_QUEUE_ENABLED if distributed is None else distributed
+    reset_peak_rss()
+
+    latest = latest_stats_quarter(session)
+    quarter = quarter or latest
+    is_latest = quarter == latest
+    # 분기 파티션은 계산 전에 만들어 두고 바로 commit (ATTACH 락을 계산 내내 잡지 않도록)
+    if ensure_quarter_partitions(session, "grid_score", [quarter]):
+        session.commit()
+
+    # 1) 서울 전체 평균값 (분기 기준, 단일 쿼리) / 직전 실행의 기준 평균
+    seoul_avg = _compute_seoul_averages(session, quarter)
+    logger.info("Seoul averages (%s): %s", quarter, seoul_avg)
+    last_change_id = session.execute(text(
+        "SELECT COALESCE(MAX(id), 0) FROM score_change_set"
+    )).scalar() if is_latest else 0
+
+    if full or not settings.SCORE_INCREMENTAL:
+        reason = "requested"
+    elif not is_latest:
+        reason = f"backfill of {quarter} (latest {latest})"
+    else:
+        reason = None
+    reference = None if reason else _reference_averages(session, quarter)
+    if not reason and reference is None:
+        reason = "no previous score run"
+    if not reason:
+        drift = _average_drift(reference, seoul_avg)
+        if drift > settings.SCORE_AVG_TOLERANCE:
+            reason = f"Seoul averages moved {drift:.2%} (> {settings.SCORE_AVG_TOLERANCE:.2%})"
+
+    if reason:
+        logger.info("Full rescoring: %s", reason)
+        run_mode, changes, avg = "full", None, seoul_avg
+    else:
+        changes = session.execute(text("""
+            SELECT DISTINCT grid_id, industry_code FROM score_change_set WHERE id <= :last_id
+        """), {"last_id": last_change_id}).fetchall()
+        if not changes:
+            logger.info("No changed (grid, industry) pairs since last score run")
+            return 0
+        logger.info("Incremental rescoring: %d changed keys (averages within %.2f%%)",
+                    len(changes), drift * 100)
+        run_mode, avg = "incremental", reference
+    scope = scope_params(changes, quarter=quarter)
+
+    # 2) 점수 계산 → staging (단일 프로세스: 트랜잭션 임시 테이블 / 병렬: 공유 UNLOGGED 테이블)
+    if distributed or workers > 1:
+        staging = f"{_STAGING_TABLE}_p{os.getpid()}"
+        try:
+            if distributed:
+                from app.services.score_queue import score_distributed
+                count = score_distributed(session, mode, avg, scope, staging)
+            else:
+                count = _compute_scores_parallel(session, mode, avg, scope, staging, workers)
+            if not count and run_mode == "full":
+                logger.warning("No store_stats rows found, nothing to score")
+                return 0
+            count = _finalize_scores(
+                session, staging, scope, run_mode, changes, avg, count, last_change_id,
+                publish_version,
+            )
+        finally:
+            session.rollback()
+            session.execute(text(f"DROP TABLE IF EXISTS {staging}"))
+            session.commit()
+        logger.info("Computed %d grid scores (mode=%s, %s, %s), peak RSS %.0f MB", count, mode,
+                    run_mode, "work queue" if distributed else f"{workers} workers", peak_rss_mb())
+        return count
+
+    session.execute(text(f"""
+        CREATE TEMP TABLE {_STAGING_TABLE} ON COMMIT DROP AS
+        SELECT {", ".join(_SCORE_TABLE_COLUMNS)} FROM grid_score WITH NO DATA
+    """))
+    if mode == "sql":
+        count = _compute_scores_sql(session, avg, scope)
+    else:
+        count = _compute_scores_numpy(session, avg, scope)
+    if not count and run_mode == "full":
+        logger.warning("No store_stats rows found, nothing to score")
+        return 0
+
+    count = _finalize_scores(
+        session, _STAGING_TABLE, scope, run_mode, changes, avg, count, last_change_id,
+        publish_version,
+    )
+    logger.info("Computed %d grid scores (mode=%s, %s), peak RSS %.0f MB",
+                count, mode, run_mode, peak_rss_mb())
+    return count
+
+
+def backfill_scores(
+    session: Session,
+    quarters: list[str] | None = None,
+    workers: int | None = None,
+    mode: str | None = None,
+) -> dict[str, int]:
+    """여러 분기의 점수를 분기별 서울 평균으로 계산해 grid_score에 모두 보관한다.
+
+    quarters 기본값은 grid_sales_stats/grid_rent_stats에 있는 모든 분기. 분기 하나를
+    워커 프로세스 하나가 compute_all_scores(full=True, quarter=...)로 처리한다 (각자 자기
+    커넥션/임시 staging, upsert 키에 분기가 포함돼 서로 겹치지 않음). → {분기: 점수 행 수}
+    """
+    settings = get_settings()
+    quarters = sorted(quarters or available_quarters(session))
+    if not quarters:
+        logger.warning("No quarters found in grid_sales_stats/grid_rent_stats, nothing to backfill")
+        return {}
+    workers = max(1, min(workers or settings.SCORE_WORKERS, len(quarters)))
+    ensure_quarter_partitions(session, "grid_score", quarters)
+
+    base_task = {
+        "url": session.get_bind().url.render_as_string(hide_password=False),
+        "search_path": session.execute(text("SHOW search_path")).scalar(),
+        "mode": mode,
+    }
+    session.commit()
+    logger.info("Backfilling %d quarters (%s ~ %s) with %d workers",
+                len(quarters), quarters[0], quarters[-1], workers)
+
+    start = time.perf_counter()
+    results = {}
+    executor = ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+    )
+    try:
+        pending = {
+            executor.submit(_backfill_quarter, {**base_task, "quarter": q}): q for q in quarters
+        }
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_EXCEPTION)
+            for future in done:
+                quarter = pending.pop(future)
+                results[quarter], elapsed = future.result()
+                logger.info("Quarter %s: %d scores in %.1fs (%d/%d)",
+                            quarter, results[quarter], elapsed, len(results), len(quarters))
+    except BaseException:
+        executor.shutdown(wait=True, cancel_futures=True)
+        raise
+    executor.shutdown(wait=True)
+
+    logger.info("Backfilled %d quarters, %s scores in %.1fs",
+                len(results), f"{sum(results.values()):,}", time.perf_counter() - start)
+    return dict(sorted(results.items()))
+
+
+def _backfill_quarter(task: dict) -> tuple[int, float]:
+    """워커 프로세스: 분기 하나를 전체 계산한다. → (점수 행 수, 소요 시간)"""
+    start = time.perf_counter()
+    engine = create_engine(
+        task["url"], poolclass=NullPool,
+        connect_args={"options": f"-csearch_path={task['search_path'].replace(' ', '')}"},
+    )
+    try:
+        with Session(engine) as session:
+            count = compute_all_scores(
+                session, mode=task["mode"], full=True, workers=1, distributed=False,
+                quarter=task["quarter"],
+            )
+    finally:
+        engine.dispose()
+    return count, time.perf_counter() - start
+
+
+def _finalize_scores(
+    session: Session,
+    staging: str,
+    scope: dict,
+    run_mode: str,
+    changes: list | None,
+    avg: dict,
+    count: int,
+    last_change_id: int,
+    publish_version: bool,
+) -> int:
+    """staging → grid_score 반영, 변경분 정리, 실행 기록, 데이터 버전 게시 (한 트랜잭션)."""
+    # 3) upsert + 범위 내 사라진 쌍 삭제, 소비한 변경분 정리
+    upserted, deleted = _merge_staging(session, scope, staging)
+    session.execute(text("DELETE FROM score_change_set WHERE id <= :last_id"),
+                    {"last_id": last_change_id})
+    session.execute(text("""
+        INSERT INTO score_run
+            (mode, snapshot_quarter, avg_stores, avg_floating, avg_population, avg_sales,
+             avg_rent, changed_pairs, scored_count)
+        VALUES (:mode, :quarter, :avg_stores, :avg_floating, :avg_population, :avg_sales,
+                :avg_rent, :changed_pairs, :scored_count)
+    """), {
+        "mode": run_mode,
+        "quarter": scope["quarter"],
+        "changed_pairs": len(changes or ()),
+        "scored_count": count,
+        **avg,
+    })
+
+    # 점수 테이블과 같은 트랜잭션으로 새 데이터 버전 게시 → API 결과 캐시 무효화
+    # (섀도 스키마에 쓰는 중이면 게시 전 public 기준으로 캐시/인덱스를 다시 읽게 되므로 건너뜀)
+    if publish_version and (upserted or deleted):
+        publish_dataset_version(session, "compute_all_scores")
+    session.commit()
+    logger.info("Merged %d scored rows for %s: %d upserted, %d deleted",
+                count, scope["quarter"], upserted, deleted)
+    return count
+
+
+def _reference_averages(session: Session, quarter: str) -> dict | None:
+    """그 분기의 직전 점수 계산에 쓰인 서울 평균 (점수가 없으면 None → 전체 계산)."""
+    if not session.execute(text(
+        "SELECT EXISTS (SELECT 1 FROM grid_score WHERE snapshot_quarter = :quarter)"
+    ), {"quarter": quarter}).scalar():
+        return None
+    row = session.execute(text("""
+        SELECT avg_stores, avg_floating, avg_population, avg_sales, avg_rent
+        FROM score_run
+        WHERE snapshot_quarter = :quarter
+        ORDER BY id DESC
+        LIMIT 1
+    """), {"quarter": quarter}).mappings().first()
+    return dict(row) if row else None
+
+
+def _average_drift(reference: dict, current: dict) -> float:
+    """기준 평균 대비 현재 평균의 최대 상대 변화율."""
+    return max(
+        abs(current[key] - reference[key]) / max(abs(reference[key]), 1e-9)
+        for key in current
+    )
+
+
+def _compute_scores_numpy(
+    session: Session,
+    seoul_avg: dict,
+    scope: dict,
+    table: str = _STAGING_TABLE,
+    on_chunk: Callable[[], None] | None = None,
+) -> int:
+    """조인 결과를 컬럼 배열로 계산 (_compute_score와 동일한 결과) 후 COPY.
+
+    조인은 서버 사이드(named) 커서로 SCORE_CHUNK_ROWS 행씩 읽고, 청크마다 계산 → COPY하므로
+    메모리 사용량은 전체 행 수와 무관하게 청크 크기에 비례한다.
+    (같은 커넥션에서 커서가 열린 채 COPY를 섞을 수 없어 청크마다 COPY 한 번)
+    on_chunk는 청크마다 호출된다 (예외를 올려 계산을 중단할 수 있음).
+    """
+    result = session.execute(
+        text(_JOINED_ROWS_SQL),
+        {"default_closure": DEFAULT_CLOSURE_RATE, **scope},
+        execution_options={"stream_results": True},
+    )
+    count = 0
+    for rows in result.partitions(SCORE_CHUNK_ROWS):
+        scores = compute_scores(ScoreInputs.from_rows(rows, DEFAULT_CLOSURE_RATE), seoul_avg)
+        scores["snapshot_quarter"] = [scope["quarter"]] * len(rows)
+        count += copy_columns(session, table, scores)
+        del rows, scores
+        if on_chunk is not None:
+            on_chunk()
+    return count
+
+
+def _compute_scores_sql(
+    session: Session, seoul_avg: dict, scope: dict, table: str = _STAGING_TABLE,
+) -> int:
+    """INSERT ... SELECT 한 문장으로 DB 안에서 점수를 계산한다 (조인 결과 전송 없음)."""
+    result = session.execute(text(f"""
+        INSERT INTO {table}
+            ({", ".join(_SCORE_TABLE_COLUMNS)})
+        SELECT grid_id, industry_code, health_score, competition_index,
+               survival_probability, sales_estimate_low, sales_estimate_high,
+               population_score, floating_score, rent_score,
+               risk_flags, :quarter
+        FROM ({SCORE_SELECT_SQL}) scored
+    """), score_sql_params(seoul_avg, scope))
+    return result.rowcount
+
+
+def partition_ranges(session: Session, scope: dict, parts: int) -> list[tuple[int, int]]:
+    """범위 내 store_stats 행 수가 고르게 나뉘는 grid_id 구간 [lo, hi) 목록 (분위수 경계)."""
+    bounds, max_id = session.execute(text(f"""
         SELECT
-            gs.grid_id,
-            gs.industry_code,
-            gs.store_count,
-            COALESCE(gs.closure_rate, :default_closure) as closure_rate,
-            COALESCE(gf.total_floating, 0) as total_floating,
-            COALESCE(gp.total_population, 0) as total_population,
-            COALESCE(gp.age_20_39_ratio, 0.3) as age_20_39_ratio,
-            COALESCE(gsa.quarterly_sales, 0) as quarterly_sales,
-            COALESCE(gsa.avg_ticket_price, 0) as avg_ticket_price,
-            COALESCE(gr.rent_per_m2, 0) as rent_per_m2
+            percentile_disc(CAST(:fractions AS float8[])) WITHIN GROUP (ORDER BY gs.grid_id),
+            MAX(gs.grid_id)
         FROM grid_store_stats gs
-        LEFT JOIN grid_floating_stats gf ON gf.grid_id = gs.grid_id
-        LEFT JOIN grid_population_stats gp ON gp.grid_id = gs.grid_id
-        LEFT JOIN (
-            SELECT DISTINCT ON (grid_id, industry_code)
-                grid_id, industry_code, quarterly_sales, avg_ticket_price
-            FROM grid_sales_stats
-            ORDER BY grid_id, industry_code, snapshot_quarter DESC
-        ) gsa ON gsa.grid_id = gs.grid_id AND gsa.industry_code = gs.industry_code
-        LEFT JOIN (
-            SELECT DISTINCT ON (grid_id)
-                grid_id, rent_per_m2
-            FROM grid_rent_stats
-            ORDER BY grid_id, snapshot_quarter DESC
-        ) gr ON gr.grid_id = gs.grid_id
-    """), {"default_closure": DEFAULT_CLOSURE_RATE}).fetchall()
-
-    if not rows:
-        logger.warning("No store_stats rows found, nothing to score")
+        WHERE {_scope_sql("gs")}
+    """), {**scope, "fractions": [i / parts for i in range(parts)]}).one()
+    if max_id is None:
+        return []
+    edges = sorted(set(bounds)) + [max_id + 1]
+    return list(zip(edges[:-1], edges[1:]))
+
+
+def create_shared_staging(session: Session, staging: str) -> None:
+    """다른 커넥션(워커)도 적재할 수 있는 staging 테이블을 만들고 commit한다."""
+    session.execute(text(f"""
+        CREATE UNLOGGED TABLE {staging} AS
+        SELECT {", ".join(_SCORE_TABLE_COLUMNS)} FROM grid_score WITH NO DATA
+    """))
+    session.commit()
+
+
+def score_partition(session: Session, task: dict, on_chunk: Callable[[], None] | None = None) -> int:
+    """grid_id 구간 하나(task)를 계산해 task["staging"]에 적재한다. commit은 호출 측.
+
+    task: mode, seoul_avg, scope(grid_lo/grid_hi 포함), staging, search_path.
+    on_chunk: numpy 모드에서 청크마다 호출 (sql 모드는 한 문장이라 호출되지 않음).
+    """
+    session.execute(text(f"SET search_path TO {task['search_path']}"))
+    if task["mode"] == "sql":
+        return _compute_scores_sql(session, task["seoul_avg"], task["scope"], task["staging"])
+    return _compute_scores_numpy(
+        session, task["seoul_avg"], task["scope"], task["staging"], on_chunk=on_chunk,
+    )
+
+
+def _score_partition(task: dict) -> tuple[int, float, float]:
+    """워커 프로세스: 자기 커넥션으로 grid_id 구간을 계산해 staging에 적재/commit.
+    → (적재 행 수, 소요 시간, 최대 RSS MB)"""
+    start = time.perf_counter()
+    reset_peak_rss()
+    engine = create_engine(task["url"], poolclass=NullPool)
+    try:
+        with Session(engine) as session:
+            count = score_partition(session, task)
+            session.commit()
+    finally:
+        engine.dispose()
+    return count, time.perf_counter() - start, peak_rss_mb()
+
+
+def _compute_scores_parallel(
+    session: Session,
+    mode: str,
+    seoul_avg: dict,
+    scope: dict,
+    staging: str,
+    workers: int,
+) -> int:
+    """grid_id 구간별로 워커 프로세스에서 계산해 staging 테이블에 모은다.
+
+    서울 평균/범위는 조정자가 한 번 계산해 모든 워커에 전달한다. 한 파티션이라도 실패하면
+    남은 작업을 취소하고 예외를 그대로 올린다 (staging은 호출 측에서 삭제, grid_score 불변).
+    """
+    ranges = partition_ranges(session, scope, workers * PARTITIONS_PER_WORKER)
+    search_path = session.execute(text("SHOW search_path")).scalar()
+    create_shared_staging(session, staging)
+    if not ranges:
         return 0
 
-    logger.info("Computing scores for %d (grid, industry) pairs", len(rows))
+    base_task = {
+        "url": session.get_bind().url.render_as_string(hide_password=False),
+        "search_path": search_path,
+        "mode": mode,
+        "seoul_avg": seoul_avg,
+        "staging": staging,
+    }
+    logger.info("Scoring %d grid ranges with %d workers", len(ranges), workers)
+
+    start = time.perf_counter()
+    count = 0
+    executor = ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+    )
+    try:
+        pending = {}
+        for lo, hi in ranges:
+            task = {**base_task, "scope": {**scope, "grid_lo": lo, "grid_hi": hi}}
+            pending[executor.submit(_score_partition, task)] = (lo, hi)
+        done_parts = 0
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_EXCEPTION)
+            for future in done:
+                lo, hi = pending.pop(future)
+                rows, elapsed, peak_mb = future.result()
+                count += rows
+                done_parts += 1
+                logger.info(
+                    "Partition grid_id [%d, %d): %d rows in %.1fs, peak RSS %.0f MB (%d/%d, %s rows total)",
+                    lo, hi, rows, elapsed, peak_mb, done_parts, len(ranges), f"{count:,}",
+                )
+    except BaseException:
+        executor.shutdown(wait=True, cancel_futures=True)
+        raise
+    executor.shutdown(wait=True)
+
+    elapsed = time.perf_counter() - start
+    logger.info("Parallel scoring: %s rows in %.1fs (%s rows/s)",
+                f"{count:,}", elapsed, f"{count / max(elapsed, 1e-9):,.0f}")
+    return count
+
+
+def _merge_staging(session: Session, scope: dict, staging: str = _STAGING_TABLE) -> tuple[int, int]:
+    """임시 테이블 → grid_score upsert (값이 같은 행은 갱신하지 않음) 후
+    범위 안에서 더 이상 계산되지 않는 쌍을 삭제한다. (upsert 행 수, 삭제 행 수)"""
+    columns = ", ".join(_SCORE_TABLE_COLUMNS)
+    key = ", ".join(_UPSERT_KEY)
+    values = [c for c in _SCORE_TABLE_COLUMNS if c not in _UPSERT_KEY]
+    upserted = session.execute(text(f"""
+        INSERT INTO grid_score ({columns})
+        SELECT DISTINCT ON ({key}) {columns}
+        FROM {staging}
+        ORDER BY {key}
+        ON CONFLICT ({key}) DO UPDATE SET
+            {", ".join(f"{c} = EXCLUDED.{c}" for c in values)}
+        WHERE ({", ".join(f"grid_score.{c}" for c in values)})
+            IS DISTINCT FROM ({", ".join(f"EXCLUDED.{c}" for c in values)})
+    """)).rowcount
+    deleted = session.execute(text(f"""
+        DELETE FROM grid_score sc
+        WHERE sc.snapshot_quarter = :quarter
+          AND {_scope_sql("sc")}
+          AND NOT EXISTS (
+              SELECT 1 FROM {staging} st
+              WHERE st.grid_id = sc.grid_id
+                AND st.industry_code = sc.industry_code
+                AND st.snapshot_quarter = sc.snapshot_quarter
+          )
+    """), scope).rowcount
+    return upserted, deleted
+
+
+def _z_sql(value: str, avg: str, higher_is_better: bool = True) -> str:
+    """_compute_score의 z_to_score와 같은 연산 순서의 SQL 식."""
+    score = f"(50 + ({value} - {avg}) / GREATEST({avg} * 0.5, 1) * 20)"
+    if not higher_is_better:
+        score = f"(100 - {score})"
+    return f"CASE WHEN {avg} = 0 THEN 50 ELSE GREATEST(0, LEAST(100, {score})) END"
+
+
+def _round_sql(expr: str, ndigits: int) -> str:
+    return f"round(({expr})::numeric, {ndigits})::float8"
+
+
+# 점수 계산 SELECT (src_id, grid_id, industry_code, 점수 컬럼..., risk_flags).
+# 수식/연산 순서는 _compute_score와 같다. 반올림만 numeric round(half away from zero)라
+# .5 경계에서 마지막 자리가 다를 수 있다 (scripts/verify_scores.py로 확인).
+SCORE_SELECT_SQL = f"""
+    WITH base AS ({_JOINED_ROWS_SQL}),
+    seoul AS (
+        SELECT
+            CAST(:avg_stores AS float8) AS avg_stores,
+            CAST(:avg_floating AS float8) AS avg_floating,
+            CAST(:avg_population AS float8) AS avg_population,
+            CAST(:avg_sales AS float8) AS avg_sales,
+            CAST(:avg_rent AS float8) AS avg_rent
+    ),
+    inputs AS (
+        SELECT
+            seoul.*,
+            src_id, grid_id, industry_code,
+            COALESCE(store_count, 0)::float8 AS store_count,
+            COALESCE(NULLIF(closure_rate, 0), :default_closure)::float8 AS closure_rate,
+            total_floating::float8 AS total_floating,
+            total_population::float8 AS total_population,
+            quarterly_sales::float8 AS quarterly_sales,
+            rent_per_m2::float8 AS rent_per_m2
+        FROM base CROSS JOIN seoul
+    ),
+    competition AS (
+        SELECT i.*,
+            CASE WHEN avg_stores <> 0 THEN store_count / avg_stores ELSE 0 END
+                AS competition_index
+        FROM inputs i
+    ),
+    components AS (
+        SELECT c.*,
+            GREATEST(0.1, LEAST(0.95,
+                1 - closure_rate
+                + CASE WHEN total_floating > avg_floating THEN 0.05 ELSE -0.03 END
+                + CASE WHEN total_population > avg_population THEN 0.03 ELSE -0.02 END
+                + CASE WHEN competition_index > 1.5 THEN -0.08
+                       WHEN competition_index < 0.5 THEN 0.03 ELSE 0 END
+            )) AS survival_probability,
+            {_z_sql("total_floating", "avg_floating")} AS floating_score,
+            {_z_sql("total_population", "avg_population")} AS population_score,
+            {_z_sql("rent_per_m2", "avg_rent", higher_is_better=False)} AS rent_score,
+            {_z_sql("quarterly_sales", "avg_sales")} AS sales_score,
+            CASE WHEN quarterly_sales <> 0 THEN quarterly_sales / 3 ELSE 0 END AS monthly_sales
+        FROM competition c
+    ),
+    health AS (
+        SELECT p.*,
+            GREATEST(0, LEAST(100, (
+                (100 - LEAST(competition_index * 50, 100)) * :w_competition
+                + survival_probability * 100 * :w_survival
+                + floating_score * :w_floating
+                + population_score * :w_population
+                + sales_score * :w_sales
+                + rent_score * :w_rent
+            ) / :w_total)) AS health_score
+        FROM components p
+    )
+    SELECT
+        src_id,
+        grid_id,
+        industry_code,
+        {_round_sql("health_score", 1)} AS health_score,
+        {_round_sql("competition_index", 3)} AS competition_index,
+        {_round_sql("survival_probability", 3)} AS survival_probability,
+        {_round_sql("monthly_sales * 0.7 / 10000", 0)} AS sales_estimate_low,
+        {_round_sql("monthly_sales * 1.3 / 10000", 0)} AS sales_estimate_high,
+        {_round_sql("population_score", 1)} AS population_score,
+        {_round_sql("floating_score", 1)} AS floating_score,
+        {_round_sql("rent_score", 1)} AS rent_score,
+        '[' || concat_ws(', ',
+            CASE WHEN competition_index > 2.0 THEN :risk_competition_danger
+                 WHEN competition_index > 1.5 THEN :risk_competition_warning END,
+            CASE WHEN rent_per_m2 > avg_rent * 1.5 THEN :risk_high_rent END,
+            CASE WHEN total_floating < avg_floating * 0.5 THEN :risk_low_floating END,
+            CASE WHEN closure_rate > 0.25 THEN :risk_high_closure END
+        ) || ']' AS risk_flags
+    FROM health
+"""
+
+
+def score_sql_params(seoul_avg: dict, scope: dict | None = None) -> dict:
+    """SCORE_SELECT_SQL 바인드 파라미터 (가중치/리스크 JSON은 score_engine과 같은 값).
+    scope는 scope_params() 결과 (기본값 전체 범위)."""
+    params = {
+        "default_closure": DEFAULT_CLOSURE_RATE,
+        "w_competition": abs(WEIGHTS["competition"]),
+        "w_survival": WEIGHTS["survival"],
+        "w_floating": WEIGHTS["floating"],
+        "w_population": WEIGHTS["population"],
+        "w_sales": WEIGHTS["sales"],
+        "w_rent": abs(WEIGHTS["rent"]),
+        "w_total": WEIGHT_TOTAL,
+        **seoul_avg,
+        **(scope or scope_params()),
+    }
+    for name, flag in RISK_FLAG_JSON.items():
+        params[f"risk_{name}"] = flag
+    return params
 
-    # 3) Python에서 점수 계산 후 벌크 INSERT
-    batch = []
-    for row in rows:
-        score = _compute_score(row, seoul_avg)
-        batch.append(score)
 
-        if len(batch) >= 1000:
-            _insert_batch(session, batch)
-            batch.clear()
+def available_quarters(session: Session) -> list[str]:
+    """매출/임대료 통계에 있는 분기 목록 (오름차순)."""
+    return list(session.execute(text("""
+        SELECT snapshot_quarter FROM grid_sales_stats
+        UNION
+        SELECT snapshot_quarter FROM grid_rent_stats
+        ORDER BY 1
+    """)).scalars())
 
-    if batch:
-        _insert_batch(session, batch)
 
-    session.commit()
-    logger.info("Computed %d grid scores", len(rows))
-    return len(rows)
+def latest_stats_quarter(session: Session) -> str:
+    """매출/임대료 통계의 최신 분기 (통계가 없으면 SNAPSHOT_QUARTER)."""
+    return session.execute(text("""
+        SELECT GREATEST(
+            (SELECT MAX(snapshot_quarter) FROM grid_sales_stats),
+            (SELECT MAX(snapshot_quarter) FROM grid_rent_stats)
+        )
+    """)).scalar() or SNAPSHOT_QUARTER
 
 
-def _compute_seoul_averages(session: Session) -> dict:
-    """서울 전체 평균 통계 — 단일 쿼리들."""
+def _compute_seoul_averages(session: Session, quarter: str = SNAPSHOT_QUARTER) -> dict:
+    """서울 전체 평균 통계 — 단일 쿼리들. 매출/임대료는 조인과 같은 quarter 기준 값의 평균."""
     avg_stores = session.execute(text(
         "SELECT AVG(store_count) FROM grid_store_stats"
     )).scalar() or 1.0
@@ -103,12 +754,12 @@ def _compute_seoul_averages(session: Session) -> dict:
     )).scalar() or 1.0
 
     avg_sales = session.execute(text(
-        "SELECT AVG(quarterly_sales) FROM grid_sales_stats"
-    )).scalar() or 1.0
+        f"SELECT AVG(quarterly_sales) FROM ({_SALES_AS_OF_SQL}) s"
+    ), {"quarter": quarter}).scalar() or 1.0
 
     avg_rent = session.execute(text(
-        "SELECT AVG(rent_per_m2) FROM grid_rent_stats"
-    )).scalar() or 1.0
+        f"SELECT AVG(rent_per_m2) FROM ({_RENT_AS_OF_SQL}) r"
+    ), {"quarter": quarter}).scalar() or 1.0
 
     return {
         "avg_stores": float(avg_stores),
@@ -119,8 +770,8 @@ def _compute_seoul_averages(session: Session) -> dict:
     }
 
 
-def _compute_score(row, seoul_avg: dict) -> dict:
-    """단일 행에 대한 점수 계산."""
+def _compute_score(row, seoul_avg: dict, quarter: str = SNAPSHOT_QUARTER) -> dict:
+    """단일 행에 대한 점수 계산 (참조 구현 — score_engine.compute_scores와 결과 동일)."""
     grid_id = row[0]
     industry_code = row[1]
     store_count = row[2] or 0
@@ -204,19 +855,5 @@ def _compute_score(row, seoul_avg: dict) -> dict:
         "fs": round(floating_score, 1),
         "rs": round(rent_score, 1),
         "rf": json.dumps(risks, ensure_ascii=False),
-        "q": "2024-Q3",
+        "q": quarter,
     }
-
-
-def _insert_batch(session: Session, batch: list[dict]):
-    """점수 배치 INSERT."""
-    for score in batch:
-        session.execute(text("""
-            INSERT INTO grid_score
-                (grid_id, industry_code, health_score, competition_index,
-                 survival_probability, sales_estimate_low, sales_estimate_high,
-                 population_score, floating_score, rent_score,
-                 risk_flags, snapshot_quarter)
-            VALUES
-                (:gid, :ic, :hs, :ci, :sp, :sl, :sh, :ps, :fs, :rs, :rf, :q)
-        """), score)
@@ -0,0 +1,189 @@
+"""컬럼형(NumPy) 점수 계산 엔진 — compute_all_scores의 전체 행을 한 번에 계산.
+
+score_calculator._compute_score(행 단위 참조 구현)와 같은 수식을 같은 연산 순서로
+배열에 적용하므로 결과가 비트 단위로 동일하다. 반올림은 Python round()와 같도록
+np.round 후 .5 경계 근처 원소만 round()로 다시 계산한다.
+"""
+import json
+from dataclasses import dataclass
+
+import numpy as np
+
+# score_calculator._compute_score의 Health Score 가중치 (같은 순서/같은 합계 계산)
+WEIGHTS = {
+    "competition": -0.25,
+    "survival": 0.20,
+    "floating": 0.20,
+    "population": 0.15,
+    "sales": 0.15,
+    "rent": -0.05,
+}
+WEIGHT_TOTAL = sum(abs(v) for v in WEIGHTS.values())
+
+# 리스크 플래그 (비트 순서 = _compute_score의 append 순서)
+RISK_COMPETITION_DANGER = 1
+RISK_COMPETITION_WARNING = 2
+RISK_HIGH_RENT = 4
+RISK_LOW_FLOATING = 8
+RISK_HIGH_CLOSURE = 16
+
+_RISK_FLAGS = (
+    ("competition_danger", RISK_COMPETITION_DANGER,
+     {"level": "danger", "message": "과밀 상권: 동일 업종 경쟁이 매우 치열합니다"}),
+    ("competition_warning", RISK_COMPETITION_WARNING,
+     {"level": "warning", "message": "경쟁 주의: 동일 업종 점포가 평균보다 많습니다"}),
+    ("high_rent", RISK_HIGH_RENT,
+     {"level": "warning", "message": "높은 임대료: 서울 평균 대비 1.5배 이상입니다"}),
+    ("low_floating", RISK_LOW_FLOATING,
+     {"level": "warning", "message": "낮은 유동인구: 서울 평균의 50% 미만입니다"}),
+    ("high_closure", RISK_HIGH_CLOSURE,
+     {"level": "danger", "message": "높은 폐업률: 해당 업종 폐업률이 25%를 초과합니다"}),
+)
+
+# 플래그별 JSON 객체 문자열 (SQL 모드에서 json.dumps와 같은 배열 문자열을 조립할 때 사용)
+RISK_FLAG_JSON = {
+    name: json.dumps(flag, ensure_ascii=False) for name, _, flag in _RISK_FLAGS
+}
+
+# 비트마스크 → risk_flags JSON (가능한 조합을 미리 직렬화)
+RISK_JSON = np.array([
+    json.dumps([flag for _, bit, flag in _RISK_FLAGS if mask & bit], ensure_ascii=False)
+    for mask in range(32)
+], dtype=object)
+
+
+@dataclass
+class ScoreInputs:
+    """compute_all_scores 조인 결과의 컬럼 배열 (NULL/0 처리는 _compute_score와 동일)."""
+
+    grid_id: np.ndarray
+    industry_code: np.ndarray
+    store_count: np.ndarray
+    closure_rate: np.ndarray
+    total_floating: np.ndarray
+    total_population: np.ndarray
+    quarterly_sales: np.ndarray
+    rent_per_m2: np.ndarray
+
+    @classmethod
+    def from_rows(cls, rows: list, default_closure: float) -> "ScoreInputs":
+        """조인 쿼리 행 (grid_id, industry_code, store_count, closure_rate, total_floating,
+        total_population, age_20_39_ratio, quarterly_sales, avg_ticket_price, rent_per_m2)."""
+        n = len(rows)
+
+        def column(i: int) -> np.ndarray:
+            values = np.fromiter(
+                (np.nan if r[i] is None else r[i] for r in rows), dtype=np.float64, count=n,
+            )
+            return np.nan_to_num(values, nan=0.0)
+
+        closure = column(3)
+        return cls(
+            grid_id=np.fromiter((r[0] for r in rows), dtype=np.int64, count=n),
+            industry_code=np.array([r[1] for r in rows], dtype=object),
+            store_count=column(2),
+            closure_rate=np.where(closure == 0, default_closure, closure),
+            total_floating=column(4),
+            total_population=column(5),
+            quarterly_sales=column(7),
+            rent_per_m2=column(9),
+        )
+
+    def __len__(self) -> int:
+        return len(self.grid_id)
+
+
+def _z_to_score(value: np.ndarray, avg: float, higher_is_better: bool = True) -> np.ndarray:
+    if avg == 0:
+        return np.full(value.shape, 50.0)
+    z = (value - avg) / max(avg * 0.5, 1)
+    score = 50 + z * 20
+    if not higher_is_better:
+        score = 100 - score
+    return np.clip(score, 0, 100)
+
+
+def round_half_even(values: np.ndarray, ndigits: int) -> np.ndarray:
+    """Python round(x, ndigits)와 같은 결과의 배열 반올림.
+
+    np.round는 x * 10^n을 반올림하므로 곱셈 오차가 .5 경계를 넘을 수 있다.
+    경계 근처 원소만 Python round()로 다시 계산한다.
+    """
+    result = np.round(values, ndigits)
+    scaled = values * 10.0 ** ndigits
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    for i in np.flatnonzero(near_tie):
+        result[i] = round(float(values[i]), ndigits)
+    return result
+
+
+def compute_scores(inputs: ScoreInputs, seoul_avg: dict) -> dict[str, np.ndarray]:
+    """모든 행의 점수를 계산한다 → grid_score 컬럼명별 배열."""
+    store_count = inputs.store_count
+    closure_rate = inputs.closure_rate
+    total_floating = inputs.total_floating
+    total_pop = inputs.total_population
+    quarterly_sales = inputs.quarterly_sales
+    rent_per_m2 = inputs.rent_per_m2
+
+    # Competition Index
+    if seoul_avg["avg_stores"]:
+        competition_index = store_count / seoul_avg["avg_stores"]
+    else:
+        competition_index = np.zeros(len(inputs))
+
+    # Survival Probability
+    base_survival = 1 - closure_rate
+    floating_adj = np.where(total_floating > seoul_avg["avg_floating"], 0.05, -0.03)
+    pop_adj = np.where(total_pop > seoul_avg["avg_population"], 0.03, -0.02)
+    competition_adj = np.where(
+        competition_index > 1.5, -0.08, np.where(competition_index < 0.5, 0.03, 0.0),
+    )
+    survival_probability = np.clip(
+        base_survival + floating_adj + pop_adj + competition_adj, 0.1, 0.95,
+    )
+
+    # Z-score 기반 개별 점수
+    floating_score = _z_to_score(total_floating, seoul_avg["avg_floating"])
+    population_score = _z_to_score(total_pop, seoul_avg["avg_population"])
+    rent_score = _z_to_score(rent_per_m2, seoul_avg["avg_rent"], higher_is_better=False)
+    sales_score = _z_to_score(quarterly_sales, seoul_avg["avg_sales"])
+
+    # Health Score (가중합)
+    health_score = (
+        (100 - np.minimum(competition_index * 50, 100)) * abs(WEIGHTS["competition"])
+        + survival_probability * 100 * WEIGHTS["survival"]
+        + floating_score * WEIGHTS["floating"]
+        + population_score * WEIGHTS["population"]
+        + sales_score * WEIGHTS["sales"]
+        + rent_score * abs(WEIGHTS["rent"])
+    ) / WEIGHT_TOTAL
+    health_score = np.clip(health_score, 0, 100)
+
+    # 매출 추정
+    monthly_sales = np.where(quarterly_sales != 0, quarterly_sales / 3, 0.0)
+    sales_estimate_low = monthly_sales * 0.7 / 10000
+    sales_estimate_high = monthly_sales * 1.3 / 10000
+
+    # 리스크 (비트마스크 → 미리 직렬화된 JSON)
+    risk_mask = (
+        np.where(competition_index > 2.0, RISK_COMPETITION_DANGER,
+                 np.where(competition_index > 1.5, RISK_COMPETITION_WARNING, 0))
+        | np.where(rent_per_m2 > seoul_avg["avg_rent"] * 1.5, RISK_HIGH_RENT, 0)
+        | np.where(total_floating < seoul_avg["avg_floating"] * 0.5, RISK_LOW_FLOATING, 0)
+        | np.where(closure_rate > 0.25, RISK_HIGH_CLOSURE, 0)
+    )
+
+    return {
+        "grid_id": inputs.grid_id,
+        "industry_code": inputs.industry_code,
+        "health_score": round_half_even(health_score, 1),
+        "competition_index": round_half_even(competition_index, 3),
+        "survival_probability": round_half_even(survival_probability, 3),
+        "sales_estimate_low": round_half_even(sales_estimate_low, 0),
+        "sales_estimate_high": round_half_even(sales_estimate_high, 0),
+        "population_score": round_half_even(population_score, 1),
+        "floating_score": round_half_even(floating_score, 1),
+        "rent_score": round_half_even(rent_score, 1),
+        "risk_flags": RISK_JSON[risk_mask],
+    }
@@ -0,0 +1,289 @@
+"""분산 점수 계산 작업 큐 (Postgres FOR UPDATE SKIP LOCKED + 임대).
+
+compute_all_scores(distributed=True)가 grid_id 구간을 score_work_queue에 넣고,
+여러 노드의 scripts/score_worker.py와 조정자 자신이 항목을 하나씩 가져가 계산한다.
+모든 항목이 done이 되면 조정자가 한 트랜잭션으로 grid_score에 반영한다.
+
+워커가 죽으면 임대(lease_expires_at)가 지난 running 항목을 다른 워커가 다시 가져간다.
+계산 중에는 LeaseHeartbeat가 별도 커넥션으로 임대를 SCORE_QUEUE_LEASE_SECONDS/3마다 연장하므로,
+임대 시간보다 오래 걸리는 구간도 살아 있는 워커에게서 회수되지 않는다. 연장이 0행이면
+(임대를 잃음) numpy 모드는 다음 청크에서 계산을 멈춘다.
+임대는 (worker, attempts)로 식별하며, 완료 표시는 적재(COPY)와 같은 트랜잭션에서
+"지금 내가 임대 중인 항목"일 때만 성공하므로 임대를 잃은 늦은 워커의 결과는 롤백되어
+중복 적재되지 않는다.
+"""
+import json
+import os
+import socket
+import threading
+import time
+import uuid
+from collections.abc import Callable
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.etl.logger import get_etl_logger
+from app.services.score_calculator import create_shared_staging, partition_ranges, score_partition
+
+logger = get_etl_logger("score_queue")
+
+_CLAIM_SQL = text("""
+    UPDATE score_work_queue q
+    SET status = 'running',
+        worker = :worker,
+        attempts = q.attempts + 1,
+        lease_expires_at = now() + make_interval(secs => :lease_seconds)
+    WHERE q.id = (
+        SELECT id FROM score_work_queue
+        WHERE (status = 'pending' OR (status = 'running' AND lease_expires_at < now()))
+          AND attempts < :max_attempts
+          AND (CAST(:run_id AS varchar) IS NULL OR run_id = :run_id)
+        ORDER BY id
+        LIMIT 1
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING q.id, q.run_id, q.grid_lo, q.grid_hi, q.task, q.attempts
+""")
+
+# 아래 세 문장은 모두 "이 워커의 이 임대"(worker + attempts)일 때만 적용된다
+_RENEW_SQL = text("""
+    UPDATE score_work_queue
+    SET lease_expires_at = now() + make_interval(secs => :lease_seconds)
+    WHERE id = :id AND worker = :worker AND attempts = :attempts AND status = 'running'
+""")
+
+_COMPLETE_SQL = text("""
+    UPDATE score_work_queue
+    SET status = 'done', rows = :rows, error = NULL, finished_at = now()
+    WHERE id = :id AND worker = :worker AND attempts = :attempts AND status = 'running'
+""")
+
+_RELEASE_SQL = text("""
+    UPDATE score_work_queue
+    SET status = CASE WHEN attempts >= :max_attempts THEN 'failed' ELSE 'pending' END,
+        error = :error,
+        lease_expires_at = NULL
+    WHERE id = :id AND worker = :worker AND attempts = :attempts AND status = 'running'
+""")
+
+# 최대 시도 횟수를 다 쓰고 임대가 만료된 항목 → failed (더 이상 가져갈 워커가 없음)
+_EXPIRE_SQL = text("""
+    UPDATE score_work_queue
+    SET status = 'failed', error = 'lease expired after ' || attempts || ' attempts'
+    WHERE run_id = :run_id
+      AND status = 'running'
+      AND lease_expires_at < now()
+      AND attempts >= :max_attempts
+""")
+
+_PROGRESS_SQL = text("""
+    SELECT status, COUNT(*), COALESCE(SUM(rows), 0)
+    FROM score_work_queue
+    WHERE run_id = :run_id
+    GROUP BY status
+""")
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def claim_item(session: Session, worker: str, run_id: str | None = None):
+    """대기 중이거나 임대가 만료된 항목 하나를 임대한다 (commit 포함). 없으면 None."""
+    settings = get_settings()
+    item = session.execute(_CLAIM_SQL, {
+        "worker": worker,
+        "run_id": run_id,
+        "lease_seconds": settings.SCORE_QUEUE_LEASE_SECONDS,
+        "max_attempts": settings.SCORE_QUEUE_MAX_ATTEMPTS,
+    }).first()
+    session.commit()
+    return item
+
+
+class LeaseLost(Exception):
+    """계산 도중 항목의 임대를 잃었다 (다른 워커가 회수)."""
+
+
+class LeaseHeartbeat:
+    """계산 중인 항목의 임대를 주기적으로 연장하는 스레드 (with로 사용).
+
+    계산 트랜잭션은 끝날 때까지 commit되지 않으므로, 연장은 같은 엔진의 별도 autocommit
+    커넥션으로 한다. 연장이 0행이면 lost를 세우고 멈춘다 (check()가 LeaseLost를 올림).
+    연장 쿼리 자체가 실패하면 경고만 남기고 다음 주기에 다시 시도한다.
+    """
+
+    def __init__(self, session: Session, item, worker: str):
+        self._engine = session.get_bind()
+        self._params = {
+            "id": item.id,
+            "worker": worker,
+            "attempts": item.attempts,
+            "lease_seconds": get_settings().SCORE_QUEUE_LEASE_SECONDS,
+        }
+        self._interval = max(self._params["lease_seconds"] / 3, 1)
+        self._stop = threading.Event()
+        self.lost = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"lease-{item.id}", daemon=True)
+
+    def __enter__(self) -> "LeaseHeartbeat":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval):
+            try:
+                with self._engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+                    renewed = conn.execute(_RENEW_SQL, self._params).rowcount
+            except Exception as e:
+                logger.warning("Lease renewal for item %d failed: %s", self._params["id"], e)
+                continue
+            if not renewed:
+                self.lost.set()
+                return
+
+    def check(self) -> None:
+        if self.lost.is_set():
+            raise LeaseLost(f"lease on item {self._params['id']} was lost")
+
+
+def process_item(session: Session, item, worker: str) -> int:
+    """임대한 항목을 계산해 staging에 적재하고 done으로 표시한다 (한 트랜잭션).
+
+    계산하는 동안 임대를 연장한다 (LeaseHeartbeat). 실패하면 다시 pending으로
+    (시도 횟수 초과 시 failed) 돌려놓는다. → 적재 행 수
+    """
+    start = time.perf_counter()
+    lease = {"id": item.id, "worker": worker, "attempts": item.attempts}
+    try:
+        with LeaseHeartbeat(session, item, worker) as heartbeat:
+            rows = score_partition(session, json.loads(item.task), on_chunk=heartbeat.check)
+            heartbeat.check()
+        completed = session.execute(_COMPLETE_SQL, {**lease, "rows": rows}).rowcount
+        if not completed:
+            raise LeaseLost(f"lease on item {item.id} was lost")
+        session.commit()
+    except LeaseLost:
+        session.rollback()
+        logger.warning("Lost lease on item %d (grid_id [%d, %d)), discarding result",
+                       item.id, item.grid_lo, item.grid_hi)
+        return 0
+    except Exception as e:
+        session.rollback()
+        session.execute(_RELEASE_SQL, {
+            **lease,
+            "error": f"{type(e).__name__}: {e}"[:2000],
+            "max_attempts": get_settings().SCORE_QUEUE_MAX_ATTEMPTS,
+        })
+        session.commit()
+        logger.error("Item %d (grid_id [%d, %d)) failed on attempt %d: %s",
+                     item.id, item.grid_lo, item.grid_hi, item.attempts, e)
+        return 0
+
+    logger.info("Item %d (grid_id [%d, %d)): %d rows in %.1fs",
+                item.id, item.grid_lo, item.grid_hi, rows, time.perf_counter() - start)
+    return rows
+
+
+def run_worker(
+    session_factory: Callable[[], Session],
+    worker: str | None = None,
+    run_id: str | None = None,
+    idle_exit: float | None = None,
+) -> int:
+    """큐 항목을 계속 가져와 처리한다. idle_exit초 동안 항목이 없으면 종료. → 처리 항목 수"""
+    worker = worker or default_worker_id()
+    poll = get_settings().SCORE_QUEUE_POLL_SECONDS
+    processed = 0
+    idle_since = time.monotonic()
+    logger.info("Score worker %s started", worker)
+    while True:
+        with session_factory() as session:
+            item = claim_item(session, worker, run_id)
+            if item is not None:
+                process_item(session, item, worker)
+                processed += 1
+                idle_since = time.monotonic()
+                continue
+        if idle_exit is not None and time.monotonic() - idle_since >= idle_exit:
+            logger.info("Score worker %s idle for %.0fs, exiting (%d items)", worker, idle_exit, processed)
+            return processed
+        time.sleep(poll)
+
+
+def score_distributed(
+    session: Session,
+    mode: str,
+    seoul_avg: dict,
+    scope: dict,
+    staging: str,
+) -> int:
+    """grid_id 구간을 큐에 넣고 모두 done이 될 때까지 직접 처리하며 기다린다. → 적재 행 수
+
+    하나라도 failed가 되거나 SCORE_QUEUE_TIMEOUT_SECONDS를 넘기면 RuntimeError/TimeoutError
+    (grid_score는 변경되지 않음). 끝나면 이 실행의 큐 항목을 삭제한다.
+    """
+    settings = get_settings()
+    ranges = partition_ranges(session, scope, settings.SCORE_QUEUE_PARTITIONS)
+    search_path = session.execute(text("SHOW search_path")).scalar()
+    create_shared_staging(session, staging)
+    if not ranges:
+        return 0
+
+    run_id = uuid.uuid4().hex
+    base_task = {"mode": mode, "seoul_avg": seoul_avg, "staging": staging, "search_path": search_path}
+    session.execute(text("""
+        INSERT INTO score_work_queue (run_id, grid_lo, grid_hi, task, status, attempts)
+        VALUES (:run_id, :grid_lo, :grid_hi, :task, 'pending', 0)
+    """), [
+        {
+            "run_id": run_id,
+            "grid_lo": lo,
+            "grid_hi": hi,
+            "task": json.dumps({**base_task, "scope": {**scope, "grid_lo": lo, "grid_hi": hi}}),
+        }
+        for lo, hi in ranges
+    ])
+    session.commit()
+    logger.info("Enqueued %d grid ranges (run %s)", len(ranges), run_id)
+
+    worker = default_worker_id()
+    params = {"run_id": run_id, "max_attempts": settings.SCORE_QUEUE_MAX_ATTEMPTS}
+    start = time.monotonic()
+    last_done = -1
+    try:
+        while True:
+            # 조정자도 워커로 참여 (외부 워커가 없어도 완료된다)
+            item = claim_item(session, worker, run_id)
+            if item is not None:
+                process_item(session, item, worker)
+                continue
+
+            session.execute(_EXPIRE_SQL, params)
+            progress = {
+                status: (n, rows) for status, n, rows in session.execute(_PROGRESS_SQL, params)
+            }
+            session.commit()
+
+            done, rows = progress.get("done", (0, 0))
+            if done != last_done:
+                logger.info("Work queue run %s: %d/%d ranges done (%s rows)",
+                            run_id, done, len(ranges), f"{rows:,}")
+                last_done = done
+            if "failed" in progress:
+                raise RuntimeError(f"{progress['failed'][0]} score work items failed (run {run_id})")
+            if done == len(ranges):
+                return rows
+            if time.monotonic() - start > settings.SCORE_QUEUE_TIMEOUT_SECONDS:
+                raise TimeoutError(f"Score work queue run {run_id} timed out ({done}/{len(ranges)} done)")
+            time.sleep(settings.SCORE_QUEUE_POLL_SECONDS)
+    finally:
+        session.rollback()
+        session.execute(text("DELETE FROM score_work_queue WHERE run_id = :run_id"), {"run_id": run_id})
+        session.commit()
@@ -0,0 +1,174 @@
+"""격자 지표 Summed-area table (2D 누적합) — 뷰포트/바운딩박스 합계를 O(1)로 계산.
+
+ETL: build_summed_area_tables()가 grid_lattice 위에 지표별/업종별 누적합 배열을
+만들어 grid_summed_area에 저장한다.
+API: summed_area_index가 배열을 메모리에 올려 두고 임의 사각형 합계를 4번의
+배열 조회로 응답한다 (서울 전체로 줌아웃해도 비용 동일).
+"""
+import threading
+import time
+
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.etl.grid_lattice import LATTICE_QUERY, Lattice, load_lattice
+from app.etl.logger import get_etl_logger
+from app.services.dataset_version import read_dataset_version
+
+logger = get_etl_logger("summed_area")
+
+ALL_INDUSTRIES = ""  # stores 전체 업종 키
+
+
+def summed_area(values: np.ndarray) -> np.ndarray:
+    """(n_rows, n_cols) 배열 → 0 패딩된 (n_rows + 1, n_cols + 1) 누적합."""
+    sat = np.zeros((values.shape[0] + 1, values.shape[1] + 1), dtype=np.float64)
+    sat[1:, 1:] = values.cumsum(axis=0).cumsum(axis=1)
+    return sat
+
+
+def rect_sum(sat: np.ndarray, r0: int, r1: int, c0: int, c1: int) -> float:
+    """행 r0..r1, 열 c0..c1 (포함) 범위의 합."""
+    return float(
+        sat[r1 + 1, c1 + 1] - sat[r0, c1 + 1] - sat[r1 + 1, c0] + sat[r0, c0]
+    )
+
+
+def lattice_array(lattice: Lattice, rows: list) -> np.ndarray:
+    """[(grid_id, value)] → (n_rows, n_cols) 격자 배열 (격자 밖 grid_id는 무시)."""
+    grid = np.zeros(lattice.size, dtype=np.float64)
+    if rows:
+        ids = np.fromiter((r[0] for r in rows), dtype=np.int64, count=len(rows))
+        vals = np.fromiter((r[1] or 0 for r in rows), dtype=np.float64, count=len(rows))
+        idx = ids - 1
+        valid = (idx >= 0) & (idx < lattice.size)
+        np.add.at(grid, idx[valid], vals[valid])
+    return grid.reshape(lattice.n_rows, lattice.n_cols)
+
+
+def build_summed_area_tables(session: Session) -> int:
+    """지표별 summed-area table을 계산해 grid_summed_area를 갱신한다."""
+    lattice = load_lattice(session)
+    if lattice is None:
+        logger.warning("No grid_lattice row (grids generated before lattice support), skipping")
+        return 0
+
+    tables: list[tuple[str, str | None, np.ndarray]] = []
+
+    population = session.execute(text("""
+        SELECT grid_id, SUM(total_population) FROM grid_population_stats GROUP BY grid_id
+    """)).fetchall()
+    tables.append(("population", None, lattice_array(lattice, population)))
+
+    floating = session.execute(text("""
+        SELECT grid_id, SUM(total_floating) FROM grid_floating_stats GROUP BY grid_id
+    """)).fetchall()
+    tables.append(("floating", None, lattice_array(lattice, floating)))
+
+    store_rows = session.execute(text("""
+        SELECT industry_code, grid_id, SUM(store_count)
+        FROM grid_store_stats GROUP BY industry_code, grid_id
+    """)).fetchall()
+    by_industry: dict[str, list] = {}
+    for code, grid_id, cnt in store_rows:
+        by_industry.setdefault(code, []).append((grid_id, cnt))
+    total = np.zeros((lattice.n_rows, lattice.n_cols), dtype=np.float64)
+    for code, rows in by_industry.items():
+        arr = lattice_array(lattice, rows)
+        total += arr
+        tables.append(("stores", code, arr))
+    tables.append(("stores", None, total))
+
+    session.execute(text("DELETE FROM grid_summed_area"))
+    for metric, industry_code, values in tables:
+        sat = summed_area(values)
+        session.execute(text("""
+            INSERT INTO grid_summed_area (metric, industry_code, n_rows, n_cols, data)
+            VALUES (:metric, :ic, :n_rows, :n_cols, :data)
+        """), {
+            "metric": metric,
+            "ic": industry_code,
+            "n_rows": sat.shape[0],
+            "n_cols": sat.shape[1],
+            "data": sat.astype("<f8").tobytes(),
+        })
+    session.commit()
+    logger.info("Built %d summed-area tables (%dx%d lattice)",
+                len(tables), lattice.n_rows, lattice.n_cols)
+    return len(tables)
+
+
+class SummedAreaIndex:
+    """API 프로세스 내 summed-area table 캐시. 첫 요청 또는 데이터 버전 변경 시 적재."""
+
+    def __init__(self):
+        self._lattice: Lattice | None = None
+        self._tables: dict[tuple[str, str], np.ndarray] = {}
+        self._loaded = False
+        self._lock = threading.Lock()
+        self.version: int | None = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def invalidate(self) -> None:
+        self._loaded = False
+
+    def load(self, conn: Connection) -> None:
+        with self._lock:
+            start = time.perf_counter()
+            version = read_dataset_version(conn)
+            row = conn.execute(LATTICE_QUERY).fetchone()
+            lattice = Lattice.from_row(row) if row else None
+            tables = {}
+            for metric, industry_code, n_rows, n_cols, data in conn.execute(text("""
+                SELECT metric, industry_code, n_rows, n_cols, data FROM grid_summed_area
+            """)):
+                sat = np.frombuffer(bytes(data), dtype="<f8").reshape(n_rows, n_cols)
+                tables[(metric, industry_code or ALL_INDUSTRIES)] = sat
+            self._lattice, self._tables, self._loaded = lattice, tables, True
+            self.version = version
+            logger.info("Summed-area tables loaded: %d (%.2fs)",
+                        len(tables), time.perf_counter() - start)
+
+    def query(
+        self,
+        min_lat: float,
+        min_lng: float,
+        max_lat: float,
+        max_lng: float,
+        industry_code: str | None = None,
+    ) -> dict:
+        """사각형과 겹치는 격자의 점포수/거주인구/유동인구 합계."""
+        result = {
+            "grid_count": 0,
+            "store_count": 0,
+            "resident_population": 0,
+            "floating_population": 0.0,
+        }
+        lattice = self._lattice
+        if lattice is None:
+            return result
+        cells = lattice.cell_range(min_lat, min_lng, max_lat, max_lng)
+        if cells is None:
+            return result
+
+        r0, r1, c0, c1 = cells
+        result["grid_count"] = (r1 - r0 + 1) * (c1 - c0 + 1)
+
+        stores = self._tables.get(("stores", industry_code or ALL_INDUSTRIES))
+        if stores is not None:
+            result["store_count"] = int(round(rect_sum(stores, r0, r1, c0, c1)))
+        population = self._tables.get(("population", ALL_INDUSTRIES))
+        if population is not None:
+            result["resident_population"] = int(round(rect_sum(population, r0, r1, c0, c1)))
+        floating = self._tables.get(("floating", ALL_INDUSTRIES))
+        if floating is not None:
+            result["floating_population"] = round(rect_sum(floating, r0, r1, c0, c1), 0)
+        return result
+
+
+summed_area_index = SummedAreaIndex()
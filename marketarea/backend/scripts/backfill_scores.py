@@ -0,0 +1,50 @@
+"""과거 분기 점수 백필 — 매출/임대료 통계에 있는 분기마다 grid_score를 계산해 모두 보관한다.
+
+분기별 서울 평균으로 계산하며, 분기 하나를 워커 프로세스 하나가 처리한다.
+
+    python scripts/backfill_scores.py                          # 모든 분기
+    python scripts/backfill_scores.py --quarters 2023-Q4 2024-Q1 --workers 2
+"""
+import sys
+import os
+import argparse
+import re
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.etl.logger import get_etl_logger
+from app.services.quarters import QUARTER_PATTERN, normalize_quarter
+from app.services.score_calculator import SCORE_MODES, backfill_scores
+
+logger = get_etl_logger("backfill_scores")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compute grid scores for every stats quarter")
+    parser.add_argument("--quarters", nargs="+", default=None,
+                        help="Quarters to score, e.g. 2024-Q1 (default: all quarters in stats)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Quarters scored in parallel (default: SCORE_WORKERS)")
+    parser.add_argument("--mode", choices=SCORE_MODES, default=None,
+                        help="Scoring mode (default: SCORE_MODE)")
+    args = parser.parse_args()
+
+    quarters = [normalize_quarter(q) for q in args.quarters] if args.quarters else None
+    invalid = [q for q in quarters or () if not re.match(QUARTER_PATTERN, q)]
+    if invalid:
+        parser.error(f"invalid quarter(s): {', '.join(invalid)}")
+
+    engine = create_engine(get_settings().get_sync_db_url())
+    with Session(engine) as session:
+        results = backfill_scores(session, quarters, workers=args.workers, mode=args.mode)
+    engine.dispose()
+    for quarter, count in results.items():
+        logger.info("  %s: %s scores", quarter, f"{count:,}")
+
+
+if __name__ == "__main__":
+    main()
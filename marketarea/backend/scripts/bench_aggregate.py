@@ -0,0 +1,167 @@
+"""/api/analysis 집계 경로 지연시간 벤치마크.
+
+기존 7-쿼리 구현(IN 리스트 f-string)과 단일 CTE 구현을 같은 좌표 세트로
+번갈아 실행하여 p50/p95/p99 지연시간을 비교하고, 결과가 동일한지 확인한다.
+
+    python scripts/bench_aggregate.py --iterations 200 --industry Q12
+"""
+import sys
+import os
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import async_session, get_db_engine
+from app.services.grid_aggregator import aggregate_grids, build_result
+
+# 자주 조회되는 지점 (강남역, 홍대입구, 잠실, 종로, 여의도)
+HOTSPOTS = [
+    (37.4979, 127.0276),
+    (37.5572, 126.9245),
+    (37.5133, 127.1001),
+    (37.5704, 126.9918),
+    (37.5219, 126.9245),
+]
+RADII = [300, 500, 1000]
+
+
+async def _legacy_aggregate(
+    session: AsyncSession, lat: float, lng: float, radius: int, industry_code: str,
+) -> dict:
+    """기존 구현: 반경 검색 후 통계 테이블별 개별 쿼리 (IN 리스트 f-string)."""
+    radius_deg = radius / 111_320
+    grid_rows = await session.execute(text("""
+        SELECT id FROM grid_master
+        WHERE ST_DWithin(geom, ST_SetSRID(ST_MakePoint(:lng, :lat), 4326), :radius_deg)
+    """), {"lat": lat, "lng": lng, "radius_deg": radius_deg})
+    grid_ids = [r[0] for r in grid_rows.fetchall()]
+    if not grid_ids:
+        return build_result(0, 0, 0, 0, 0, None, [])
+
+    grid_id_list = ",".join(str(gid) for gid in grid_ids)
+    params = {"ic": industry_code}
+
+    store_count = (await session.execute(text(f"""
+        SELECT COALESCE(SUM(store_count), 0) FROM grid_store_stats
+        WHERE grid_id IN ({grid_id_list}) AND industry_code = :ic
+    """), params)).scalar() or 0
+    avg_floating = (await session.execute(text(f"""
+        SELECT COALESCE(AVG(total_floating), 0) FROM grid_floating_stats
+        WHERE grid_id IN ({grid_id_list})
+    """))).scalar() or 0
+    total_pop = (await session.execute(text(f"""
+        SELECT COALESCE(SUM(total_population), 0) FROM grid_population_stats
+        WHERE grid_id IN ({grid_id_list})
+    """))).scalar() or 0
+    avg_rent = (await session.execute(text(f"""
+        SELECT COALESCE(AVG(rent_per_m2), 0) FROM grid_rent_stats
+        WHERE grid_id IN ({grid_id_list})
+    """))).scalar() or 0
+    score = (await session.execute(text(f"""
+        SELECT AVG(health_score), AVG(competition_index), AVG(survival_probability),
+               AVG(sales_estimate_low), AVG(sales_estimate_high),
+               AVG(population_score), AVG(floating_score), AVG(rent_score)
+        FROM grid_score WHERE grid_id IN ({grid_id_list}) AND industry_code = :ic
+    """), params)).fetchone()
+    risk_rows = await session.execute(text(f"""
+        SELECT risk_flags FROM grid_score
+        WHERE grid_id IN ({grid_id_list}) AND industry_code = :ic
+        AND risk_flags IS NOT NULL AND risk_flags != '[]'
+    """), params)
+
+    risk_flags = []
+    seen_messages = set()
+    for (rf_json,) in risk_rows.fetchall():
+        try:
+            for f in json.loads(rf_json):
+                if f["message"] not in seen_messages:
+                    risk_flags.append(f)
+                    seen_messages.add(f["message"])
+        except (json.JSONDecodeError, KeyError):
+            pass
+
+    return build_result(
+        len(grid_ids), store_count, avg_floating, total_pop, avg_rent, score, risk_flags,
+    )
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    k = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[k]
+
+
+def _report(name: str, samples: list[float]):
+    ms = [s * 1000 for s in samples]
+    print(
+        f"{name:<10} n={len(ms):<5} mean={statistics.mean(ms):7.2f}ms "
+        f"p50={_percentile(ms, 50):7.2f}ms p95={_percentile(ms, 95):7.2f}ms "
+        f"p99={_percentile(ms, 99):7.2f}ms"
+    )
+
+
+def _same(a: dict, b: dict) -> bool:
+    """리스크 플래그 순서는 SQL 상 정의되지 않으므로 메시지 집합으로 비교."""
+    a, b = dict(a), dict(b)
+    flags_a = {f["message"] for f in a.pop("risk_flags")}
+    flags_b = {f["message"] for f in b.pop("risk_flags")}
+    return a == b and flags_a == flags_b
+
+
+async def run(iterations: int, industry_code: str, seed: int):
+    rng = random.Random(seed)
+    points = []
+    for i in range(iterations):
+        if i % 2 == 0:
+            lat, lng = rng.choice(HOTSPOTS)
+        else:
+            lat, lng = rng.uniform(37.45, 37.68), rng.uniform(126.80, 127.15)
+        points.append((lat, lng, rng.choice(RADII)))
+
+    timings = {"legacy": [], "cte": []}
+    mismatches = 0
+    async with async_session() as session:
+        # 워밍업 (커넥션/prepared statement 준비)
+        for lat, lng, radius in points[:5]:
+            await _legacy_aggregate(session, lat, lng, radius, industry_code)
+            await aggregate_grids(session, lat, lng, radius, industry_code)
+
+        for lat, lng, radius in points:
+            start = time.perf_counter()
+            legacy = await _legacy_aggregate(session, lat, lng, radius, industry_code)
+            timings["legacy"].append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            cte = await aggregate_grids(session, lat, lng, radius, industry_code)
+            timings["cte"].append(time.perf_counter() - start)
+
+            if not _same(legacy, cte):
+                mismatches += 1
+
+    await get_db_engine().dispose()
+
+    for name, samples in timings.items():
+        _report(name, samples)
+    speedup = statistics.median(timings["legacy"]) / max(statistics.median(timings["cte"]), 1e-9)
+    print(f"median speedup: {speedup:.2f}x, result mismatches: {mismatches}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark aggregate_grids SQL paths")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--industry", default="Q12")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    asyncio.run(run(args.iterations, args.industry, args.seed))
+
+
+if __name__ == "__main__":
+    main()
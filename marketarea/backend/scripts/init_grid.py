@@ -1,4 +1,8 @@
-"""서울 100m x 100m 격자 초기 생성 스크립트."""
+"""서울 100m x 100m 격자 초기 생성 스크립트.
+
+grid_master/grid_district는 ETL 스냅샷(etl_shadow 교체) 밖의 public 테이블이므로 즉시 반영된다.
+격자를 다시 만들면 기존 통계/점수의 grid_id가 맞지 않게 되므로 이어서 run_etl.py --force를 실행한다.
+"""
 import sys
 import os
 
@@ -9,6 +13,7 @@ from sqlalchemy.orm import sessionmaker
 from app.config import get_settings
 from app.database import Base
 from app.models import *  # noqa: ensure all models are registered
+from app.etl.district_mapping import build_district_mapping
 from app.etl.grid_generator import generate_seoul_grids
 
 
@@ -30,6 +35,8 @@ def main():
     with Session() as session:
         count = generate_seoul_grids(session)
         print(f"Generated {count:,} grids for Seoul.")
+        rows = build_district_mapping(session)
+        print(f"Mapped {rows:,} grid-district rows.")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,84 @@
+"""분기 파티션 조회/생성/보관 (grid_store_stats, grid_sales_stats, grid_rent_stats, grid_score).
+
+    python scripts/manage_partitions.py --list
+    python scripts/manage_partitions.py --ensure 2024-Q4 2025-Q1
+    python scripts/manage_partitions.py --archive 2023-Q1            # partition_archive 스키마로 분리
+    python scripts/manage_partitions.py --archive 2023-Q1 --drop     # 분리 후 삭제
+    python scripts/manage_partitions.py --restore 2023-Q1
+
+--table을 주지 않으면 모든 파티션 테이블에 적용한다. 게시된(public) 테이블을 바로 바꾸며,
+다음 ETL 섀도 복제에는 분리된 분기가 포함되지 않는다.
+"""
+import sys
+import os
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.etl.logger import get_etl_logger
+from app.etl.partitions import (
+    ARCHIVE_SCHEMA,
+    PARTITIONED_TABLES,
+    archive_quarter_partition,
+    archived_partitions,
+    ensure_quarter_partitions,
+    list_partitions,
+    restore_quarter_partition,
+)
+from app.services.quarters import normalize_quarter
+
+logger = get_etl_logger("manage_partitions")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="List, create, archive or restore quarter partitions")
+    action = parser.add_mutually_exclusive_group(required=True)
+    action.add_argument("--list", action="store_true", help="List partitions and archived partitions")
+    action.add_argument("--ensure", nargs="+", metavar="QUARTER", help="Create partitions for quarters")
+    action.add_argument("--archive", nargs="+", metavar="QUARTER",
+                        help=f"Detach quarter partitions into the {ARCHIVE_SCHEMA} schema")
+    action.add_argument("--restore", nargs="+", metavar="QUARTER",
+                        help=f"Re-attach quarter partitions from the {ARCHIVE_SCHEMA} schema")
+    parser.add_argument("--drop", action="store_true", help="With --archive: drop instead of keeping")
+    parser.add_argument("--table", choices=PARTITIONED_TABLES, default=None,
+                        help="Only this table (default: all partitioned tables)")
+    args = parser.parse_args()
+
+    tables = [args.table] if args.table else list(PARTITIONED_TABLES)
+    engine = create_engine(get_settings().get_sync_db_url())
+    try:
+        with Session(engine) as session:
+            if args.list:
+                for table in tables:
+                    print(table)
+                    for row in list_partitions(session, table):
+                        print(f"  {row.name:<32} {row.bound:<36} ~{row.est_rows:,} rows")
+                for row in archived_partitions(session):
+                    print(f"{ARCHIVE_SCHEMA}.{row.name:<32} ~{row.est_rows:,} rows")
+                return
+
+            quarters = [normalize_quarter(q) for q in args.ensure or args.archive or args.restore]
+            for table in tables:
+                if args.ensure:
+                    ensure_quarter_partitions(session, table, quarters)
+                elif args.archive:
+                    for quarter in quarters:
+                        if not archive_quarter_partition(session, table, quarter, drop=args.drop):
+                            logger.warning("%s has no %s partition, skipping", table, quarter)
+                else:
+                    for quarter in quarters:
+                        restore_quarter_partition(session, table, quarter)
+            session.commit()
+    except ValueError as e:
+        logger.error("Partition change failed: %s", e)
+        sys.exit(1)
+    finally:
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
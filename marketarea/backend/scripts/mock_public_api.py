@@ -0,0 +1,185 @@
+"""공공데이터 API 목 서버 — 실제 서비스 없이 수집기 처리량(페이지네이션/재시도/동시성)을 측정한다.
+
+    python scripts/mock_public_api.py --port 8099 --stores-per-gu 20000 --latency-ms 80 --error-rate 0.02
+
+수집기를 목 서버로 향하게 하려면 (키는 아무 값):
+
+    API_BASE_URL_DATA_GO_KR=http://localhost:8099
+    API_BASE_URL_SEOUL=http://localhost:8099
+    API_BASE_URL_KOSIS=http://localhost:8099
+    DATA_GO_KR_API_KEY=mock SEOUL_OPEN_DATA_API_KEY=mock KOSIS_API_KEY=mock
+    ETL_HTTP_CACHE_DIR=    # 캐시를 끄고 매번 목 서버에서 받는다
+
+제공 엔드포인트 (실제 API와 같은 경로/응답 구조):
+- data.go.kr 상가업소 storeListInDong (구별 페이지, body.totalCount)
+- data.go.kr RTMS 오피스텔 전월세 getRTMSDataSvcOffiRent (구별, response.body.items.item)
+- 서울 열린데이터 VwsmTrdarSelngQq / SPOP_LOCAL_RESD_DONG (/{key}/json/{서비스}/{start}/{end}/)
+- KOSIS statisticsParameterData.do (행 목록)
+
+각 행은 (seed, 엔드포인트, 구/행 번호)로 만든 난수로 생성되므로 같은 설정이면 페이지 크기와
+관계없이 항상 같은 데이터를 돌려준다. 지연은 요청마다 latency ± jitter, 오류는 error-rate
+비율로 500, throttle-rate 비율로 429 (Retry-After: 1)를 돌려준다.
+"""
+import sys
+import os
+import argparse
+import asyncio
+import random
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from app.etl.seoul_districts import SEOUL_DONG, SEOUL_GU
+
+# 샘플 데이터와 같은 업종 코드
+INDUSTRIES = [
+    ("Q12", "커피전문점"), ("Q01", "한식음식점"), ("Q03", "패스트푸드점"), ("Q04", "치킨전문점"),
+    ("F02", "편의점"), ("F01", "화장품소매점"), ("F10", "생활잡화소매점"),
+]
+AGE_GROUPS = ["0~9세", "10~19세", "20~29세", "30~39세", "40~49세", "50~59세", "60~69세", "70세 이상"]
+# 구 중심에서 점포 좌표를 흩뿌리는 범위 (도, 약 ±3km)
+STORE_SPREAD_DEG = 0.027
+
+
+def create_app(args: argparse.Namespace) -> FastAPI:
+    app = FastAPI(title="MarketArea mock public APIs")
+    failures = random.Random(f"{args.seed}:failures")
+    gu_codes = list(SEOUL_GU)
+    dong_codes = list(SEOUL_DONG)
+    quarters = [q.strip() for q in args.sales_quarters.split(",") if q.strip()]
+
+    def rng(*parts) -> random.Random:
+        return random.Random(":".join(str(p) for p in (args.seed, *parts)))
+
+    @app.middleware("http")
+    async def latency_and_failures(request: Request, call_next):
+        delay = args.latency_ms + failures.uniform(-args.jitter_ms, args.jitter_ms)
+        await asyncio.sleep(max(delay, 0) / 1000)
+        roll = failures.random()
+        if roll < args.error_rate:
+            return JSONResponse({"error": "mock internal error"}, status_code=500)
+        if roll < args.error_rate + args.throttle_rate:
+            return JSONResponse({"error": "mock rate limit"}, status_code=429, headers={"Retry-After": "1"})
+        return await call_next(request)
+
+    @app.get("/B553077/api/open/sdsc2/storeListInDong")
+    async def store_list(key: str, numOfRows: int = 1000, pageNo: int = 1):
+        gu = SEOUL_GU.get(key)
+        total = args.stores_per_gu if gu else 0
+        first = (pageNo - 1) * numOfRows
+        items = []
+        for i in range(first, min(first + numOfRows, total)):
+            r = rng("store", key, i)
+            code, name = r.choice(INDUSTRIES)
+            items.append({
+                "bizesNm": f"{name} {i + 1}호점",
+                "indsLclsCd": code,
+                "indsLclsNm": name,
+                "lnoAdr": f"서울특별시 {gu['name']} 목업로 {i + 1}",
+                "lat": str(round(gu["lat"] + r.uniform(-STORE_SPREAD_DEG, STORE_SPREAD_DEG), 6)),
+                "lon": str(round(gu["lng"] + r.uniform(-STORE_SPREAD_DEG, STORE_SPREAD_DEG), 6)),
+            })
+        return {
+            "header": {"resultCode": "00", "resultMsg": "NORMAL SERVICE"},
+            "body": {"items": items, "numOfRows": numOfRows, "pageNo": pageNo, "totalCount": total},
+        }
+
+    @app.get("/1613000/RTMSDataSvcOffiRent/getRTMSDataSvcOffiRent")
+    async def offi_rent(LAWD_CD: str, DEAL_YMD: str = "202401", numOfRows: int = 1000):
+        n = min(args.rent_per_gu, numOfRows) if LAWD_CD in SEOUL_GU else 0
+        items = []
+        for i in range(n):
+            r = rng("rent", LAWD_CD, DEAL_YMD, i)
+            area = round(r.uniform(18, 85), 2)
+            items.append({
+                "전용면적": area,
+                "보증금액": round(area * r.uniform(80, 250)),   # 만원
+                "월세금액": round(area * r.uniform(0.8, 2.5)),  # 만원
+            })
+        return {"response": {
+            "header": {"resultCode": "000", "resultMsg": "OK"},
+            "body": {"items": {"item": items}, "numOfRows": numOfRows, "totalCount": n},
+        }}
+
+    @app.get("/{api_key}/json/VwsmTrdarSelngQq/{start}/{end}/")
+    async def trdar_sales(api_key: str, start: int, end: int):
+        rows = []
+        for i in range(start - 1, min(end, args.sales_rows)):
+            r = rng("sales", i)
+            code, name = r.choice(INDUSTRIES)
+            count = r.randint(100, 20000)
+            rows.append({
+                "STDR_YYQU_CD": quarters[i % len(quarters)].replace("-Q", ""),
+                # 수집기가 앞 5자리를 구 코드로 쓰므로 구 코드로 시작하는 상권 코드를 만든다
+                "TRDAR_CD": f"{r.choice(gu_codes)}{i:05d}",
+                "SVC_INDUTY_CD": code,
+                "SVC_INDUTY_CD_NM": name,
+                "THSMON_SELNG_AMT": count * r.randint(4000, 30000),
+                "THSMON_SELNG_CO": count,
+            })
+        return _seoul_response("VwsmTrdarSelngQq", args.sales_rows, rows)
+
+    @app.get("/{api_key}/json/SPOP_LOCAL_RESD_DONG/{start}/{end}/")
+    async def local_population(api_key: str, start: int, end: int):
+        total = len(dong_codes) * 24
+        rows = []
+        for i in range(start - 1, min(end, total)):
+            dong_code, hour = dong_codes[i // 24], i % 24
+            r = rng("floating", dong_code, hour)
+            rows.append({
+                "STDR_DE_ID": "20240301",
+                "TMZON_PD_SE": f"{hour:02d}",
+                "ADSTRD_CODE_SE": dong_code,
+                "TOT_LVPOP_CO": round(r.uniform(3000, 60000), 4),
+            })
+        return _seoul_response("SPOP_LOCAL_RESD_DONG", total, rows)
+
+    @app.get("/openapi/Param/statisticsParameterData.do")
+    async def kosis_population(startPrdDe: str = "202401", endPrdDe: str = "202412"):
+        rows = []
+        for gu_code, gu in SEOUL_GU.items():
+            for age in AGE_GROUPS:
+                r = rng("kosis", gu_code, age)
+                rows.append({
+                    "C1": gu_code, "C1_NM": gu["name"],
+                    "C2_NM": age, "ITM_NM": "총인구수",
+                    "PRD_DE": endPrdDe, "DT": str(r.randint(15000, 80000)),
+                })
+        return rows
+
+    return app
+
+
+def _seoul_response(service: str, total: int, rows: list[dict]) -> dict:
+    return {service: {
+        "list_total_count": total,
+        "RESULT": {"CODE": "INFO-000", "MESSAGE": "정상 처리되었습니다"},
+        "row": rows,
+    }}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve deterministic mock public-data APIs for ETL benchmarks")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--seed", type=int, default=42, help="Data seed (same seed → same pages)")
+    parser.add_argument("--stores-per-gu", type=int, default=5000, help="storeListInDong rows per gu")
+    parser.add_argument("--sales-rows", type=int, default=20000, help="VwsmTrdarSelngQq total rows")
+    parser.add_argument("--sales-quarters", default="2024-Q1,2024-Q2,2024-Q3",
+                        help="Comma-separated quarters cycled through sales rows")
+    parser.add_argument("--rent-per-gu", type=int, default=300, help="RTMS rent rows per gu (max numOfRows)")
+    parser.add_argument("--latency-ms", type=float, default=50, help="Per-request latency")
+    parser.add_argument("--jitter-ms", type=float, default=20, help="Uniform ± jitter added to latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 500")
+    parser.add_argument("--throttle-rate", type=float, default=0.0,
+                        help="Fraction of requests answered with 429 (Retry-After: 1)")
+    args = parser.parse_args()
+
+    uvicorn.run(create_app(args), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
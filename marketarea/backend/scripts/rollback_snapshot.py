@@ -0,0 +1,47 @@
+"""보관된 ETL 스냅샷 조회/롤백.
+
+    python scripts/rollback_snapshot.py --list
+    python scripts/rollback_snapshot.py            # 직전 게시 상태로
+    python scripts/rollback_snapshot.py --id 12
+"""
+import sys
+import os
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.etl.logger import get_etl_logger
+from app.etl.snapshot import retained_snapshots, rollback_snapshot
+
+logger = get_etl_logger("rollback_snapshot")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="List or roll back retained ETL snapshots")
+    parser.add_argument("--list", action="store_true", help="List retained snapshots and exit")
+    parser.add_argument("--id", type=int, default=None,
+                        help="Snapshot id to restore (default: most recent)")
+    args = parser.parse_args()
+
+    engine = create_engine(get_settings().get_sync_db_url())
+    with Session(engine) as session:
+        if args.list:
+            for row in retained_snapshots(session):
+                print(f"{row.id:>5}  {row.action:<8}  {row.archive_schema:<16}  "
+                      f"version={row.dataset_version}  {row.created_at:%Y-%m-%d %H:%M:%S}")
+            return
+        try:
+            version = rollback_snapshot(session, args.id)
+        except ValueError as e:
+            logger.error("Rollback failed: %s", e)
+            sys.exit(1)
+        logger.info("Rollback published as dataset version %d", version)
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
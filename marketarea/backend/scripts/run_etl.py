@@ -11,6 +11,7 @@ from sqlalchemy.orm import sessionmaker
 from app.config import get_settings
 from app.database import Base
 from app.models import *  # noqa
+from app.etl.http_cache import enable_replay, get_http_cache
 from app.etl.logger import get_etl_logger
 from app.etl.store_collector import collect_stores
 from app.etl.floating_collector import collect_floating
@@ -24,13 +25,29 @@ logger = get_etl_logger("run_etl")
 def main():
     parser = argparse.ArgumentParser(description="Run MarketArea ETL pipeline")
     parser.add_argument("--force", action="store_true",
-                        help="Force re-run: truncate stats tables before collecting")
+                        help="Force re-run: clear stats tables (in the shadow snapshot) before collecting. "
+                             "Does not regenerate grids (use scripts/init_grid.py)")
+    parser.add_argument("--replay", action="store_true",
+                        help="Run collectors from cached HTTP responses only (no network). "
+                             "API keys must still be set (any value) for the API paths to run")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Ignore and don't write the HTTP response cache (re-download everything)")
+    parser.add_argument("--continue-on-error", action="store_true",
+                        help="Log failed stages and still publish the snapshot "
+                             "(default: drop the shadow schema and exit non-zero on the first failure)")
     args = parser.parse_args()
 
     # FORCE_ETL 환경변수도 지원
     force = args.force or os.environ.get("FORCE_ETL", "").lower() in ("true", "1", "yes")
 
     settings = get_settings()
+    if args.no_cache:
+        settings.ETL_HTTP_CACHE_DIR = ""
+    if args.replay or settings.ETL_HTTP_REPLAY:
+        if not settings.ETL_HTTP_CACHE_DIR:
+            parser.error("--replay needs ETL_HTTP_CACHE_DIR (and cannot be combined with --no-cache)")
+        enable_replay()
+        logger.info("Replay mode: HTTP responses from %s only", settings.ETL_HTTP_CACHE_DIR)
     engine = create_engine(settings.get_sync_db_url())
 
     with engine.connect() as conn:
@@ -39,34 +56,71 @@ def main():
 
     Base.metadata.create_all(engine)
 
+    # 게시된 테이블을 섀도 스키마로 복제 → 이후 모든 쓰기는 섀도에 (API는 직전 스냅샷을 계속 읽음)
+    from app.etl.snapshot import discard_shadow, prepare_shadow, publish_snapshot, shadow_connect_args
+    with sessionmaker(bind=engine)() as session:
+        prepare_shadow(session)
+    engine.dispose()
+    engine = create_engine(settings.get_sync_db_url(), connect_args=shadow_connect_args())
+
     Session = sessionmaker(bind=engine)
 
     mode = "SAMPLE" if settings.should_use_sample else "API"
     logger.info("Running ETL in %s mode (force=%s)", mode, force)
 
     total_start = time.time()
+    failed: list[str] = []
 
-    with Session() as session:
-        grid_count = session.execute(text("SELECT COUNT(*) FROM grid_master")).scalar()
-        if grid_count == 0 or force:
-            from app.etl.grid_generator import generate_seoul_grids
-            step_start = time.time()
-            grid_count = generate_seoul_grids(session)
-            elapsed = time.time() - step_start
-            logger.info("[Grid] Generated %s grids (%.1fs)", f"{grid_count:,}", elapsed)
-        else:
-            logger.info("[Grid] %s grids already exist", f"{grid_count:,}")
+    def stage_failed(name: str, step_start: float, e: Exception, fatal: bool = False):
+        """실패한 단계를 기록한다. --continue-on-error가 아니면(또는 fatal) 섀도를 버리고 바로 종료한다."""
+        elapsed = time.time() - step_start
+        logger.error("[%s] ERROR after %.1fs: %s", name, elapsed, e, exc_info=True)
+        failed.append(name)
+        if fatal or not args.continue_on_error:
+            with Session() as session:
+                discard_shadow(session)
+            logger.error("ETL aborted at [%s]: nothing published, API keeps the previous snapshot", name)
+            sys.exit(1)
 
-    if force:
-        logger.info("Force mode: clearing stats tables")
+    step_start = time.time()
+    try:
         with Session() as session:
-            for table in [
-                "grid_score", "grid_store_stats", "grid_floating_stats",
-                "grid_population_stats", "grid_sales_stats", "grid_rent_stats",
-                "store_master",
-            ]:
-                session.execute(text(f"DELETE FROM {table}"))
-            session.commit()
+            # grid_master/grid_district는 public에 직접 쓰여 스냅샷 교체 대상이 아니므로, 게시된
+            # 데이터가 있을 수 없는 첫 실행(격자 없음)에만 만든다. 재생성은 scripts/init_grid.py.
+            grid_count = session.execute(text("SELECT COUNT(*) FROM grid_master")).scalar()
+            grid_generated = grid_count == 0
+            if grid_generated:
+                from app.etl.grid_generator import generate_seoul_grids
+                grid_count = generate_seoul_grids(session)
+                elapsed = time.time() - step_start
+                logger.info("[Grid] Generated %s grids (%.1fs)", f"{grid_count:,}", elapsed)
+            else:
+                logger.info("[Grid] %s grids already exist%s", f"{grid_count:,}",
+                            " (--force keeps them; regenerate with scripts/init_grid.py)" if force else "")
+
+        # 격자 → 구/행정동 매핑 (격자를 새로 만들었거나 아직 없을 때만 — 게시된 grid_master에서
+        # 결정적으로 유도되므로 이후 단계가 실패해도 게시된 데이터와 어긋나지 않는다)
+        from app.etl.district_mapping import build_district_mapping, district_mapping_exists
+        with Session() as session:
+            if grid_generated or not district_mapping_exists(session):
+                step_start = time.time()
+                district_rows = build_district_mapping(session)
+                elapsed = time.time() - step_start
+                logger.info("[District] Mapped %s grid-district rows (%.1fs)", f"{district_rows:,}", elapsed)
+
+        if force:
+            logger.info("Force mode: clearing stats tables")
+            with Session() as session:
+                for table in [
+                    "grid_score", "grid_store_stats", "grid_floating_stats",
+                    "grid_population_stats", "grid_sales_stats", "grid_rent_stats",
+                    "store_master",
+                ]:
+                    session.execute(text(f"DELETE FROM {table}"))
+                session.commit()
+    except Exception as e:
+        # 격자/매핑을 준비하지 못하면 이후 단계가 모두 무의미하므로 플래그와 관계없이 중단
+        stage_failed("Grid", step_start, e, fatal=True)
 
     collectors = [
         ("Store", collect_stores),
@@ -84,22 +138,55 @@ def main():
                 elapsed = time.time() - step_start
                 logger.info("[%s] Loaded %s records (%.1fs)", name, f"{count:,}", elapsed)
         except Exception as e:
-            elapsed = time.time() - step_start
-            logger.error("[%s] ERROR after %.1fs: %s", name, elapsed, e, exc_info=True)
+            stage_failed(name, step_start, e)
+
+    cache = get_http_cache()
+    if cache is not None:
+        logger.info("[HTTP cache] %d hits, %d misses (%s)", cache.hits, cache.misses, cache.root)
 
-    # 점수 계산
+    # 점수 계산 (섀도에 기록 — 데이터 버전은 아래 publish_snapshot에서 한 번만 올린다)
     step_start = time.time()
     try:
         from app.services.score_calculator import compute_all_scores
         with Session() as session:
-            score_count = compute_all_scores(session)
+            score_count = compute_all_scores(session, full=force, publish_version=False)
             elapsed = time.time() - step_start
             logger.info("[Score] Computed %s grid scores (%.1fs)", f"{score_count:,}", elapsed)
     except Exception as e:
-        elapsed = time.time() - step_start
-        logger.error("[Score] ERROR after %.1fs: %s", elapsed, e, exc_info=True)
+        stage_failed("Score", step_start, e)
+
+    # 뷰포트 통계용 summed-area table
+    step_start = time.time()
+    try:
+        from app.services.summed_area import build_summed_area_tables
+        with Session() as session:
+            sat_count = build_summed_area_tables(session)
+            elapsed = time.time() - step_start
+            logger.info("[SAT] Built %d summed-area tables (%.1fs)", sat_count, elapsed)
+    except Exception as e:
+        stage_failed("SAT", step_start, e)
+
+    # 표준 반경 디스크 컨볼루션 사전 집계
+    step_start = time.time()
+    try:
+        from app.services.radius_stats import build_radius_tables
+        with Session() as session:
+            radius_count = build_radius_tables(session)
+            elapsed = time.time() - step_start
+            logger.info("[Radius] Precomputed %s radius rows (%.1fs)", f"{radius_count:,}", elapsed)
+    except Exception as e:
+        stage_failed("Radius", step_start, e)
+
+    # 섀도 스키마를 한 트랜잭션으로 교체 게시 + 새 데이터 버전 (API 결과 캐시/인메모리 인덱스 무효화 기준)
+    # 여기까지 왔는데 실패한 단계가 있다면 --continue-on-error로 명시적으로 허용한 경우뿐이다
+    with Session() as session:
+        version = publish_snapshot(session, "run_etl")
+        logger.info("[Publish] Dataset version %d", version)
 
     total_elapsed = time.time() - total_start
+    if failed:
+        logger.error("ETL published with failed stages (--continue-on-error): %s", ", ".join(failed))
+        sys.exit(1)
     logger.info("ETL complete in %.1fs", total_elapsed)
 
 
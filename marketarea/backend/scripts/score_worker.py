@@ -0,0 +1,45 @@
+"""분산 점수 계산 워커 — score_work_queue의 grid_id 구간을 가져와 계산한다.
+
+어느 노드에서든 같은 DB를 바라보게 실행하면 compute_all_scores(SCORE_QUEUE_ENABLED=true)가
+넣은 항목을 나눠 처리한다. 워커가 죽으면 임대 만료 후 다른 워커가 이어받는다.
+
+    python scripts/score_worker.py                    # 계속 대기하며 처리
+    python scripts/score_worker.py --idle-exit 60     # 60초 동안 항목이 없으면 종료
+"""
+import sys
+import os
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.config import get_settings
+from app.services.score_queue import run_worker
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Claim and score grid ranges from score_work_queue")
+    parser.add_argument("--idle-exit", type=float, default=None,
+                        help="Exit after this many seconds without work (default: run forever)")
+    parser.add_argument("--run-id", default=None, help="Only process items of this queue run")
+    parser.add_argument("--worker-id", default=None, help="Worker name (default: host:pid)")
+    args = parser.parse_args()
+
+    engine = create_engine(get_settings().get_sync_db_url(), pool_size=1)
+    try:
+        run_worker(
+            sessionmaker(bind=engine),
+            worker=args.worker_id,
+            run_id=args.run_id,
+            idle_exit=args.idle_exit,
+        )
+    except KeyboardInterrupt:
+        pass
+    finally:
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""점수 계산 SQL 모드 회귀 검증 (현재 DB 데이터).
+
+SQL 모드(SCORE_SELECT_SQL, 쓰기 없음)와 행 단위 참조 구현(_compute_score)을 비교한다.
+SQL은 numeric round(half away from zero)를 쓰므로 반올림 단위 1 이내 차이는 허용.
+불일치가 있으면 exit code 1.
+NumPy 엔진(score_engine)과 _compute_score의 비교는 tests/test_score_engine.py (DB 불필요).
+
+    python scripts/verify_scores.py
+"""
+import sys
+import os
+import argparse
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.services.score_calculator import (
+    DEFAULT_CLOSURE_RATE,
+    SCORE_SELECT_SQL,
+    _JOINED_ROWS_SQL,
+    _compute_score,
+    _compute_seoul_averages,
+    latest_stats_quarter,
+    score_sql_params,
+    scope_params,
+)
+
+# (_compute_score 키, SQL 컬럼 인덱스, 반올림 자릿수)
+SQL_COLUMNS = (
+    ("hs", 3, 1), ("ci", 4, 3), ("sp", 5, 3), ("sl", 6, 0), ("sh", 7, 0),
+    ("ps", 8, 1), ("fs", 9, 1), ("rs", 10, 1),
+)
+
+
+def compare_sql() -> int:
+    """DB의 현재 데이터로 SQL 모드와 Python 참조 구현을 비교한다 (쓰기 없음)."""
+    engine = create_engine(get_settings().get_sync_db_url())
+    with Session(engine) as session:
+        scope = scope_params(quarter=latest_stats_quarter(session))
+        seoul_avg = _compute_seoul_averages(session, scope["quarter"])
+        start = time.perf_counter()
+        rows = session.execute(
+            text(_JOINED_ROWS_SQL), {"default_closure": DEFAULT_CLOSURE_RATE, **scope},
+        ).fetchall()
+        expected = {row[10]: _compute_score(row, seoul_avg) for row in rows}
+        python_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        actual = session.execute(
+            text(SCORE_SELECT_SQL), score_sql_params(seoul_avg, scope),
+        ).fetchall()
+        sql_elapsed = time.perf_counter() - start
+    engine.dispose()
+
+    mismatches = 0
+    for row in actual:
+        exp = expected.pop(row[0], None)
+        ok = exp is not None and exp["gid"] == row[1] and exp["ic"] == row[2] and exp["rf"] == row[11]
+        if ok:
+            for key, idx, ndigits in SQL_COLUMNS:
+                if abs(exp[key] - row[idx]) > 10 ** -ndigits * 1.0001:
+                    ok = False
+        if not ok:
+            mismatches += 1
+            if mismatches <= 5:
+                print(f"  mismatch src_id={row[0]}: python={exp} sql={tuple(row)}")
+    mismatches += len(expected)
+    print(
+        f"sql: rows={len(actual):,} mismatches={mismatches} "
+        f"python={python_elapsed:.2f}s sql={sql_elapsed:.2f}s"
+    )
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verify SQL scoring mode against _compute_score on the configured DB")
+    parser.parse_args()
+    sys.exit(1 if compare_sql() else 0)
+
+
+if __name__ == "__main__":
+    main()
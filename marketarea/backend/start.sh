@@ -32,6 +32,10 @@ except Exception as e:
     print('Server will start anyway. DB operations will fail until DB is available.')
 " 2>&1 || echo "WARNING: DB setup script failed, continuing..."
 
+# Schema migrations (quarter partitions for stats/score tables)
+echo "=== Running migrations ==="
+alembic upgrade head 2>&1 || echo "WARNING: Migrations failed, continuing..."
+
 # Check if ETL is needed (skip if DB is unavailable)
 echo "=== Checking ETL status ==="
 python -c "
@@ -0,0 +1,99 @@
+"""score_engine.compute_scores 회귀 테스트 — 행 단위 참조 구현(_compute_score)과 모든 컬럼이 정확히 같아야 한다.
+
+합성 데이터에는 NULL/0, 임계값 경계, 반올림 경계(x.x5) 값이 섞여 있다 (DB 불필요).
+DB 데이터로 SQL 모드를 비교하려면 scripts/verify_scores.py.
+"""
+import random
+
+import numpy as np
+import pytest
+
+from app.services.score_calculator import DEFAULT_CLOSURE_RATE, DEFAULT_CLOSURE_RATES, _compute_score
+from app.services.score_engine import ScoreInputs, compute_scores, round_half_even
+
+ROWS = 20_000
+INDUSTRY_CODES = list(DEFAULT_CLOSURE_RATES) + ["Q02", "F08"]
+
+SEOUL_AVG_CASES = [
+    {"avg_stores": 3.2, "avg_floating": 5400.0, "avg_population": 410.0,
+     "avg_sales": 85_000_000.0, "avg_rent": 42_000.0},
+    # 기준값이 0/1 근처인 경우 (z_to_score 분기, max(avg * 0.5, 1) 분기)
+    {"avg_stores": 1.0, "avg_floating": 1.0, "avg_population": 1.5,
+     "avg_sales": 1.0, "avg_rent": 0.0},
+    {"avg_stores": 0.0, "avg_floating": 0.0, "avg_population": 0.0,
+     "avg_sales": 0.0, "avg_rent": 2.0},
+]
+
+
+def synthetic_rows(n: int, rng: random.Random) -> list[tuple]:
+    """compute_all_scores 조인 쿼리와 같은 컬럼 순서의 합성 행."""
+    rows = []
+    for i in range(n):
+        edge = rng.random() < 0.2
+        store_count = rng.choice([None, 0, 1, 2, 5, 8]) if edge else rng.randint(1, 30)
+        closure = rng.choice([None, 0, 0.25, 0.2500001, 1.0]) if edge else rng.uniform(0, 0.4)
+        floating = rng.choice([0, 2700.0, 5400.0]) if edge else rng.uniform(0, 20000)
+        population = rng.choice([0, 410, 411]) if edge else rng.randint(0, 2000)
+        sales = rng.choice([0, 0.0, 3.0, 150.0]) if edge else rng.uniform(0, 5e8)
+        rent = rng.choice([0, 63_000.0, 63_000.1]) if edge else rng.uniform(0, 120_000)
+        # 반올림 경계 (x.x5, x.xxx5)를 일부러 만들기 위한 값
+        if rng.random() < 0.05:
+            sales = rng.randint(0, 10**6) * 3 / 0.7 * 10000 / 10**3
+        rows.append((
+            i + 1,
+            rng.choice(INDUSTRY_CODES),
+            store_count,
+            closure,
+            floating,
+            population,
+            0.3,
+            sales,
+            0.0,
+            rent,
+        ))
+    return rows
+
+
+def score_dicts(scores: dict) -> list[dict]:
+    """compute_scores 컬럼 배열 → _compute_score와 같은 형식의 dict."""
+    columns = (
+        ("gid", "grid_id"), ("hs", "health_score"), ("ci", "competition_index"),
+        ("sp", "survival_probability"), ("sl", "sales_estimate_low"),
+        ("sh", "sales_estimate_high"), ("ps", "population_score"),
+        ("fs", "floating_score"), ("rs", "rent_score"),
+    )
+    lists = {key: scores[col].tolist() for key, col in columns}
+    rows = []
+    for i, ic in enumerate(scores["industry_code"]):
+        row = {key: values[i] for key, values in lists.items()}
+        row.update(ic=ic, rf=scores["risk_flags"][i], q="2024-Q3")
+        rows.append(row)
+    return rows
+
+
+@pytest.fixture(scope="module")
+def rows() -> list[tuple]:
+    return synthetic_rows(ROWS, random.Random(42))
+
+
+@pytest.mark.parametrize("seoul_avg", SEOUL_AVG_CASES, ids=["typical", "near-one", "zero"])
+def test_compute_scores_matches_reference(rows, seoul_avg):
+    expected = [_compute_score(row, seoul_avg) for row in rows]
+    actual = score_dicts(compute_scores(ScoreInputs.from_rows(rows, DEFAULT_CLOSURE_RATE), seoul_avg))
+
+    assert len(actual) == len(expected)
+    mismatches = [
+        (exp["gid"], {k: (exp[k], act.get(k)) for k in exp if exp[k] != act.get(k)})
+        for exp, act in zip(expected, actual)
+        if exp != act
+    ]
+    assert not mismatches, f"{len(mismatches)} mismatched rows, first: {mismatches[:5]}"
+
+
+@pytest.mark.parametrize("ndigits", [0, 1, 3])
+def test_round_half_even_matches_python_round(ndigits):
+    # x.xxx5 근처 값: np.round만 쓰면 3자리에서 Python round()와 달라지는 경계
+    values = [k / 1000 + 0.0005 for k in range(100_000)] + [k * 3 / 0.7 for k in range(10_000)]
+    rounded = round_half_even(np.array(values), ndigits).tolist()
+
+    assert rounded == [round(v, ndigits) for v in values]